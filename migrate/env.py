@@ -1,4 +1,5 @@
 import pathlib
+import re
 import sys
 from logging.config import fileConfig
 
@@ -34,10 +35,14 @@ target_metadata = odp.db.Base.metadata
 
 def include_name(name, type_, parent_names):
     """Prevent auto-generation of drop table ops for the obsolete
-    tables vocabulary_term and vocabulary_term_audit."""
+    tables vocabulary_term and vocabulary_term_audit, and for the
+    partitions of audit tables."""
     if type_ == 'table' and name.startswith('vocabulary_term'):
         return False
 
+    if type_ == 'table' and re.fullmatch(r'\w+_audit_(default|\d{4}_\d{2})', name):
+        return False
+
     return True
 
 
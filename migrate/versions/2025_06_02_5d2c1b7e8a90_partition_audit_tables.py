@@ -0,0 +1,87 @@
+"""Partition audit tables
+
+Revision ID: 5d2c1b7e8a90
+Revises: 326d3fc9b55b
+Create Date: 2025-06-02 09:41:27.518203
+
+"""
+from datetime import date, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '5d2c1b7e8a90'
+down_revision = '326d3fc9b55b'
+branch_labels = None
+depends_on = None
+
+# mapping of audit table names to the name and column(s) of the audited entity id index,
+# as declared on the models
+audit_tables = {
+    'collection_audit': ('ix_collection_audit__id', ('_id',)),
+    'collection_tag_audit': ('ix_collection_tag_audit__collection_id', ('_collection_id',)),
+    'identity_audit': ('ix_identity_audit__id', ('_id',)),
+    'keyword_audit': ('ix_keyword_audit__vocabulary_id_id', ('_vocabulary_id', '_id')),
+    'package_audit': ('ix_package_audit__id', ('_id',)),
+    'package_tag_audit': ('ix_package_tag_audit__package_id', ('_package_id',)),
+    'provider_audit': ('ix_provider_audit__id', ('_id',)),
+    'record_audit': ('ix_record_audit__id', ('_id',)),
+    'record_tag_audit': ('ix_record_tag_audit__record_id', ('_record_id',)),
+}
+
+# number of monthly partitions to create beyond the current month
+months_ahead = 3
+
+
+def _next_month(d: date) -> date:
+    return date(d.year + d.month // 12, d.month % 12 + 1, 1)
+
+
+def upgrade():
+    conn = op.get_bind()
+    today = date.today()
+    last_month = date(today.year, today.month, 1)
+    for _ in range(months_ahead):
+        last_month = _next_month(last_month)
+
+    for table, (id_index, id_cols) in audit_tables.items():
+        op.execute(f'alter table {table} rename to {table}_old')
+        op.execute(f'alter table {table}_old rename constraint {table}_pkey to {table}_old_pkey')
+        op.execute(f'alter sequence {table}_id_seq rename to {table}_old_id_seq')
+
+        op.execute(f'create table {table} (like {table}_old including defaults including identity) '
+                   f'partition by range (timestamp)')
+        op.execute(f'alter table {table} add constraint {table}_pkey primary key (id, timestamp)')
+        op.execute(f'create index ix_{table}_timestamp on {table} using brin (timestamp)')
+        op.execute(f'create index {id_index} on {table} ({", ".join(id_cols)})')
+        op.execute(f'create table {table}_default partition of {table} default')
+
+        min_timestamp = conn.execute(sa.text(f'select min(timestamp) from {table}_old')).scalar()
+        month = min_timestamp.astimezone(timezone.utc).date().replace(day=1) if min_timestamp else last_month
+        month = min(month, date(today.year, today.month, 1))
+        while month <= last_month:
+            next_month = _next_month(month)
+            op.execute(f"create table {table}_{month:%Y_%m} partition of {table} "
+                       f"for values from ('{month} 00:00+00') to ('{next_month} 00:00+00')")
+            month = next_month
+
+        op.execute(f'insert into {table} overriding system value select * from {table}_old')
+        op.execute(f"select setval(pg_get_serial_sequence('{table}', 'id'), coalesce(max(id), 0) + 1, false) from {table}")
+        op.execute(f'drop table {table}_old')
+
+
+def downgrade():
+    for table, (id_index, _) in audit_tables.items():
+        op.execute(f'alter table {table} rename to {table}_old')
+        op.execute(f'alter table {table}_old rename constraint {table}_pkey to {table}_old_pkey')
+        op.execute(f'alter index ix_{table}_timestamp rename to ix_{table}_old_timestamp')
+        op.execute(f'alter index {id_index} rename to {id_index}_old')
+        op.execute(f'alter sequence {table}_id_seq rename to {table}_old_id_seq')
+
+        op.execute(f'create table {table} (like {table}_old including defaults including identity)')
+        op.execute(f'alter table {table} add constraint {table}_pkey primary key (id)')
+
+        op.execute(f'insert into {table} overriding system value select * from {table}_old')
+        op.execute(f"select setval(pg_get_serial_sequence('{table}', 'id'), coalesce(max(id), 0) + 1, false) from {table}")
+        op.execute(f'drop table {table}_old cascade')
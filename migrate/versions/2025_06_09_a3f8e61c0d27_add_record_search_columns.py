@@ -0,0 +1,41 @@
+"""Add record search columns
+
+Revision ID: a3f8e61c0d27
+Revises: 5d2c1b7e8a90
+Create Date: 2025-06-09 14:22:05.730611
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from odp.const import ODPMetadataSchema
+
+# revision identifiers, used by Alembic.
+revision = 'a3f8e61c0d27'
+down_revision = '5d2c1b7e8a90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('create extension if not exists pg_trgm')
+    op.add_column('record', sa.Column('identifier_text', sa.String(), sa.Computed(
+        "id || ' ' || coalesce(doi, '') || ' ' || coalesce(sid, '')"
+    )))
+    op.add_column('record', sa.Column('title_text', sa.String(), sa.Computed(
+        f"case schema_id "
+        f"when '{ODPMetadataSchema.SAEON_DATACITE4}' then metadata_ #>> '{{titles,0,title}}' "
+        f"when '{ODPMetadataSchema.SAEON_ISO19115}' then metadata_ ->> 'title' "
+        f"end"
+    )))
+    op.create_index('ix_record_identifier_text', 'record', ['identifier_text'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'identifier_text': 'gin_trgm_ops'})
+    op.create_index('ix_record_title_text', 'record', ['title_text'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'title_text': 'gin_trgm_ops'})
+
+
+def downgrade():
+    op.drop_index('ix_record_title_text', table_name='record', postgresql_using='gin', postgresql_ops={'title_text': 'gin_trgm_ops'})
+    op.drop_index('ix_record_identifier_text', table_name='record', postgresql_using='gin', postgresql_ops={'identifier_text': 'gin_trgm_ops'})
+    op.drop_column('record', 'title_text')
+    op.drop_column('record', 'identifier_text')
@@ -0,0 +1,28 @@
+"""Add foreign key indexes
+
+Revision ID: 8b4e2d7f1c36
+Revises: a3f8e61c0d27
+Create Date: 2025-06-16 10:05:48.163320
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '8b4e2d7f1c36'
+down_revision = 'a3f8e61c0d27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_keyword_parent_id', 'keyword', ['parent_id'], unique=False)
+    op.create_index('ix_record_collection_id', 'record', ['collection_id'], unique=False)
+    op.create_index('ix_record_parent_id', 'record', ['parent_id'], unique=False)
+    op.create_index('ix_record_tag_record_id', 'record_tag', ['record_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_record_tag_record_id', table_name='record_tag')
+    op.drop_index('ix_record_parent_id', table_name='record')
+    op.drop_index('ix_record_collection_id', table_name='record')
+    op.drop_index('ix_keyword_parent_id', table_name='keyword')
@@ -0,0 +1,78 @@
+"""Add published record gzip
+
+Revision ID: c71f2a9d4e05
+Revises: 8b4e2d7f1c36
+Create Date: 2025-06-23 10:17:43.265419
+
+"""
+import gzip
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c71f2a9d4e05'
+down_revision = '8b4e2d7f1c36'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+"""Number of catalog records compressed per round trip."""
+
+
+def isoformat_utc(column):
+    # as odp.api.lib.utils._sql_isoformat_utc
+    return f"""(case when date_trunc('second', {column} at time zone 'UTC') = {column} at time zone 'UTC'
+        then to_char({column} at time zone 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS"+00:00"')
+        else to_char({column} at time zone 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US"+00:00"')
+    end)"""
+
+
+# JSON of published records as served by the API (published_record_json)
+published_record_json = f"""
+case when catalog_id in ('SAEON', 'MIMS') then
+    (published_record || jsonb_build_object(
+        'keywords', keywords,
+        'spatial_north', spatial_north,
+        'spatial_east', spatial_east,
+        'spatial_south', spatial_south,
+        'spatial_west', spatial_west,
+        'temporal_start', {isoformat_utc('temporal_start')},
+        'temporal_end', {isoformat_utc('temporal_end')},
+        'searchable', searchable
+    ))::text
+else
+    published_record::text
+end
+"""
+
+
+def upgrade():
+    op.add_column('catalog_record', sa.Column('published_record_gzip', sa.LargeBinary(), nullable=True))
+
+    conn = op.get_bind()
+    select_batch = sa.text(
+        f'select catalog_id, record_id, {published_record_json} as json '
+        f'from catalog_record '
+        f'where published and (catalog_id, record_id) > (:catalog_id, :record_id) '
+        f'order by catalog_id, record_id '
+        f'limit {BATCH_SIZE}'
+    )
+    update_batch = sa.text(
+        'update catalog_record set published_record_gzip = :gzip '
+        'where catalog_id = :catalog_id and record_id = :record_id'
+    )
+
+    # page through published records by primary key, updating each page
+    # with a single executemany
+    key = dict(catalog_id='', record_id='')
+    while batch := conn.execute(select_batch, key).all():
+        conn.execute(update_batch, [
+            dict(gzip=gzip.compress(json.encode()), catalog_id=catalog_id, record_id=record_id)
+            for catalog_id, record_id, json in batch
+        ])
+        key = dict(catalog_id=batch[-1].catalog_id, record_id=batch[-1].record_id)
+
+
+def downgrade():
+    op.drop_column('catalog_record', 'published_record_gzip')
@@ -0,0 +1,85 @@
+"""Add counter columns
+
+Revision ID: e4a9b0c83f17
+Revises: c71f2a9d4e05
+Create Date: 2025-06-30 08:52:19.604338
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e4a9b0c83f17'
+down_revision = 'c71f2a9d4e05'
+branch_labels = None
+depends_on = None
+
+# (parent table, counter column, child table, foreign key column, filter column)
+counters = [
+    ('catalog', 'record_count', 'catalog_record', 'catalog_id', 'published'),
+    ('collection', 'record_count', 'record', 'collection_id', None),
+    ('provider', 'package_count', 'package', 'provider_id', None),
+    ('archive', 'resource_count', 'archive_resource', 'archive_id', None),
+    ('vocabulary', 'keyword_count', 'keyword', 'vocabulary_id', None),
+]
+
+
+def upgrade():
+    op.create_table('counter_delta',
+                    sa.Column('id', sa.BigInteger(), sa.Identity(always=False), nullable=False),
+                    sa.Column('parent_table', sa.String(), nullable=False),
+                    sa.Column('counter', sa.String(), nullable=False),
+                    sa.Column('parent_id', sa.String(), nullable=False),
+                    sa.Column('delta', sa.Integer(), nullable=False),
+                    sa.PrimaryKeyConstraint('id')
+                    )
+    op.create_index('ix_counter_delta_parent', 'counter_delta', ['parent_table', 'counter', 'parent_id'], unique=False)
+
+    op.execute("""
+        create or replace function maintain_count() returns trigger as $$
+        declare
+            old_key text;
+            new_key text;
+        begin
+            if tg_op in ('UPDATE', 'DELETE') and (tg_nargs < 4 or (to_jsonb(old) ->> tg_argv[3])::boolean) then
+                old_key := to_jsonb(old) ->> tg_argv[2];
+            end if;
+            if tg_op in ('INSERT', 'UPDATE') and (tg_nargs < 4 or (to_jsonb(new) ->> tg_argv[3])::boolean) then
+                new_key := to_jsonb(new) ->> tg_argv[2];
+            end if;
+            if old_key is not distinct from new_key then
+                return null;
+            end if;
+            if old_key is not null then
+                insert into counter_delta (parent_table, counter, parent_id, delta)
+                    values (tg_argv[0], tg_argv[1], old_key, -1);
+            end if;
+            if new_key is not null then
+                insert into counter_delta (parent_table, counter, parent_id, delta)
+                    values (tg_argv[0], tg_argv[1], new_key, 1);
+            end if;
+            return null;
+        end
+        $$ language plpgsql
+    """)
+
+    for parent, counter, child, fk, filter_ in counters:
+        op.add_column(parent, sa.Column(counter, sa.Integer(), server_default='0', nullable=False))
+
+        update_cols = f'{fk}, {filter_}' if filter_ else fk
+        trigger_args = f"'{parent}', '{counter}', '{fk}'" + (f", '{filter_}'" if filter_ else '')
+        op.execute(f'create trigger {child}_count after insert or update of {update_cols} or delete on {child} '
+                   f'for each row execute function maintain_count({trigger_args})')
+
+        where = f' and {filter_}' if filter_ else ''
+        op.execute(f'update {parent} set {counter} = '
+                   f'(select count(*) from {child} where {child}.{fk} = {parent}.id{where})')
+
+
+def downgrade():
+    for parent, counter, child, fk, filter_ in counters:
+        op.execute(f'drop trigger {child}_count on {child}')
+        op.drop_column(parent, counter)
+
+    op.execute('drop function maintain_count')
+    op.drop_table('counter_delta')
@@ -0,0 +1,29 @@
+"""Add catalog record next reevaluation
+
+Revision ID: 5d0c6e8a1b93
+Revises: e4a9b0c83f17
+Create Date: 2025-07-07 09:41:26.183507
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '5d0c6e8a1b93'
+down_revision = 'e4a9b0c83f17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('catalog_record', sa.Column('next_reevaluation', sa.TIMESTAMP(timezone=True), nullable=True))
+    op.create_index('ix_catalog_record_catalog_id_next_reevaluation', 'catalog_record', ['catalog_id', 'next_reevaluation'], unique=False)
+
+    # re-evaluate embargoed records on the next publishing run, which computes their next transitions
+    op.execute("update catalog_record set next_reevaluation = now() "
+               "where record_id in (select record_id from record_tag where tag_id = 'Record.Embargo')")
+
+
+def downgrade():
+    op.drop_index('ix_catalog_record_catalog_id_next_reevaluation', table_name='catalog_record')
+    op.drop_column('catalog_record', 'next_reevaluation')
@@ -0,0 +1,38 @@
+"""Add publisher notify triggers
+
+Revision ID: a3f6d1c9e240
+Revises: 5d0c6e8a1b93
+Create Date: 2025-07-14 11:05:38.720914
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'a3f6d1c9e240'
+down_revision = '5d0c6e8a1b93'
+branch_labels = None
+depends_on = None
+
+tables = ['record', 'collection', 'provider']
+
+
+def upgrade():
+    op.execute("""
+        create or replace function notify_publisher() returns trigger as $$
+        begin
+            perform pg_notify('odp_publish', tg_table_name || ':' || new.id);
+            return null;
+        end
+        $$ language plpgsql
+    """)
+
+    for table in tables:
+        op.execute(f'create trigger {table}_notify_publisher after insert or update of timestamp on {table} '
+                   f'for each row execute function notify_publisher()')
+
+
+def downgrade():
+    for table in tables:
+        op.execute(f'drop trigger {table}_notify_publisher on {table}')
+
+    op.execute('drop function notify_publisher')
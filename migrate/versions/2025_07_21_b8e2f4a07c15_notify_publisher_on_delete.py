@@ -0,0 +1,49 @@
+"""Notify publisher on delete
+
+Revision ID: b8e2f4a07c15
+Revises: a3f6d1c9e240
+Create Date: 2025-07-21 10:12:47.305216
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'b8e2f4a07c15'
+down_revision = 'a3f6d1c9e240'
+branch_labels = None
+depends_on = None
+
+tables = ['record', 'collection', 'provider']
+
+
+def upgrade():
+    op.execute("""
+        create or replace function notify_publisher() returns trigger as $$
+        begin
+            perform pg_notify('odp_publish', tg_table_name || ':' ||
+                case tg_op when 'DELETE' then old.id else new.id end);
+            return null;
+        end
+        $$ language plpgsql
+    """)
+
+    for table in tables:
+        op.execute(f'drop trigger {table}_notify_publisher on {table}')
+        op.execute(f'create trigger {table}_notify_publisher after insert or update of timestamp or delete on {table} '
+                   f'for each row execute function notify_publisher()')
+
+
+def downgrade():
+    for table in tables:
+        op.execute(f'drop trigger {table}_notify_publisher on {table}')
+        op.execute(f'create trigger {table}_notify_publisher after insert or update of timestamp on {table} '
+                   f'for each row execute function notify_publisher()')
+
+    op.execute("""
+        create or replace function notify_publisher() returns trigger as $$
+        begin
+            perform pg_notify('odp_publish', tg_table_name || ':' || new.id);
+            return null;
+        end
+        $$ language plpgsql
+    """)
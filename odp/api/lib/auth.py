@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from typing import Optional
 
-from fastapi import HTTPException
+from fastapi import Body, HTTPException
 from fastapi.openapi.models import OAuth2, OAuthFlowClientCredentials, OAuthFlows
 from fastapi.security.base import SecurityBase
 from fastapi.security.utils import get_authorization_scheme_param
@@ -149,6 +149,17 @@ class TagAuthorize(BaseAuthorize):
         return _authorize_request(request, ODPScope(tag_scope_id))
 
 
+class TagIdAuthorize(BaseAuthorize):
+    async def __call__(self, request: Request, tag_id: str = Body()) -> Authorized:
+        if not (tag_scope_id := Session.execute(
+                select(Tag.scope_id).
+                where(Tag.id == tag_id)
+        ).scalar_one_or_none()):
+            raise HTTPException(HTTP_404_NOT_FOUND)
+
+        return _authorize_request(request, ODPScope(tag_scope_id))
+
+
 class UntagAuthorize(BaseAuthorize):
     _tag_instance_classes = {
         TagType.collection: CollectionTag,
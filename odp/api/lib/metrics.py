@@ -0,0 +1,76 @@
+import logging
+import os
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+
+from odp.lib.sqlstats import SQLStats
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_BUDGET = int(os.getenv('ODP_API_QUERY_COUNT_BUDGET', 50))
+"""Number of SQL statements per request, above which the request is logged."""
+
+QUERY_TIME_BUDGET = float(os.getenv('ODP_API_QUERY_TIME_BUDGET', 0.5))
+"""Database time (in seconds) per request, above which the request is logged."""
+
+
+@dataclass
+class _RequestMetrics:
+    requests: int = 0
+    duration: float = 0.0
+    queries: int = 0
+    db_time: float = 0.0
+
+
+_metrics: dict[tuple[str, str, int], _RequestMetrics] = defaultdict(_RequestMetrics)
+_metrics_lock = threading.Lock()
+
+
+def record_request(
+        method: str,
+        route: str | None,
+        status_code: int,
+        duration: float,
+        stats: SQLStats,
+) -> None:
+    """Accumulate metrics for a completed request, and log the request
+    if it exceeded the query count or time budget.
+
+    :param route: the path template of the matched route, or None if no route matched
+    """
+    route = route or 'unmatched'
+    with _metrics_lock:
+        metrics = _metrics[method, route, status_code]
+        metrics.requests += 1
+        metrics.duration += duration
+        metrics.queries += stats.count
+        metrics.db_time += stats.time
+
+    if stats.count > QUERY_COUNT_BUDGET or stats.time > QUERY_TIME_BUDGET:
+        logger.warning(f'{method} {route} exceeded query budget: {stats} ({duration * 1000:.1f}ms total)')
+
+
+def render_metrics() -> str:
+    """Return accumulated request metrics in Prometheus text exposition format.
+
+    Metrics are accumulated per worker process.
+    """
+    with _metrics_lock:
+        metrics = {key: _RequestMetrics(**vars(value)) for key, value in _metrics.items()}
+
+    lines = []
+    for name, attr, type_, help_ in (
+            ('odp_api_requests_total', 'requests', 'counter', 'Number of API requests.'),
+            ('odp_api_request_duration_seconds_total', 'duration', 'counter', 'Total time spent handling API requests.'),
+            ('odp_api_db_queries_total', 'queries', 'counter', 'Number of SQL statements executed by API requests.'),
+            ('odp_api_db_duration_seconds_total', 'db_time', 'counter', 'Total time spent executing SQL statements.'),
+    ):
+        lines += [
+            f'# HELP {name} {help_}',
+            f'# TYPE {name} {type_}',
+        ]
+        for (method, route, status_code), value in sorted(metrics.items()):
+            lines += [f'{name}{{method="{method}",route="{route}",status="{status_code}"}} {getattr(value, attr)}']
+
+    return '\n'.join(lines) + '\n'
@@ -1,11 +1,12 @@
 from math import ceil
-from typing import Callable
+from typing import Any, Callable
 
 from fastapi import HTTPException, Query
 from sqlalchemy import func, select, text
 from sqlalchemy.engine import Row
 from sqlalchemy.exc import CompileError
 from sqlalchemy.sql import Select
+from starlette.responses import Response
 from starlette.status import HTTP_422_UNPROCESSABLE_ENTITY, HTTP_500_INTERNAL_SERVER_ERROR
 
 from odp.api.models.paging import GenericAPIModel, Page
@@ -31,6 +32,7 @@ class Paginator:
             *,
             sort: str = None,
             sort_model: Base = None,
+            prefetch: Callable[[list[Row]], None] = None,
     ) -> Page[GenericAPIModel]:
         """Return a page of API models of the type represented by GenericAPIModel.
 
@@ -41,7 +43,56 @@ class Paginator:
             param and the API default
         :param sort_model: the ORM class associated with a given sort column,
             in case the query selects from multiple tables
+        :param prefetch: a callable that takes the rows of the page, called
+            before `item_factory`, e.g. to fetch related data for all the
+            rows at once
         """
+        items, total, limit = self._fetch(query, item_factory, sort, sort_model, prefetch)
+
+        return Page(
+            items=items,
+            total=total,
+            page=self.page,
+            pages=ceil(total / limit) if limit else 0,
+        )
+
+    def paginate_json(
+            self,
+            query: Select,
+            item_factory: Callable[[Row], str],
+            *,
+            sort: str = None,
+            sort_model: Base = None,
+    ) -> Response:
+        """Return a page of pre-serialized JSON items as a JSON response,
+        bypassing the construction and re-serialization of API models.
+
+        :param query: the select query for the total (unpaged) result set
+        :param item_factory: a callable that takes a row from the result set
+            and produces the JSON serialization of an item
+        :param sort: a custom sort column/clause; overrides the 'sort' request
+            param and the API default
+        :param sort_model: the ORM class associated with a given sort column,
+            in case the query selects from multiple tables
+        """
+        items, total, limit = self._fetch(query, item_factory, sort, sort_model)
+
+        return Response(
+            content=(
+                f'{{"items":[{",".join(items)}],"total":{total},'
+                f'"page":{self.page},"pages":{ceil(total / limit) if limit else 0}}}'
+            ),
+            media_type='application/json',
+        )
+
+    def _fetch(
+            self,
+            query: Select,
+            item_factory: Callable[[Row], Any],
+            sort: str | None,
+            sort_model: Base | None,
+            prefetch: Callable[[list[Row]], None] = None,
+    ) -> tuple[list, int, int]:
         total = Session.execute(
             select(func.count()).
             select_from(query.subquery())
@@ -54,22 +105,20 @@ class Paginator:
 
             limit = self.size or total
 
-            items = [
-                item_factory(row) for row in Session.execute(
-                    query.
-                    order_by(sort_col).
-                    offset(limit * (self.page - 1)).
-                    limit(limit)
-                )
-            ]
+            rows = Session.execute(
+                query.
+                order_by(sort_col).
+                offset(limit * (self.page - 1)).
+                limit(limit)
+            ).all()
+
+            if prefetch:
+                prefetch(rows)
+
+            items = [item_factory(row) for row in rows]
         except (AttributeError, CompileError) as e:
             if config.ODP.ENV in ('development', 'testing'):
                 raise HTTPException(HTTP_500_INTERNAL_SERVER_ERROR, 'paginate: ' + repr(e))
             raise HTTPException(HTTP_422_UNPROCESSABLE_ENTITY, 'Invalid sort column')
 
-        return Page(
-            items=items,
-            total=total,
-            page=self.page,
-            pages=ceil(total / limit) if limit else 0,
-        )
+        return items, total, limit
@@ -0,0 +1,196 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import func, select
+
+from odp.db import Session, session_scope
+from odp.db.models import Catalog, CatalogRecord, Record
+
+logger = logging.getLogger(__name__)
+
+RESOLVER_CHECK_INTERVAL = float(os.getenv('ODP_API_RESOLVER_CHECK_INTERVAL', 5))
+"""Minimum number of seconds between checks for a change to a catalog's
+timestamp, which causes its landing page map to be updated."""
+
+RESOLVER_REBUILD_INTERVAL = float(os.getenv('ODP_API_RESOLVER_REBUILD_INTERVAL', 3600))
+"""Number of seconds after which a catalog's landing page map is rebuilt
+in full, rather than updated incrementally."""
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='resolver')
+
+
+@dataclass
+class _LandingPages:
+    url: str
+    timestamp: datetime | None
+    """Catalog timestamp as of the latest update."""
+    record_timestamp: datetime | None
+    """Latest catalog record timestamp seen; records stamped at or after
+    this are re-read on the next update."""
+    checked: float
+    built: float
+    paths: dict[str, str] = field(default_factory=dict)
+    """Mapping of record id and lower-cased DOI to landing page path."""
+
+
+_catalogs: dict[str, _LandingPages | None] = {}
+_refreshing: set[str] = set()
+_catalogs_lock = threading.Lock()
+
+
+def resolve_landing_page(catalog_id: str, record_id: str = None, doi: str = None) -> str | None:
+    """Return the URL of the catalog landing page for a published record,
+    given its id or DOI, or None if there is no such page.
+
+    Landing page paths for all of a catalog's published records are held
+    in memory. A catalog's map is first loaded synchronously, in a session
+    of its own, so that the request does not yield mid-transaction. Thereafter,
+    the catalog timestamp is checked at most once every `RESOLVER_CHECK_INTERVAL`
+    seconds and, if it has changed (i.e. following a publishing run), the paths
+    of catalog records stamped at or after the latest record timestamp seen
+    are refreshed in a background thread, while the existing map continues to
+    be served. A record published or retracted in the meantime may therefore
+    briefly resolve as before.
+
+    A record's catalog timestamp is that of its latest contributing change,
+    so a record whose publication state changes for another reason (e.g.
+    on embargo expiry), or whose change was committed after a later-stamped
+    change had already been published, is picked up when the map is next
+    rebuilt in full, every `RESOLVER_REBUILD_INTERVAL` seconds.
+    """
+    with _catalogs_lock:
+        landing_pages = _catalogs.get(catalog_id)
+        refresh = catalog_id not in _refreshing and (
+                landing_pages is None or time.monotonic() - landing_pages.checked >= RESOLVER_CHECK_INTERVAL
+        )
+        if refresh:
+            _refreshing.add(catalog_id)
+
+    if landing_pages is None:
+        # nothing to serve yet
+        _refresh(catalog_id, refresh)
+        with _catalogs_lock:
+            if (landing_pages := _catalogs.get(catalog_id)) is None:
+                return None
+
+    elif refresh:
+        _executor.submit(_refresh, catalog_id, True)
+
+    if (path := landing_pages.paths.get(record_id or doi.lower())) is None:
+        return None
+
+    return f'{landing_pages.url}/{path}'
+
+
+def clear_resolver_cache() -> None:
+    """Discard all cached landing page maps."""
+    with _catalogs_lock:
+        _catalogs.clear()
+
+
+def _refresh(catalog_id: str, refreshing: bool) -> None:
+    """Load or update a catalog's landing page map, in a database
+    session of its own."""
+    try:
+        with _catalogs_lock:
+            landing_pages = _catalogs.get(catalog_id)
+
+        with session_scope():
+            landing_pages = _load(catalog_id, landing_pages)
+
+        with _catalogs_lock:
+            _catalogs[catalog_id] = landing_pages
+
+    except Exception:
+        logger.exception(f'{catalog_id} catalog: Failed to load landing page paths')
+
+    finally:
+        if refreshing:
+            with _catalogs_lock:
+                _refreshing.discard(catalog_id)
+
+
+def _load(catalog_id: str, landing_pages: _LandingPages | None) -> _LandingPages | None:
+    if not (catalog := Session.get(Catalog, catalog_id)):
+        return None
+
+    if (
+            landing_pages and
+            landing_pages.url == catalog.url and
+            landing_pages.timestamp is not None and
+            time.monotonic() - landing_pages.built < RESOLVER_REBUILD_INTERVAL
+    ):
+        if landing_pages.timestamp != catalog.timestamp:
+            _update(catalog_id, landing_pages)
+            landing_pages.timestamp = catalog.timestamp
+
+        landing_pages.checked = time.monotonic()
+        return landing_pages
+
+    start = time.perf_counter()
+    landing_pages = _LandingPages(
+        url=catalog.url,
+        timestamp=catalog.timestamp,
+        record_timestamp=Session.execute(
+            select(func.max(CatalogRecord.timestamp)).
+            where(CatalogRecord.catalog_id == catalog_id)
+        ).scalar_one(),
+        checked=time.monotonic(),
+        built=time.monotonic(),
+    )
+    for record_id, doi in Session.execute(
+            select(CatalogRecord.record_id, Record.doi).
+            join(Record).
+            where(CatalogRecord.catalog_id == catalog_id).
+            where(CatalogRecord.published)
+    ):
+        landing_pages.paths[record_id] = doi or record_id
+        if doi:
+            landing_pages.paths[doi.lower()] = doi
+
+    logger.info(f'{catalog_id} catalog: Loaded {len(landing_pages.paths)} landing page paths '
+                f'in {time.perf_counter() - start:.2f}s')
+
+    return landing_pages
+
+
+def _update(catalog_id: str, landing_pages: _LandingPages) -> None:
+    """Update the paths of catalog records stamped at or after the map's
+    record timestamp, in place.
+
+    The high-water mark is taken from the catalog records themselves rather
+    than from the catalog timestamp, which is stamped at the end of a
+    publishing run, later than the records published during the run.
+    """
+    start = time.perf_counter()
+    paths = landing_pages.paths
+    updated = 0
+    stmt = (
+        select(CatalogRecord.record_id, CatalogRecord.published, CatalogRecord.timestamp, Record.doi).
+        join(Record).
+        where(CatalogRecord.catalog_id == catalog_id)
+    )
+    if landing_pages.record_timestamp is not None:
+        stmt = stmt.where(CatalogRecord.timestamp >= landing_pages.record_timestamp)
+
+    for record_id, published, timestamp, doi in Session.execute(stmt):
+        if (old_path := paths.pop(record_id, None)) and old_path != record_id:
+            paths.pop(old_path.lower(), None)
+
+        if published:
+            paths[record_id] = doi or record_id
+            if doi:
+                paths[doi.lower()] = doi
+
+        if landing_pages.record_timestamp is None or timestamp > landing_pages.record_timestamp:
+            landing_pages.record_timestamp = timestamp
+
+        updated += 1
+
+    logger.info(f'{catalog_id} catalog: Updated {updated} landing page paths '
+                f'in {time.perf_counter() - start:.2f}s')
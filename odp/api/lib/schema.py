@@ -1,7 +1,10 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 from typing import Any
 
 from fastapi import HTTPException
-from jschon import JSON, JSONSchema, URI
+from jschon import JSON, JSONSchema, Result, URI
 from sqlalchemy import select
 from starlette.status import HTTP_422_UNPROCESSABLE_ENTITY
 
@@ -11,6 +14,19 @@ from odp.db import Session
 from odp.db.models import Schema, Tag, Vocabulary
 from odp.lib.schema import schema_catalog
 
+SCHEMA_EVALUATION_WORKERS = 4
+"""Maximum number of schema evaluations that may run concurrently
+off the event loop."""
+
+SCHEMA_EVALUATION_INLINE_NODES = 500
+"""Number of nodes (objects, arrays and values) below which a JSON document
+is evaluated inline, since handing it off would cost more than it saves."""
+
+_executor = ThreadPoolExecutor(max_workers=SCHEMA_EVALUATION_WORKERS, thread_name_prefix='schema-eval')
+
+_evaluated_schemas: set[URI] = set()
+"""URIs of schemas that have been evaluated at least once on the event loop thread."""
+
 
 async def get_tag_schema(tag_instance_in: TagInstanceModelIn) -> JSONSchema:
     if not (tag := Session.execute(
@@ -38,8 +54,51 @@ async def get_record_schema(record_in: RecordModelIn) -> JSONSchema:
     return schema_catalog.get_schema(URI(schema.uri))
 
 
+async def evaluate_schema(schema: JSONSchema, instance: Any) -> Result:
+    """Evaluate a JSON document against a schema.
+
+    Large documents are evaluated in a bounded worker thread pool, so that
+    the event loop continues to serve other requests meanwhile. The worker
+    runs in a copy of the request's context, so database queries made by ODP
+    schema keywords use the request's session (see `odp.db.session_scope`),
+    which the request does not otherwise touch while it awaits the result.
+
+    jschon does not document the thread-safety of schema evaluation. To
+    ensure that worker threads only ever read a compiled schema, each schema
+    is evaluated inline the first time, on the event loop thread, by which
+    point it and any schemas it references have been loaded and compiled.
+    """
+    if not _has_nodes(instance, SCHEMA_EVALUATION_INLINE_NODES) or schema.uri not in _evaluated_schemas:
+        result = schema.evaluate(JSON(instance))
+        _evaluated_schemas.add(schema.uri)
+        return result
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, copy_context().run, _evaluate_schema, schema, instance)
+
+
+def _evaluate_schema(schema: JSONSchema, instance: Any) -> Result:
+    return schema.evaluate(JSON(instance))
+
+
+def _has_nodes(instance: Any, limit: int) -> bool:
+    """Return whether a JSON document has at least `limit` nodes,
+    without traversing further than necessary to decide."""
+    count = 0
+    stack = [instance]
+    while stack:
+        if (count := count + 1) >= limit:
+            return True
+        if isinstance(node := stack.pop(), dict):
+            stack += node.values()
+        elif isinstance(node, list):
+            stack += node
+
+    return False
+
+
 async def get_metadata_validity(metadata: dict[str, Any], schema: JSONSchema) -> Any:
-    if (result := schema.evaluate(JSON(metadata))).valid:
+    if (result := await evaluate_schema(schema, metadata)).valid:
         return result.output('flag')
 
     return result.output('detailed')
@@ -1,12 +1,12 @@
 from datetime import datetime, timezone
 
 from fastapi import HTTPException
-from jschon import JSON
-from sqlalchemy import select
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import joinedload
 from starlette.status import HTTP_403_FORBIDDEN, HTTP_404_NOT_FOUND, HTTP_422_UNPROCESSABLE_ENTITY
 
 from odp.api.lib.auth import Authorized
-from odp.api.lib.schema import get_tag_schema
+from odp.api.lib.schema import evaluate_schema, get_tag_schema
 from odp.api.models import TagInstanceModel, TagInstanceModelIn
 from odp.const.db import AuditCommand, TagCardinality, TagType
 from odp.db import Session
@@ -29,6 +29,12 @@ TagInstance = CollectionTag | PackageTag | RecordTag
 
 
 class Tagger:
+    _taggable_classes = {
+        TagType.collection: Collection,
+        TagType.package: Package,
+        TagType.record: Record,
+    }
+
     _tag_instance_classes = {
         TagType.collection: CollectionTag,
         TagType.package: PackageTag,
@@ -43,6 +49,7 @@ class Tagger:
 
     def __init__(self, tag_type: TagType):
         self.tag_type = tag_type
+        self.taggable_cls = self._taggable_classes[tag_type]
         self.tag_instance_cls = self._tag_instance_classes[tag_type]
         self.tag_audit_cls = self._tag_audit_classes[tag_type]
         self.obj_id_col = f'{tag_type}_id'
@@ -57,6 +64,46 @@ class Tagger:
 
         Return the created/updated instance, or None if no change was made.
         """
+        if tag_instances := await self.set_tag_instances(tag_instance_in, [obj], auth):
+            return tag_instances[0]
+
+    async def delete_tag_instance(
+            self,
+            tag_instance_id: str,
+            obj: Taggable,
+            auth: Authorized,
+    ) -> None:
+        if not (tag_instance := Session.execute(
+                select(self.tag_instance_cls)
+                        .where(self.tag_instance_cls.id == tag_instance_id)
+                        .where(getattr(self.tag_instance_cls, self.obj_id_col) == obj.id)
+        ).scalar_one_or_none()):
+            raise HTTPException(HTTP_404_NOT_FOUND)
+
+        # only admin users can delete other users' tags
+        if not auth.scope.is_admin and tag_instance.user_id != auth.user_id:
+            raise HTTPException(HTTP_403_FORBIDDEN)
+
+        tag_instance.delete()
+
+        obj.timestamp = (timestamp := datetime.now(timezone.utc))
+        obj.save()
+
+        self._create_audit_record(tag_instance, AuditCommand.delete, auth, timestamp)
+
+    async def set_tag_instances(
+            self,
+            tag_instance_in: TagInstanceModelIn,
+            objs: list[Taggable],
+            auth: Authorized,
+    ) -> list[TagInstance]:
+        """Create or update a tag instance attached to each of `objs`.
+
+        The tag payload is validated once (if any change is to be made),
+        existing instances are fetched with a single query, and instances
+        and audit records are written in bulk. Return the created/updated
+        instances, omitting any object on which no change was made.
+        """
         if not (tag := Session.get(Tag, (tag_instance_in.tag_id, self.tag_type))):
             raise HTTPException(HTTP_404_NOT_FOUND)
 
@@ -76,92 +123,114 @@ class Tagger:
         else:
             tag_instance_in_keyword_id = None
 
-        # only one tag instance per object is allowed
-        # update existing tag instance if found
-        if tag.cardinality == TagCardinality.one:
-            if tag_instance := Session.execute(
-                    select(self.tag_instance_cls)
-                            .where(getattr(self.tag_instance_cls, self.obj_id_col) == obj.id)
-                            .where(self.tag_instance_cls.tag_id == tag_instance_in.tag_id)
-            ).scalar_one_or_none():
-                command = AuditCommand.update
-            else:
-                command = AuditCommand.insert
+        obj_id_attr = getattr(self.tag_instance_cls, self.obj_id_col)
+        existing_instances = {}
+        if tag.cardinality in (TagCardinality.one, TagCardinality.user):
+            stmt = (
+                select(self.tag_instance_cls)
+                .where(obj_id_attr.in_([obj.id for obj in objs]))
+                .where(self.tag_instance_cls.tag_id == tag_instance_in.tag_id)
+            )
+            if tag.cardinality == TagCardinality.user:
+                stmt = stmt.where(self.tag_instance_cls.user_id == auth.user_id)
+
+            existing_instances = {
+                getattr(tag_instance, self.obj_id_col): tag_instance
+                for tag_instance in Session.execute(stmt).scalars()
+            }
 
-        # one tag instance per user per object is allowed
-        # update a user's existing tag instance if found
-        elif tag.cardinality == TagCardinality.user:
-            if tag_instance := Session.execute(
-                    select(self.tag_instance_cls)
-                            .where(getattr(self.tag_instance_cls, self.obj_id_col) == obj.id)
-                            .where(self.tag_instance_cls.tag_id == tag_instance_in.tag_id)
-                            .where(self.tag_instance_cls.user_id == auth.user_id)
-            ).scalar_one_or_none():
+        elif tag.cardinality != TagCardinality.multi:
+            assert False
+
+        changes = []
+        for obj in objs:
+            if tag_instance := existing_instances.get(obj.id):
+                if (
+                        tag_instance.data == tag_instance_in.data and
+                        tag_instance.keyword_id == tag_instance_in_keyword_id
+                ):
+                    continue
                 command = AuditCommand.update
             else:
+                tag_instance_kwargs = {self.obj_id_col: obj.id} | dict(
+                    tag_id=tag_instance_in.tag_id,
+                    tag_type=self.tag_type,
+                )
+                tag_instance = self.tag_instance_cls(**tag_instance_kwargs)
                 command = AuditCommand.insert
 
-        # multiple tag instances are allowed per user per object
-        # can only insert/delete
-        elif tag.cardinality == TagCardinality.multi:
-            command = AuditCommand.insert
+            changes += [(tag_instance, command)]
 
-        else:
-            assert False
+        if not changes:
+            return []
 
-        if command == AuditCommand.insert:
-            tag_instance_kwargs = {self.obj_id_col: obj.id} | dict(
-                tag_id=tag_instance_in.tag_id,
-                tag_type=self.tag_type,
-            )
-            tag_instance = self.tag_instance_cls(**tag_instance_kwargs)
+        tag_schema = await get_tag_schema(tag_instance_in)
+        validity = (await evaluate_schema(tag_schema, tag_instance_in.data)).output('detailed')
+        if not validity['valid']:
+            raise HTTPException(HTTP_422_UNPROCESSABLE_ENTITY, validity)
 
-        if (
-                tag_instance.data != tag_instance_in.data or
-                tag_instance.keyword_id != tag_instance_in_keyword_id
-        ):
-            tag_schema = await get_tag_schema(tag_instance_in)
-            validity = tag_schema.evaluate(JSON(tag_instance_in.data)).output('detailed')
-            if not validity['valid']:
-                raise HTTPException(HTTP_422_UNPROCESSABLE_ENTITY, validity)
+        timestamp = datetime.now(timezone.utc)
+        for tag_instance, command in changes:
+            if command == AuditCommand.insert:
+                Session.add(tag_instance)
 
             tag_instance.user_id = auth.user_id
             tag_instance.vocabulary_id = tag.vocabulary_id
             tag_instance.keyword_id = tag_instance_in_keyword_id
             tag_instance.data = tag_instance_in.data
-            tag_instance.timestamp = (timestamp := datetime.now(timezone.utc))
-            tag_instance.save()
+            tag_instance.timestamp = timestamp
 
-            obj.timestamp = timestamp
-            obj.save()
+        Session.flush()
+        self._touch_objs([getattr(tag_instance, self.obj_id_col) for tag_instance, _ in changes], timestamp)
+        Session.execute(insert(self.tag_audit_cls), [
+            self._audit_record_kwargs(tag_instance, command, auth, timestamp)
+            for tag_instance, command in changes
+        ])
 
-            self._create_audit_record(tag_instance, command, auth, timestamp)
+        return [tag_instance for tag_instance, _ in changes]
 
-            return tag_instance
-
-    async def delete_tag_instance(
+    async def delete_tag_instances(
             self,
-            tag_instance_id: str,
-            obj: Taggable,
+            tag_id: str,
+            objs: list[Taggable],
             auth: Authorized,
-    ) -> None:
-        if not (tag_instance := Session.execute(
-                select(self.tag_instance_cls)
-                        .where(self.tag_instance_cls.id == tag_instance_id)
-                        .where(getattr(self.tag_instance_cls, self.obj_id_col) == obj.id)
-        ).scalar_one_or_none()):
-            raise HTTPException(HTTP_404_NOT_FOUND)
-
-        # only admin users can delete other users' tags
-        if not auth.scope.is_admin and tag_instance.user_id != auth.user_id:
-            raise HTTPException(HTTP_403_FORBIDDEN)
-
-        tag_instance.delete()
-
-        obj.timestamp = (timestamp := datetime.now(timezone.utc))
-        obj.save()
+    ) -> list[TagInstance]:
+        """Delete instances of the tag `tag_id` attached to any of `objs`,
+        returning the deleted instances.
 
-        self._create_audit_record(tag_instance, AuditCommand.delete, auth, timestamp)
+        Only the calling user's instances are deleted, unless the caller
+        has an admin scope.
+        """
+        stmt = (
+            select(self.tag_instance_cls)
+            .where(getattr(self.tag_instance_cls, self.obj_id_col).in_([obj.id for obj in objs]))
+            .where(self.tag_instance_cls.tag_id == tag_id)
+        )
+        if not auth.scope.is_admin:
+            stmt = stmt.where(self.tag_instance_cls.user_id == auth.user_id)
+
+        tag_instances = Session.execute(stmt).scalars().all()
+        if tag_instances:
+            for tag_instance in tag_instances:
+                Session.delete(tag_instance)
+            Session.flush()
+
+            timestamp = datetime.now(timezone.utc)
+            self._touch_objs([getattr(tag_instance, self.obj_id_col) for tag_instance in tag_instances], timestamp)
+            Session.execute(insert(self.tag_audit_cls), [
+                self._audit_record_kwargs(tag_instance, AuditCommand.delete, auth, timestamp)
+                for tag_instance in tag_instances
+            ])
+
+        return tag_instances
+
+    def _touch_objs(self, obj_ids: list[str], timestamp: datetime) -> None:
+        Session.execute(
+            update(self.taggable_cls).
+            where(self.taggable_cls.id.in_(set(obj_ids))).
+            values(timestamp=timestamp),
+            execution_options=dict(synchronize_session='fetch'),
+        )
 
     def _create_audit_record(
             self,
@@ -170,7 +239,16 @@ class Tagger:
             auth: Authorized,
             timestamp: datetime,
     ) -> None:
-        tag_audit_kwargs = {f'_{self.obj_id_col}': getattr(tag_instance, self.obj_id_col)} | dict(
+        self.tag_audit_cls(**self._audit_record_kwargs(tag_instance, command, auth, timestamp)).save()
+
+    def _audit_record_kwargs(
+            self,
+            tag_instance: TagInstance,
+            command: AuditCommand,
+            auth: Authorized,
+            timestamp: datetime,
+    ) -> dict:
+        return {f'_{self.obj_id_col}': getattr(tag_instance, self.obj_id_col)} | dict(
             client_id=auth.client_id,
             user_id=auth.user_id,
             command=command,
@@ -181,7 +259,6 @@ class Tagger:
             _data=tag_instance.data,
             _keyword_id=tag_instance.keyword_id,
         )
-        self.tag_audit_cls(**tag_audit_kwargs).save()
 
 
 def output_tag_instance_model(tag_instance: Taggable) -> TagInstanceModel:
@@ -213,3 +290,13 @@ def output_tag_instance_model(tag_instance: Taggable) -> TagInstanceModel:
         )
 
     return TagInstanceModel(**tag_instance_args)
+
+
+def tag_instance_load_options(tag_instance_cls: type[TagInstance]) -> tuple:
+    """Return loader options for the relationships of a tag instance
+    class that are accessed by `output_tag_instance_model`."""
+    return (
+        joinedload(tag_instance_cls.tag),
+        joinedload(tag_instance_cls.user),
+        joinedload(tag_instance_cls.keyword),
+    )
@@ -1,5 +1,9 @@
+from datetime import datetime, timezone
 from typing import Optional
 
+from sqlalchemy import Text, case, cast, func
+from sqlalchemy.sql import ColumnElement
+
 from odp.api.models import PublishedDataCiteRecordModel, PublishedRecordModel, PublishedSAEONRecordModel
 from odp.const import ODPCatalog
 from odp.db.models import CatalogRecord
@@ -16,10 +20,65 @@ def output_published_record_model(catalog_record: CatalogRecord) -> Optional[Pub
             spatial_east=catalog_record.spatial_east,
             spatial_south=catalog_record.spatial_south,
             spatial_west=catalog_record.spatial_west,
-            temporal_start=catalog_record.temporal_start.isoformat() if catalog_record.temporal_start else None,
-            temporal_end=catalog_record.temporal_end.isoformat() if catalog_record.temporal_end else None,
+            temporal_start=_isoformat_utc(catalog_record.temporal_start),
+            temporal_end=_isoformat_utc(catalog_record.temporal_end),
             searchable=catalog_record.searchable,
         ))
 
     if catalog_record.catalog_id == ODPCatalog.DATACITE:
         return PublishedDataCiteRecordModel(**catalog_record.published_record)
+
+
+def published_record_json() -> ColumnElement:
+    """Return a SQL expression that serializes a catalog record's published
+    record, merged with its index fields, to JSON text.
+
+    This is the database-side equivalent of `output_published_record_model`,
+    which lets published records be passed through to API responses without
+    being parsed, validated and re-serialized in Python. The two must produce
+    the same JSON; timestamps in particular are formatted in UTC, as by
+    `datetime.isoformat`.
+
+    Listings and searches serialize records with this expression on each
+    request. The single-record endpoint instead serves the stored, compressed
+    copy in `CatalogRecord.published_record_gzip` - as is, or decompressed -
+    falling back to this expression only where no stored copy exists.
+    """
+    index_fields = func.jsonb_build_object(
+        'keywords', CatalogRecord.keywords,
+        'spatial_north', CatalogRecord.spatial_north,
+        'spatial_east', CatalogRecord.spatial_east,
+        'spatial_south', CatalogRecord.spatial_south,
+        'spatial_west', CatalogRecord.spatial_west,
+        'temporal_start', _sql_isoformat_utc(CatalogRecord.temporal_start),
+        'temporal_end', _sql_isoformat_utc(CatalogRecord.temporal_end),
+        'searchable', CatalogRecord.searchable,
+    )
+    return case(
+        (
+            CatalogRecord.catalog_id.in_((ODPCatalog.SAEON, ODPCatalog.MIMS)),
+            cast(CatalogRecord.published_record.op('||')(index_fields), Text),
+        ),
+        else_=cast(CatalogRecord.published_record, Text),
+    ).label('published_record_json')
+
+
+def _isoformat_utc(timestamp: datetime | None) -> str | None:
+    """Format a timestamp in UTC. Timestamps are normalized to UTC so that
+    the output does not depend on the time zone of the value in hand, which
+    for a timestamp read from the database is the session time zone."""
+    return timestamp.astimezone(timezone.utc).isoformat() if timestamp else None
+
+
+def _sql_isoformat_utc(timestamp: ColumnElement) -> ColumnElement:
+    """Return a SQL expression that formats a timestamptz value the way
+    `_isoformat_utc` does; Postgres' own JSON formatting differs in using
+    the session time zone and omitting trailing zeros from fractional seconds."""
+    utc_timestamp = func.timezone('UTC', timestamp)
+    return case(
+        (
+            func.date_trunc('second', utc_timestamp) == utc_timestamp,
+            func.to_char(utc_timestamp, 'YYYY-MM-DD"T"HH24:MI:SS"+00:00"'),
+        ),
+        else_=func.to_char(utc_timestamp, 'YYYY-MM-DD"T"HH24:MI:SS.US"+00:00"'),
+    )
@@ -1,12 +1,34 @@
+import time
+from contextlib import asynccontextmanager
 from importlib import import_module
 
-from fastapi import FastAPI, Request, Response
+from fastapi import Depends, FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 
+from odp.api.lib.auth import Authorize
+from odp.api.lib.metrics import record_request, render_metrics
 from odp.config import config
-from odp.db import Session
+from odp.const import ODPScope
+from odp.db import Session, session_scope
+from odp.lib import sqlstats
+from odp.lib.archive import ArchiveAdapter
+from odp.lib.schema import warm_up_schemas
 from odp.version import VERSION
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        warm_up_schemas()
+    finally:
+        Session.remove()
+
+    yield
+    ArchiveAdapter.close_all()
+
+
 app = FastAPI(
     title="ODP API",
     description="SAEON | Open Data Platform API",
@@ -14,6 +36,8 @@ app = FastAPI(
     root_path=config.ODP.API.PATH_PREFIX,
     docs_url='/swagger',
     redoc_url='/docs',
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 for route in (
@@ -45,16 +69,44 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=1000,
+)
+
 
 @app.middleware('http')
 async def db_middleware(request: Request, call_next):
-    try:
+    start = time.perf_counter()
+    with sqlstats.collect() as stats, session_scope():
         response: Response = await call_next(request)
         if 200 <= response.status_code < 400:
             Session.commit()
         else:
             Session.rollback()
-    finally:
-        Session.remove()
+
+    duration = time.perf_counter() - start
+    response.headers['Server-Timing'] = (
+        f'db;dur={stats.time * 1000:.1f};desc="{stats.count} queries", '
+        f'total;dur={duration * 1000:.1f}'
+    )
+
+    route = request.scope.get('route')
+    record_request(request.method, route.path if route else None, response.status_code, duration, stats)
 
     return response
+
+
+@app.get(
+    '/metrics',
+    response_class=PlainTextResponse,
+    include_in_schema=False,
+    dependencies=[Depends(Authorize(ODPScope.CLIENT_READ))],
+)
+async def metrics():
+    """Request and SQL statement metrics, in Prometheus text format.
+
+    Metrics describe the traffic of all API clients, so access is restricted
+    to clients that may read client configurations.
+    """
+    return render_metrics()
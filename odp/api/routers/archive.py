@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func, select
+from sqlalchemy import select
 from starlette.status import HTTP_404_NOT_FOUND
 
 from odp.api.lib.auth import Authorize
@@ -7,19 +7,19 @@ from odp.api.lib.paging import Paginator
 from odp.api.models import ArchiveModel, Page
 from odp.const import ODPScope
 from odp.db import Session
-from odp.db.models import Archive, ArchiveResource
+from odp.db.models import Archive
 
 router = APIRouter()
 
 
-def output_archive_model(result) -> ArchiveModel:
+def output_archive_model(archive: Archive) -> ArchiveModel:
     return ArchiveModel(
-        id=result.Archive.id,
-        type=result.Archive.type,
-        scope_id=result.Archive.scope_id,
-        upload_url=result.Archive.upload_url,
-        download_url=result.Archive.download_url,
-        resource_count=result.count,
+        id=archive.id,
+        type=archive.type,
+        scope_id=archive.scope_id,
+        upload_url=archive.upload_url,
+        download_url=archive.download_url,
+        resource_count=archive.resource_count,
     )
 
 
@@ -33,16 +33,9 @@ async def list_archives(
     """
     List all archive configurations. Requires scope `odp.archive:read`.
     """
-    stmt = (
-        select(Archive, func.count(ArchiveResource.archive_id)).
-        outerjoin(ArchiveResource).
-        group_by(Archive)
-    )
-
     return paginator.paginate(
-        stmt,
-        lambda row: output_archive_model(row),
-        sort_model=Archive,
+        select(Archive),
+        lambda row: output_archive_model(row.Archive),
     )
 
 
@@ -56,14 +49,7 @@ async def get_archive(
     """
     Get an archive configuration. Requires scope `odp.archive:read`.
     """
-    stmt = (
-        select(Archive, func.count(ArchiveResource.archive_id)).
-        outerjoin(ArchiveResource).
-        group_by(Archive).
-        where(Archive.id == archive_id)
-    )
-
-    if not (result := Session.execute(stmt).one_or_none()):
+    if not (archive := Session.get(Archive, archive_id)):
         raise HTTPException(HTTP_404_NOT_FOUND)
 
-    return output_archive_model(result)
+    return output_archive_model(archive)
@@ -1,3 +1,4 @@
+import gzip
 import re
 from datetime import date
 from enum import Enum
@@ -6,19 +7,22 @@ from math import ceil
 from typing import Any, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query
-from fastapi.responses import RedirectResponse
+import orjson
+from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query, Request
+from fastapi.responses import RedirectResponse, Response
 from jschon import JSONPointer
-from jschon.exc import JSONPointerMalformedError, JSONPointerReferenceError
-from pydantic import Json
-from sqlalchemy import and_, func, or_, select, text
-from sqlalchemy.orm import aliased, load_only
+from jschon.exc import JSONPointerMalformedError
+from pydantic import BaseModel, Json
+from sqlalchemy import Text, and_, bindparam, cast, func, or_, select, text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.orm import aliased, defer, load_only
 from starlette.status import HTTP_404_NOT_FOUND, HTTP_422_UNPROCESSABLE_ENTITY
 
 from odp.api.lib.auth import Authorize
 from odp.api.lib.datacite import get_datacite_client
 from odp.api.lib.paging import Paginator
-from odp.api.lib.utils import output_published_record_model
+from odp.api.lib.resolver import resolve_landing_page
+from odp.api.lib.utils import published_record_json
 from odp.api.models import (
     CatalogModel,
     CatalogModelWithData,
@@ -35,12 +39,20 @@ from odp.lib.datacite import DataciteClient, DataciteError
 
 router = APIRouter()
 
+RECORD_LOOKUP_LIMIT = 1000
+"""Maximum number of record identifiers that may be looked up in one request."""
+
 
 class SearchResultSort(str, Enum):
     TIMESTAMP_DESC = 'timestamp desc'
     RANK_DESC = 'rank desc'
 
 
+class RecordLookupResult(BaseModel):
+    items: list[PublishedSAEONRecordModel | PublishedDataCiteRecordModel]
+    not_found: list[str]
+
+
 @router.get(
     '/',
     response_model=Page[CatalogModel],
@@ -50,10 +62,8 @@ async def list_catalogs(
         paginator: Paginator = Depends(),
 ):
     stmt = (
-        select(Catalog, func.count(CatalogRecord.catalog_id)).
-        options(load_only(Catalog.id, Catalog.url)).
-        outerjoin(CatalogRecord, and_(Catalog.id == CatalogRecord.catalog_id, CatalogRecord.published)).
-        group_by(Catalog)
+        select(Catalog).
+        options(load_only(Catalog.id, Catalog.url, Catalog.record_count))
     )
 
     return paginator.paginate(
@@ -61,7 +71,7 @@ async def list_catalogs(
         lambda row: CatalogModel(
             id=row.Catalog.id,
             url=row.Catalog.url,
-            record_count=row.count,
+            record_count=row.Catalog.record_count,
         )
     )
 
@@ -74,22 +84,15 @@ async def list_catalogs(
 async def get_catalog(
         catalog_id: str,
 ):
-    stmt = (
-        select(Catalog, func.count(CatalogRecord.catalog_id)).
-        outerjoin(CatalogRecord, and_(Catalog.id == CatalogRecord.catalog_id, CatalogRecord.published)).
-        group_by(Catalog).
-        where(Catalog.id == catalog_id)
-    )
-
-    if not (result := Session.execute(stmt).one_or_none()):
+    if not (catalog := Session.get(Catalog, catalog_id)):
         raise HTTPException(HTTP_404_NOT_FOUND)
 
     return CatalogModelWithData(
-        id=result.Catalog.id,
-        url=result.Catalog.url,
-        data=result.Catalog.data,
-        timestamp=result.Catalog.timestamp.isoformat() if result.Catalog.timestamp else None,
-        record_count=result.count,
+        id=catalog.id,
+        url=catalog.url,
+        data=catalog.data,
+        timestamp=catalog.timestamp.isoformat() if catalog.timestamp else None,
+        record_count=catalog.record_count,
     )
 
 
@@ -109,7 +112,7 @@ async def list_records(
         raise HTTPException(HTTP_404_NOT_FOUND)
 
     stmt = (
-        select(CatalogRecord)
+        select(CatalogRecord.record_id, CatalogRecord.published, published_record_json())
         .where(CatalogRecord.catalog_id == catalog_id)
     )
 
@@ -124,10 +127,11 @@ async def list_records(
     if updated_since:
         stmt = stmt.where(CatalogRecord.timestamp >= updated_since)
 
-    return paginator.paginate(
+    return paginator.paginate_json(
         stmt,
-        lambda row: output_published_record_model(row.CatalogRecord) if row.CatalogRecord.published
-        else RetractedRecordModel(id=row.CatalogRecord.record_id),
+        lambda row: row.published_record_json if row.published
+        else RetractedRecordModel(id=row.record_id).json(),
+        sort_model=CatalogRecord,
     )
 
 
@@ -239,8 +243,10 @@ async def search_records(
 
     limit = size or total
     items = [
-        output_published_record_model(row.CatalogRecord) for row in Session.execute(
+        row.published_record_json for row in Session.execute(
             stmt.
+            add_columns(published_record_json()).
+            options(load_only(CatalogRecord.record_id)).
             order_by(order_by).
             offset(limit * (page - 1)).
             limit(limit)
@@ -267,15 +273,29 @@ async def search_records(
         facets.setdefault(row.facet, [])
         facets[row.facet] += [(row.value, row.count)]
 
-    return SearchResult(
-        facets=facets,
-        items=items,
-        total=total,
-        page=page,
-        pages=ceil(total / limit) if limit else 0,
+    return Response(
+        content=(
+            f'{{"facets":{orjson.dumps(facets).decode()},"items":[{",".join(items)}],'
+            f'"total":{total},"page":{page},"pages":{ceil(total / limit) if limit else 0}}}'
+        ),
+        media_type='application/json',
     )
 
 
+def parse_record_id_or_doi(record_id_or_doi: str) -> tuple[str | None, str | None]:
+    """Return a (record_id, doi) tuple, exactly one of which is set,
+    for a record identifier given as a UUID or DOI."""
+    try:
+        UUID(record_id_or_doi, version=4)
+        return record_id_or_doi, None
+
+    except ValueError:
+        if re.match(DOI_REGEX, record_id_or_doi):
+            return None, record_id_or_doi
+
+        raise HTTPException(HTTP_422_UNPROCESSABLE_ENTITY, 'Invalid record identifier: expecting a UUID or DOI')
+
+
 async def get_catalog_record_by_id_or_doi(
         catalog_id: str,
         record_id_or_doi: str = Path(..., title='UUID or DOI'),
@@ -283,20 +303,17 @@ async def get_catalog_record_by_id_or_doi(
     """Dependency function for retrieving a published catalog record."""
     stmt = (
         select(CatalogRecord).
+        options(defer(CatalogRecord.published_record)).
         where(CatalogRecord.catalog_id == catalog_id).
         where(CatalogRecord.published)
     )
 
-    try:
-        UUID(record_id_or_doi, version=4)
-        stmt = stmt.where(CatalogRecord.record_id == record_id_or_doi)
-
-    except ValueError:
-        if re.match(DOI_REGEX, record_id_or_doi):
-            stmt = stmt.join(Record)
-            stmt = stmt.where(func.lower(Record.doi) == record_id_or_doi.lower())
-        else:
-            raise HTTPException(HTTP_422_UNPROCESSABLE_ENTITY, 'Invalid record identifier: expecting a UUID or DOI')
+    record_id, doi = parse_record_id_or_doi(record_id_or_doi)
+    if record_id:
+        stmt = stmt.where(CatalogRecord.record_id == record_id)
+    else:
+        stmt = stmt.join(Record)
+        stmt = stmt.where(func.lower(Record.doi) == doi.lower())
 
     if not (catalog_record := Session.execute(stmt).scalar_one_or_none()):
         raise HTTPException(HTTP_404_NOT_FOUND)
@@ -304,15 +321,100 @@ async def get_catalog_record_by_id_or_doi(
     return catalog_record
 
 
+@router.post(
+    '/{catalog_id}/records/lookup',
+    response_model=RecordLookupResult,
+    dependencies=[Depends(Authorize(ODPScope.CATALOG_READ))],
+    description='Get published records for a list of record UUIDs and/or DOIs.',
+)
+async def lookup_records(
+        catalog_id: str,
+        record_ids_or_dois: list[str] = Body(min_items=1, max_items=RECORD_LOOKUP_LIMIT),
+):
+    if not Session.get(Catalog, catalog_id):
+        raise HTTPException(HTTP_404_NOT_FOUND)
+
+    record_ids = set()
+    dois = set()
+    for record_id_or_doi in record_ids_or_dois:
+        record_id, doi = parse_record_id_or_doi(record_id_or_doi)
+        if record_id:
+            record_ids.add(record_id)
+        else:
+            dois.add(doi.lower())
+
+    found = {}
+    for row in Session.execute(
+            select(CatalogRecord.record_id, func.lower(Record.doi).label('doi'), published_record_json()).
+            join(Record).
+            where(CatalogRecord.catalog_id == catalog_id).
+            where(CatalogRecord.published).
+            where(or_(
+                CatalogRecord.record_id.in_(record_ids),
+                func.lower(Record.doi).in_(dois),
+            ))
+    ):
+        found[row.record_id] = row
+        if row.doi:
+            found[row.doi] = row
+
+    # a record requested by more than one identifier (e.g. by both
+    # UUID and DOI) is included once, at its first position
+    items = {}
+    not_found = []
+    for record_id_or_doi in dict.fromkeys(record_ids_or_dois):
+        if (row := found.get(record_id_or_doi) or found.get(record_id_or_doi.lower())) is not None:
+            items.setdefault(row.record_id, row.published_record_json)
+        else:
+            not_found += [record_id_or_doi]
+
+    return Response(
+        content=f'{{"items":[{",".join(items.values())}],"not_found":{orjson.dumps(not_found).decode()}}}',
+        media_type='application/json',
+    )
+
+
 @router.get(
     '/{catalog_id}/records/{record_id_or_doi:path}',
     response_model=PublishedSAEONRecordModel | PublishedDataCiteRecordModel,
     dependencies=[Depends(Authorize(ODPScope.CATALOG_READ))],
 )
 async def get_record(
+        request: Request,
         catalog_record: CatalogRecord = Depends(get_catalog_record_by_id_or_doi),
 ):
-    return output_published_record_model(catalog_record)
+    stmt = (
+        select().
+        where(CatalogRecord.catalog_id == catalog_record.catalog_id).
+        where(CatalogRecord.record_id == catalog_record.record_id)
+    )
+
+    if (content := Session.execute(
+            stmt.add_columns(CatalogRecord.published_record_gzip)
+    ).scalar_one()) is None:
+        return Response(
+            content=Session.execute(
+                stmt.add_columns(published_record_json())
+            ).scalar_one(),
+            media_type='application/json',
+            headers={'Vary': 'Accept-Encoding'},
+        )
+
+    # pass the precompressed record through to clients that accept gzip;
+    # GZipMiddleware leaves responses with a Content-Encoding untouched.
+    # Other clients get the same bytes, decompressed
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        return Response(
+            content=content,
+            media_type='application/json',
+            headers={'Content-Encoding': 'gzip', 'Vary': 'Accept-Encoding'},
+        )
+
+    return Response(
+        content=gzip.decompress(content),
+        media_type='application/json',
+        headers={'Vary': 'Accept-Encoding'},
+    )
 
 
 @router.get(
@@ -327,27 +429,39 @@ async def get_metadata_value(
                                                   'from a published record\'s `"metadata_records"` by the given `schema_id`'),
         catalog_record: CatalogRecord = Depends(get_catalog_record_by_id_or_doi),
 ):
-    published_record = output_published_record_model(catalog_record)
-    if not isinstance(published_record, PublishedSAEONRecordModel):
+    if catalog_record.catalog_id not in (ODPCatalog.SAEON, ODPCatalog.MIMS):
         raise HTTPException(HTTP_422_UNPROCESSABLE_ENTITY, 'Function not available for the specified record')
 
     try:
-        metadata_dict = next((
-            metadata_record.metadata
-            for metadata_record in published_record.metadata_records
-            if metadata_record.schema_id == schema_id
-        ))
-    except StopIteration:
-        raise HTTPException(HTTP_422_UNPROCESSABLE_ENTITY, 'Metadata not available for the specified schema')
-
-    try:
-        value = JSONPointer(json_pointer).evaluate(metadata_dict)
+        path = list(JSONPointer(json_pointer))
     except JSONPointerMalformedError as e:
         raise HTTPException(HTTP_422_UNPROCESSABLE_ENTITY, str(e))
-    except JSONPointerReferenceError:
-        return None
 
-    return value
+    # select the metadata document for the given schema, and evaluate the
+    # JSON pointer against it, without loading the published record
+    metadata = func.jsonb_path_query_first(
+        CatalogRecord.published_record,
+        '$.metadata_records[*] ? (@.schema_id == $schema_id).metadata',
+        func.jsonb_build_object('schema_id', schema_id),
+        type_=JSONB,
+    )
+    result = Session.execute(
+        select(
+            (metadata != None).label('found'),
+            cast(metadata.op('#>')(bindparam('path', path, type_=ARRAY(Text))), Text).label('value'),
+        ).
+        where(CatalogRecord.catalog_id == catalog_record.catalog_id).
+        where(CatalogRecord.record_id == catalog_record.record_id)
+    ).one()
+
+    if not result.found:
+        raise HTTPException(HTTP_422_UNPROCESSABLE_ENTITY, 'Metadata not available for the specified schema')
+
+    # a reference to a nonexistent location evaluates to SQL NULL
+    return Response(
+        content=result.value if result.value is not None else 'null',
+        media_type='application/json',
+    )
 
 
 @router.get(
@@ -387,9 +501,11 @@ async def get_external_record(
     description='Redirect to the web page for a catalog record.',
 )
 async def redirect_to(
-        catalog_record: CatalogRecord = Depends(get_catalog_record_by_id_or_doi),
+        catalog_id: str,
+        record_id_or_doi: str = Path(..., title='UUID or DOI'),
 ):
-    url = f'{catalog_record.catalog.url}/'
-    url += catalog_record.record.doi if catalog_record.record.doi else catalog_record.record_id
+    record_id, doi = parse_record_id_or_doi(record_id_or_doi)
+    if not (url := resolve_landing_page(catalog_id, record_id, doi)):
+        raise HTTPException(HTTP_404_NOT_FOUND)
 
     return RedirectResponse(url)
@@ -1,3 +1,11 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from functools import partial
+from typing import Any, Iterable
+
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from starlette.status import HTTP_404_NOT_FOUND, HTTP_409_CONFLICT, HTTP_422_UNPROCESSABLE_ENTITY
@@ -11,9 +19,76 @@ from odp.db.models import Client
 
 router = APIRouter()
 
+HYDRA_CLIENT_CACHE_TTL = 60
+"""Number of seconds for which Hydra client metadata is cached."""
+
+HYDRA_CLIENT_FETCH_CONCURRENCY = 8
+"""Maximum number of concurrent requests to Hydra when fetching
+the metadata of uncached clients."""
+
+_hydra_clients: dict[str, tuple[float, Any]] = {}
+"""Cached Hydra clients, with their expiry times, by client id."""
+_hydra_clients_generation = 0
+"""Incremented on invalidation, to discard fetches that span an invalidation."""
+_hydra_clients_lock = threading.Lock()
+_hydra_clients_executor = ThreadPoolExecutor(
+    max_workers=HYDRA_CLIENT_FETCH_CONCURRENCY,
+    thread_name_prefix='hydra-client',
+)
+
+
+def get_hydra_clients(client_ids: Iterable[str]) -> dict[str, Any]:
+    """Return Hydra's config for the given clients, by client id.
+
+    Client metadata is cached for `HYDRA_CLIENT_CACHE_TTL` seconds. Uncached
+    clients are fetched from Hydra concurrently, with at most
+    `HYDRA_CLIENT_FETCH_CONCURRENCY` requests in flight; the cache lock is
+    not held while Hydra is being called.
+
+    The cache is per API worker process: `invalidate_hydra_client_cache`
+    takes effect only in the worker that handled the change, so other
+    workers may serve a client's previous metadata for up to the TTL.
+
+    This blocks until all fetches complete, so API routes must call it
+    in an executor, and not on the event loop.
+    """
+    client_ids = set(client_ids)
+    now = time.monotonic()
+    with _hydra_clients_lock:
+        generation = _hydra_clients_generation
+        hydra_clients = {
+            client_id: cached[1]
+            for client_id in client_ids
+            if (cached := _hydra_clients.get(client_id)) and cached[0] > now
+        }
+
+    if missing_ids := list(client_ids - hydra_clients.keys()):
+        fetched = dict(zip(missing_ids, _hydra_clients_executor.map(hydra_admin_api.get_client, missing_ids)))
+        expiry = time.monotonic() + HYDRA_CLIENT_CACHE_TTL
+        with _hydra_clients_lock:
+            if generation == _hydra_clients_generation:
+                _hydra_clients.update({
+                    client_id: (expiry, hydra_client) for client_id, hydra_client in fetched.items()
+                })
+        hydra_clients |= fetched
 
-def output_client_model(client: Client) -> ClientModel:
-    hydra_client = hydra_admin_api.get_client(client.id)
+    return hydra_clients
+
+
+def get_hydra_client(client_id: str) -> Any:
+    """Return Hydra's config for the given client; see `get_hydra_clients`."""
+    return get_hydra_clients([client_id])[client_id]
+
+
+def invalidate_hydra_client_cache() -> None:
+    """Discard cached Hydra client metadata in this worker process."""
+    global _hydra_clients_generation
+    with _hydra_clients_lock:
+        _hydra_clients.clear()
+        _hydra_clients_generation += 1
+
+
+def output_client_model(client: Client, hydra_client: Any) -> ClientModel:
     return ClientModel(
         id=client.id,
         name=hydra_client.name,
@@ -45,6 +120,7 @@ def create_or_update_hydra_client(client_in: ClientModelIn) -> None:
         allowed_cors_origins=client_in.allowed_cors_origins,
         client_credentials_grant_access_token_lifespan=client_in.client_credentials_grant_access_token_lifespan,
     )
+    invalidate_hydra_client_cache()
 
 
 @router.get(
@@ -55,10 +131,16 @@ def create_or_update_hydra_client(client_in: ClientModelIn) -> None:
 async def list_clients(
         paginator: Paginator = Depends(),
 ):
-    return paginator.paginate(
+    hydra_clients = {}
+    # the page's Hydra clients are fetched within pagination, which
+    # therefore runs in a worker thread, in the request's session scope
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, copy_context().run, partial(
+        paginator.paginate,
         select(Client),
-        lambda row: output_client_model(row.Client),
-    )
+        lambda row: output_client_model(row.Client, hydra_clients[row.Client.id]),
+        prefetch=lambda rows: hydra_clients.update(get_hydra_clients(row.Client.id for row in rows)),
+    ))
 
 
 @router.get(
@@ -72,7 +154,8 @@ async def get_client(
     if not (client := Session.get(Client, client_id)):
         raise HTTPException(HTTP_404_NOT_FOUND)
 
-    return output_client_model(client)
+    loop = asyncio.get_running_loop()
+    return output_client_model(client, await loop.run_in_executor(None, get_hydra_client, client.id))
 
 
 @router.post(
@@ -139,3 +222,4 @@ async def delete_client(
 
     client.delete()
     hydra_admin_api.delete_client(client_id)
+    invalidate_hydra_client_cache()
@@ -2,15 +2,15 @@ from datetime import datetime, timezone
 from functools import partial
 from random import randint
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException
 from sqlalchemy import func, literal_column, null, select, union_all
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import aliased
+from sqlalchemy.orm import aliased, joinedload, selectinload
 from starlette.status import HTTP_404_NOT_FOUND, HTTP_409_CONFLICT, HTTP_422_UNPROCESSABLE_ENTITY
 
-from odp.api.lib.auth import Authorize, Authorized, TagAuthorize, UntagAuthorize
+from odp.api.lib.auth import Authorize, Authorized, TagAuthorize, TagIdAuthorize, UntagAuthorize
 from odp.api.lib.paging import Paginator
-from odp.api.lib.tagging import Tagger, output_tag_instance_model
+from odp.api.lib.tagging import Tagger, output_tag_instance_model, tag_instance_load_options
 from odp.api.models import (
     AuditModel,
     CollectionAuditModel,
@@ -21,29 +21,37 @@ from odp.api.models import (
     TagInstanceModel,
     TagInstanceModelIn,
 )
+from odp.api.routers.record import RECORD_BATCH_LIMIT
 from odp.const import DOI_PREFIX, ODPScope
 from odp.const.db import AuditCommand, TagType
 from odp.db import Session
-from odp.db.models import Collection, CollectionAudit, CollectionTag, CollectionTagAudit, Record, User
+from odp.db.models import Collection, CollectionAudit, CollectionTag, CollectionTagAudit, Record, RoleCollection, User
 
 router = APIRouter()
 
+COLLECTION_LOAD_OPTIONS = (
+    selectinload(Collection.provider),
+    selectinload(Collection.tags).options(*tag_instance_load_options(CollectionTag)),
+    selectinload(Collection.collection_roles).joinedload(RoleCollection.role),
+)
+"""Loader options for the relationships accessed by `output_collection_model`."""
+
 
-def output_collection_model(result) -> CollectionModel:
+def output_collection_model(collection: Collection) -> CollectionModel:
     return CollectionModel(
-        id=result.Collection.id,
-        key=result.Collection.key,
-        name=result.Collection.name,
-        doi_key=result.Collection.doi_key,
-        provider_id=result.Collection.provider_id,
-        provider_key=result.Collection.provider.key,
-        record_count=result.count,
+        id=collection.id,
+        key=collection.key,
+        name=collection.name,
+        doi_key=collection.doi_key,
+        provider_id=collection.provider_id,
+        provider_key=collection.provider.key,
+        record_count=collection.record_count,
         tags=[
             output_tag_instance_model(collection_tag)
-            for collection_tag in result.Collection.tags
+            for collection_tag in collection.tags
         ],
-        role_ids=[role.id for role in result.Collection.roles],
-        timestamp=result.Collection.timestamp.isoformat(),
+        role_ids=[role.id for role in collection.roles],
+        timestamp=collection.timestamp.isoformat(),
     )
 
 
@@ -75,16 +83,15 @@ async def list_collections(
         paginator: Paginator = Depends(partial(Paginator, sort='key')),
 ):
     stmt = (
-        select(Collection, func.count(Record.id)).
-        outerjoin(Record).
-        group_by(Collection)
+        select(Collection).
+        options(*COLLECTION_LOAD_OPTIONS)
     )
     if auth.object_ids != '*':
         stmt = stmt.where(Collection.id.in_(auth.object_ids))
 
     return paginator.paginate(
         stmt,
-        lambda row: output_collection_model(row),
+        lambda row: output_collection_model(row.Collection),
         sort_model=Collection,
     )
 
@@ -99,17 +106,10 @@ async def get_collection(
 ):
     auth.enforce_constraint([collection_id])
 
-    stmt = (
-        select(Collection, func.count(Record.id)).
-        outerjoin(Record).
-        where(Collection.id == collection_id).
-        group_by(Collection)
-    )
-
-    if not (result := Session.execute(stmt).one_or_none()):
+    if not (collection := Session.get(Collection, collection_id, options=COLLECTION_LOAD_OPTIONS)):
         raise HTTPException(HTTP_404_NOT_FOUND)
 
-    return output_collection_model(result)
+    return output_collection_model(collection)
 
 
 @router.post(
@@ -138,12 +138,7 @@ async def create_collection(
     collection.save()
     create_audit_record(auth, collection, timestamp, AuditCommand.insert)
 
-    result = Session.execute(
-        select(Collection, literal_column('0').label('count')).
-        where(Collection.id == collection.id)
-    ).first()
-
-    return output_collection_model(result)
+    return output_collection_model(collection)
 
 
 @router.put(
@@ -266,6 +261,73 @@ async def _untag_collection(
     await Tagger(TagType.collection).delete_tag_instance(tag_instance_id, collection, auth)
 
 
+@router.post(
+    '/tag/batch',
+)
+async def tag_collection_batch(
+        tag_instance_in: TagInstanceModelIn,
+        collection_ids: list[str] = Body(min_items=1, max_items=RECORD_BATCH_LIMIT),
+        auth: Authorized = Depends(TagAuthorize()),
+) -> list[TagInstanceModel]:
+    """Set a tag instance on each of a list of collections, returning
+    the created or updated instances. Collections on which no change
+    was made are omitted from the result.
+
+    Requires the scope associated with the tag.
+    """
+    collections = _get_collection_batch(collection_ids, auth)
+
+    collection_tags = await Tagger(TagType.collection).set_tag_instances(tag_instance_in, collections, auth)
+
+    return [output_tag_instance_model(collection_tag) for collection_tag in collection_tags]
+
+
+@router.post(
+    '/untag/batch',
+)
+async def untag_collection_batch(
+        tag_id: str = Body(),
+        collection_ids: list[str] = Body(min_items=1, max_items=RECORD_BATCH_LIMIT),
+        auth: Authorized = Depends(TagIdAuthorize()),
+) -> None:
+    """Remove instances of a tag set by the calling user from each
+    of a list of collections.
+
+    Requires the scope associated with the tag.
+    """
+    collections = _get_collection_batch(collection_ids, auth)
+    await Tagger(TagType.collection).delete_tag_instances(tag_id, collections, auth)
+
+
+@router.post(
+    '/admin/untag/batch',
+)
+async def admin_untag_collection_batch(
+        tag_id: str = Body(),
+        collection_ids: list[str] = Body(min_items=1, max_items=RECORD_BATCH_LIMIT),
+        auth: Authorized = Depends(Authorize(ODPScope.COLLECTION_ADMIN)),
+) -> None:
+    """Remove all instances of a tag from each of a list of collections.
+
+    Requires scope `odp.collection:admin`.
+    """
+    collections = _get_collection_batch(collection_ids, auth)
+    await Tagger(TagType.collection).delete_tag_instances(tag_id, collections, auth)
+
+
+def _get_collection_batch(collection_ids: list[str], auth: Authorized) -> list[Collection]:
+    auth.enforce_constraint(collection_ids)
+
+    collections = Session.execute(
+        select(Collection).where(Collection.id.in_(collection_ids))
+    ).scalars().all()
+
+    if len(collections) != len(set(collection_ids)):
+        raise HTTPException(HTTP_404_NOT_FOUND)
+
+    return collections
+
+
 @router.get(
     '/{collection_id}/doi/new',
     response_model=str,
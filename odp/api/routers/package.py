@@ -4,29 +4,39 @@ from datetime import datetime, timezone
 from typing import BinaryIO
 
 from fastapi import APIRouter, Depends, File, HTTPException, Path, Query, UploadFile
-from jschon import JSON, JSONPatch, URI
+from jschon import JSONPatch, URI
 from jschon_translation import remove_empty_children
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, selectinload
 from starlette.responses import StreamingResponse
 from starlette.status import HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND, HTTP_405_METHOD_NOT_ALLOWED, HTTP_422_UNPROCESSABLE_ENTITY
 from werkzeug.utils import secure_filename
 
 from odp.api.lib.auth import ArchiveAuthorize, Authorize, Authorized, TagAuthorize, UntagAuthorize
 from odp.api.lib.paging import Paginator
-from odp.api.lib.schema import get_metadata_validity
-from odp.api.lib.tagging import Tagger, output_tag_instance_model
+from odp.api.lib.schema import evaluate_schema, get_metadata_validity
+from odp.api.lib.tagging import Tagger, output_tag_instance_model, tag_instance_load_options
 from odp.api.models import PackageDetailModel, PackageModel, PackageModelIn, Page, TagInstanceModel, TagInstanceModelIn
 from odp.api.routers.resource import output_resource_model
 from odp.const import ODPScope
 from odp.const.db import ArchiveResourceStatus, HashAlgorithm, PackageCommand, PackageStatus, ResourceStatus, SchemaType, TagType
 from odp.db import Session
-from odp.db.models import Archive, ArchiveResource, Package, PackageAudit, Provider, Resource, Schema
+from odp.db.models import Archive, ArchiveResource, Package, PackageAudit, PackageTag, Provider, RecordPackage, Resource, Schema
 from odp.lib.archive import ArchiveAdapter, ArchiveError, ArchiveFileResponse
 from odp.lib.schema import schema_catalog
 
 router = APIRouter()
 
+PACKAGE_LOAD_OPTIONS = (
+    joinedload(Package.provider),
+    joinedload(Package.schema),
+    selectinload(Package.resources).selectinload(Resource.archive_resources),
+    selectinload(Package.package_records).joinedload(RecordPackage.record),
+    selectinload(Package.tags).options(*tag_instance_load_options(PackageTag)),
+)
+"""Loader options for the relationships accessed by `output_package_model`."""
+
 
 def output_package_model(package: Package, *, detail=False) -> PackageModel | PackageDetailModel:
     cls = PackageDetailModel if detail else PackageModel
@@ -104,6 +114,7 @@ async def list_packages(
     stmt = (
         select(Package)
         .where(Package.status != PackageStatus.delete_pending)
+        .options(*PACKAGE_LOAD_OPTIONS)
     )
 
     if auth.object_ids != '*':
@@ -130,7 +141,7 @@ async def list_all_packages(
     """
     List all packages. Requires scope `odp.package:read_all`.
     """
-    stmt = select(Package)
+    stmt = select(Package).options(*PACKAGE_LOAD_OPTIONS)
 
     if provider_id:
         stmt = stmt.where(Package.provider_id == provider_id)
@@ -151,7 +162,7 @@ async def get_package(
     """
     Get a provider-accessible package. Requires scope `odp.package:read`.
     """
-    if not (package := Session.get(Package, package_id)):
+    if not (package := Session.get(Package, package_id, options=PACKAGE_LOAD_OPTIONS)):
         raise HTTPException(HTTP_404_NOT_FOUND)
 
     auth.enforce_constraint([package.provider_id])
@@ -169,7 +180,7 @@ async def get_any_package(
     """
     Get any package. Requires scope `odp.package:read_all`.
     """
-    if not (package := Session.get(Package, package_id)):
+    if not (package := Session.get(Package, package_id, options=PACKAGE_LOAD_OPTIONS)):
         raise HTTPException(HTTP_404_NOT_FOUND)
 
     return output_package_model(package, detail=True)
@@ -441,7 +452,7 @@ async def _submit_package(
     tag_patch = []
     for package_tag in package.tags:
         tag_schema = schema_catalog.get_schema(URI(package_tag.tag.schema.uri))
-        tag_schema_result = tag_schema.evaluate(JSON(package_tag.data))
+        tag_schema_result = await evaluate_schema(tag_schema, package_tag.data)
         tag_patch += tag_schema_result.output('translation-patch', scheme=package.schema_id)
 
     _schema = Session.get(Schema, (package.schema_id, package.schema_type))
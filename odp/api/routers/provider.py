@@ -2,8 +2,9 @@ from datetime import datetime, timezone
 from functools import partial
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func, literal_column, select
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, selectinload
 from starlette.status import HTTP_404_NOT_FOUND, HTTP_409_CONFLICT, HTTP_422_UNPROCESSABLE_ENTITY
 
 from odp.api.lib.auth import Authorize, Authorized
@@ -12,40 +13,52 @@ from odp.api.models import Page, ProviderAuditModel, ProviderDetailModel, Provid
 from odp.const import ODPScope
 from odp.const.db import AuditCommand
 from odp.db import Session
-from odp.db.models import Package, Provider, ProviderAudit, Resource, User
+from odp.db.models import Provider, ProviderAudit, ProviderUser, Resource, User
 
 router = APIRouter()
 
+PROVIDER_LOAD_OPTIONS = (
+    selectinload(Provider.collections),
+)
+"""Loader options for the relationships accessed by `output_provider_model`."""
+
+PROVIDER_DETAIL_LOAD_OPTIONS = PROVIDER_LOAD_OPTIONS + (
+    selectinload(Provider.provider_users).joinedload(ProviderUser.user),
+    selectinload(Provider.clients),
+)
+"""Loader options for the relationships accessed by `output_provider_model`
+with `detail=True`."""
+
 
 def output_provider_model(
-        result,
+        provider: Provider,
         *,
         detail=False,
 ) -> ProviderModel | ProviderDetailModel:
     cls = ProviderDetailModel if detail else ProviderModel
 
     kwargs = dict(
-        id=result.Provider.id,
-        key=result.Provider.key,
-        name=result.Provider.name,
-        package_count=result.package_count,
+        id=provider.id,
+        key=provider.key,
+        name=provider.name,
+        package_count=provider.package_count,
         collection_keys={
             collection.id: collection.key
-            for collection in result.Provider.collections
+            for collection in provider.collections
         },
-        timestamp=result.Provider.timestamp.isoformat(),
+        timestamp=provider.timestamp.isoformat(),
     )
 
     if detail:
         kwargs |= dict(
             user_names=(user_names := {
                 user.id: user.name
-                for user in result.Provider.users
+                for user in provider.users
             }),
             user_ids=list(user_names),
             client_ids=[
                 client.id
-                for client in result.Provider.clients
+                for client in provider.clients
             ],
         )
 
@@ -118,12 +131,8 @@ async def _list_providers(
         paginator: Paginator,
 ):
     stmt = (
-        select(
-            Provider,
-            func.count(Package.id).label('package_count'),
-        ).
-        outerjoin(Package).
-        group_by(Provider)
+        select(Provider).
+        options(*PROVIDER_LOAD_OPTIONS)
     )
 
     if auth.object_ids != '*':
@@ -131,7 +140,7 @@ async def _list_providers(
 
     return paginator.paginate(
         stmt,
-        lambda row: output_provider_model(row),
+        lambda row: output_provider_model(row.Provider),
         sort_model=Provider,
     )
 
@@ -168,20 +177,10 @@ async def _get_provider(
 ):
     auth.enforce_constraint([provider_id])
 
-    stmt = (
-        select(
-            Provider,
-            func.count(Package.id).label('package_count'),
-        ).
-        outerjoin(Package).
-        where(Provider.id == provider_id).
-        group_by(Provider)
-    )
-
-    if not (result := Session.execute(stmt).one_or_none()):
+    if not (provider := Session.get(Provider, provider_id, options=PROVIDER_DETAIL_LOAD_OPTIONS)):
         raise HTTPException(HTTP_404_NOT_FOUND)
 
-    return output_provider_model(result, detail=True)
+    return output_provider_model(provider, detail=True)
 
 
 @router.post(
@@ -212,15 +211,7 @@ async def create_provider(
     provider.save()
     create_audit_record(auth, provider, timestamp, AuditCommand.insert)
 
-    result = Session.execute(
-        select(
-            Provider,
-            literal_column('0').label('package_count'),
-        ).
-        where(Provider.id == provider.id)
-    ).first()
-
-    return output_provider_model(result)
+    return output_provider_model(provider)
 
 
 @router.put(
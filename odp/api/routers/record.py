@@ -1,20 +1,21 @@
 import re
 from datetime import datetime, timezone
 from functools import partial
-from typing import Any
-from uuid import UUID
-
-from fastapi import APIRouter, Depends, HTTPException, Query
-from jschon import JSONSchema
-from pydantic import constr
-from sqlalchemy import and_, func, literal_column, null, or_, select, union_all
-from sqlalchemy.orm import aliased
+from typing import Any, Iterable, Literal
+from uuid import UUID, uuid4
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from jschon import JSONSchema, URI
+from pydantic import BaseModel, constr
+from sqlalchemy import all_, and_, func, insert, literal_column, null, or_, select, union_all, update
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.orm import aliased, joinedload, selectinload
 from starlette.status import HTTP_404_NOT_FOUND, HTTP_409_CONFLICT, HTTP_422_UNPROCESSABLE_ENTITY
 
-from odp.api.lib.auth import Authorize, Authorized, TagAuthorize, UntagAuthorize
+from odp.api.lib.auth import Authorize, Authorized, TagAuthorize, TagIdAuthorize, UntagAuthorize
 from odp.api.lib.paging import Paginator
 from odp.api.lib.schema import get_metadata_validity, get_record_schema
-from odp.api.lib.tagging import Tagger, output_tag_instance_model
+from odp.api.lib.tagging import Tagger, output_tag_instance_model, tag_instance_load_options
 from odp.api.lib.utils import output_published_record_model
 from odp.api.models import (
     AuditModel,
@@ -39,11 +40,39 @@ from odp.db.models import (
     RecordAudit,
     RecordTag,
     RecordTagAudit,
+    Schema,
     User,
 )
+from odp.lib.schema import schema_catalog
 
 router = APIRouter()
 
+RECORD_BATCH_LIMIT = 1000
+"""Maximum number of records that may be written in one batch."""
+
+RECORD_LOAD_OPTIONS = (
+    selectinload(Record.collection).options(
+        joinedload(Collection.provider),
+        selectinload(Collection.tags).options(*tag_instance_load_options(CollectionTag)),
+    ),
+    joinedload(Record.schema),
+    selectinload(Record.parent).load_only(Record.id, Record.doi),
+    selectinload(Record.children).load_only(Record.id, Record.doi),
+    selectinload(Record.tags).options(*tag_instance_load_options(RecordTag)),
+    selectinload(Record.catalog_records),
+)
+"""Loader options for the relationships accessed by `output_record_model`."""
+
+
+class RecordBatchItemIn(RecordModelIn):
+    id: UUID = None
+
+
+class RecordBatchResult(BaseModel):
+    id: str | None
+    status: Literal['created', 'updated', 'unchanged', 'failed']
+    error: str = None
+
 
 def output_record_model(record: Record) -> RecordModel:
     return RecordModel(
@@ -107,8 +136,8 @@ def output_catalog_record_model(catalog_record: CatalogRecord) -> CatalogRecordM
     )
 
 
-def get_parent_id(metadata: dict[str, Any], schema_id: ODPMetadataSchema) -> str | None:
-    """Return the id of the parent record implied by an IsPartOf related identifier.
+def get_parent_doi(metadata: dict[str, Any], schema_id: ODPMetadataSchema) -> str | None:
+    """Return the parent DOI implied by an IsPartOf related identifier.
 
     The child-parent relationship is only established when both sides have a DOI.
 
@@ -149,35 +178,67 @@ def get_parent_id(metadata: dict[str, Any], schema_id: ODPMetadataSchema) -> str
                 'DOI cannot be a parent of itself.',
             )
 
-        parent_record = Session.execute(
-            select(Record).
-            where(func.lower(Record.doi) == parent_doi.lower())
-        ).scalar_one_or_none()
-
-        if parent_record is None:
-            raise HTTPException(
-                HTTP_422_UNPROCESSABLE_ENTITY,
-                f'Record not found for parent DOI {parent_doi}',
-            )
-
     else:
         raise HTTPException(
             HTTP_422_UNPROCESSABLE_ENTITY,
             'Parent reference is not a valid DOI.',
         )
 
+    return parent_doi
+
+
+def get_parent_id(metadata: dict[str, Any], schema_id: ODPMetadataSchema) -> str | None:
+    """Return the id of the parent record implied by an IsPartOf related identifier."""
+    if not (parent_doi := get_parent_doi(metadata, schema_id)):
+        return
+
+    parent_record = Session.execute(
+        select(Record).
+        where(func.lower(Record.doi) == parent_doi.lower())
+    ).scalar_one_or_none()
+
+    if parent_record is None:
+        raise HTTPException(
+            HTTP_422_UNPROCESSABLE_ENTITY,
+            f'Record not found for parent DOI {parent_doi}',
+        )
+
     return parent_record.id
 
 
 def touch_parent(record: Record, timestamp: datetime) -> None:
-    """Recursively update the timestamp of the given record's parent and
-     its parent(s), where such exist."""
+    """Update the timestamp of the given record's parent and its
+    parent(s), where such exist."""
     if record.parent_id:
-        # load parent record explicitly; record.parent might not be up-to-date at this point
-        parent = Session.get(Record, record.parent_id)
-        parent.timestamp = timestamp
-        parent.save()
-        touch_parent(parent, timestamp)
+        touch_records([record.parent_id], timestamp)
+
+
+def touch_records(record_ids: Iterable[str], timestamp: datetime) -> list[str]:
+    """Update the timestamps of the given records and all of their
+    ancestors in a single statement, and return the ids of the updated
+    records.
+
+    The ancestor walk stops at any record already visited, so that a
+    cyclic parent-child hierarchy cannot recurse indefinitely.
+    """
+    ancestors = (
+        select(Record.id, array([Record.id]).label('path')).
+        where(Record.id.in_(list(record_ids))).
+        cte('ancestors', recursive=True)
+    )
+    ancestors = ancestors.union_all(
+        select(Record.parent_id, ancestors.c.path.op('||')(Record.parent_id)).
+        join(ancestors, Record.id == ancestors.c.id).
+        where(Record.parent_id != None).
+        where(Record.parent_id != all_(ancestors.c.path))
+    )
+    return Session.execute(
+        update(Record).
+        where(Record.id.in_(select(ancestors.c.id))).
+        values(timestamp=timestamp).
+        returning(Record.id).
+        execution_options(synchronize_session='fetch')
+    ).scalars().all()
 
 
 def create_audit_record(
@@ -215,7 +276,8 @@ async def list_records(
 ):
     stmt = (
         select(Record).
-        join(Collection)
+        join(Collection).
+        options(*RECORD_LOAD_OPTIONS)
     )
     if auth.object_ids != '*':
         stmt = stmt.where(Collection.id.in_(auth.object_ids))
@@ -227,34 +289,16 @@ async def list_records(
         stmt = stmt.where(Record.parent_id == parent_id)
 
     if identifier_q and (id_terms := identifier_q.split()):
-        id_exprs = []
-        for id_term in id_terms:
-            id_exprs += [
-                Record.id.ilike(f'%{id_term}%'),
-                Record.doi.ilike(f'%{id_term}%'),
-                Record.sid.ilike(f'%{id_term}%'),
-            ]
-        stmt = stmt.where(or_(*id_exprs))
+        stmt = stmt.where(or_(*(
+            Record.identifier_text.ilike(f'%{id_term}%')
+            for id_term in id_terms
+        )))
 
     if title_q and (title_terms := title_q.split()):
-        datacite_title_exprs = [
-            Record.metadata_['titles'][0]['title'].astext.ilike(f'%{title_term}%')
-            for title_term in title_terms
-        ]
-        iso19115_title_exprs = [
-            Record.metadata_['title'].astext.ilike(f'%{title_term}%')
+        stmt = stmt.where(and_(*(
+            Record.title_text.ilike(f'%{title_term}%')
             for title_term in title_terms
-        ]
-        stmt = stmt.where(or_(
-            and_(
-                Record.schema_id == ODPMetadataSchema.SAEON_DATACITE4,
-                *datacite_title_exprs,
-            ),
-            and_(
-                Record.schema_id == ODPMetadataSchema.SAEON_ISO19115,
-                *iso19115_title_exprs,
-            ),
-        ))
+        )))
 
     return paginator.paginate(
         stmt,
@@ -271,7 +315,7 @@ async def get_record(
         record_id: str,
         auth: Authorized = Depends(Authorize(ODPScope.RECORD_READ)),
 ):
-    if not (record := Session.get(Record, record_id)):
+    if not (record := Session.get(Record, record_id, options=RECORD_LOAD_OPTIONS)):
         raise HTTPException(HTTP_404_NOT_FOUND)
 
     auth.enforce_constraint([record.collection_id])
@@ -289,7 +333,8 @@ async def get_record_by_doi(
 ):
     if not (record := Session.execute(
             select(Record).
-            where(func.lower(Record.doi) == record_doi.lower())
+            where(func.lower(Record.doi) == record_doi.lower()).
+            options(*RECORD_LOAD_OPTIONS)
     ).scalar_one_or_none()):
         raise HTTPException(HTTP_404_NOT_FOUND)
 
@@ -482,6 +527,223 @@ async def _set_record(
     return output_record_model(record)
 
 
+@router.post(
+    '/admin/batch',
+    response_model=list[RecordBatchResult],
+)
+async def admin_set_record_batch(
+        records_in: list[RecordBatchItemIn],
+        auth: Authorized = Depends(Authorize(ODPScope.RECORD_ADMIN)),
+):
+    """Create and/or update a batch of records in a single transaction.
+
+    Items with an `id` are created with that id or, if the record exists,
+    updated; items without an `id` are created with a generated id. Items
+    are processed in order, and a child item may refer (by DOI) to a parent
+    anywhere in the batch; parent DOIs are resolved as they will be once the
+    batch has been applied. An id may appear only once in a batch. Each
+    item is validated independently; the result list reports the outcome
+    for each item, in the input order.
+    """
+    if len(records_in) > RECORD_BATCH_LIMIT:
+        raise HTTPException(HTTP_422_UNPROCESSABLE_ENTITY, f'A batch may contain at most {RECORD_BATCH_LIMIT} records')
+
+    item_ids = [str(record_in.id) for record_in in records_in if record_in.id]
+    item_dois = {record_in.doi.lower() for record_in in records_in if record_in.doi}
+    item_sids = {record_in.sid for record_in in records_in if record_in.sid}
+
+    existing_records = {
+        record.id: record for record in Session.execute(
+            select(Record).where(Record.id.in_(item_ids))
+        ).scalars()
+    }
+    doi_owners = dict(Session.execute(
+        select(func.lower(Record.doi), Record.id).
+        where(func.lower(Record.doi).in_(item_dois))
+    ).all())
+    sid_owners = dict(Session.execute(
+        select(Record.sid, Record.id).
+        where(Record.sid.in_(item_sids))
+    ).all())
+    published_dois = set(Session.execute(
+        select(PublishedRecord.doi).
+        where(PublishedRecord.doi.in_([
+            record.doi for record in existing_records.values() if record.doi
+        ]))
+    ).scalars())
+    schema_uris = dict(Session.execute(
+        select(Schema.id, Schema.uri).
+        where(Schema.id.in_({record_in.schema_id for record_in in records_in})).
+        where(Schema.type == SchemaType.metadata)
+    ).all())
+
+    parent_dois = {}
+    for i, record_in in enumerate(records_in):
+        try:
+            parent_dois[i] = get_parent_doi(record_in.metadata, record_in.schema_id)
+        except HTTPException as e:
+            parent_dois[i] = e
+    parent_records = {
+        record.doi.lower(): record for record in Session.execute(
+            select(Record).
+            where(func.lower(Record.doi).in_({
+                doi.lower() for doi in parent_dois.values() if isinstance(doi, str)
+            }))
+        ).scalars()
+    }
+
+    def check(i: int, record_in: RecordBatchItemIn) -> str | None:
+        """Return an error message if item `i` cannot be written."""
+        record_id = str(record_in.id) if record_in.id else None
+        record = existing_records.get(record_id)
+        try:
+            auth.enforce_constraint([record_in.collection_id] + ([record.collection_id] if record else []))
+        except HTTPException:
+            return 'Forbidden'
+        if record_in.schema_id not in schema_uris:
+            return 'Invalid schema id'
+        if record_in.doi and (
+                doi_owners.get(doi := record_in.doi.lower(), record_id) != record_id or doi in batch_dois
+        ):
+            return 'DOI is already in use'
+        if record_in.sid and (
+                sid_owners.get(record_in.sid, record_id) != record_id or record_in.sid in batch_sids
+        ):
+            return 'SID is already in use'
+        if record and record.doi is not None and record.doi != record_in.doi and record.doi in published_dois:
+            return 'The DOI has been published and cannot be modified.'
+        if isinstance(parent_doi := parent_dois[i], HTTPException):
+            return parent_doi.detail
+
+    errors = {}
+    accepted = {}
+    batch_ids = set()
+    batch_dois = set()
+    batch_sids = set()
+    for i, record_in in enumerate(records_in):
+        if record_in.id:
+            if (record_id := str(record_in.id)) in batch_ids:
+                errors[i] = 'Duplicate record id in batch'
+                continue
+            batch_ids |= {record_id}
+
+        if error := check(i, record_in):
+            errors[i] = error
+            continue
+
+        if record_in.doi:
+            batch_dois |= {record_in.doi.lower()}
+        if record_in.sid:
+            batch_sids |= {record_in.sid}
+
+        if (record := existing_records.get(str(record_in.id))) is None:
+            record = Record(id=str(record_in.id) if record_in.id else str(uuid4()))
+        accepted[i] = record
+
+    # Parents are resolved against the DOIs that records will have once the
+    # batch has been applied: an accepted item's own DOI supersedes whatever
+    # DOI its record currently has in the DB. Failing an item may orphan a
+    # child that referred to it, so repeat until no further items fail.
+    while True:
+        batch_parents = {
+            records_in[i].doi.lower(): record
+            for i, record in accepted.items() if records_in[i].doi
+        }
+        parents = {}
+        for i in accepted:
+            if not (parent_doi := parent_dois[i]):
+                parents[i] = None
+            elif (parent := batch_parents.get(parent_doi.lower())) is not None:
+                parents[i] = parent
+            elif (
+                    (parent := parent_records.get(parent_doi.lower())) is not None and
+                    parent.id not in {record.id for record in accepted.values()}
+            ):
+                parents[i] = parent
+            else:
+                errors[i] = f'Record not found for parent DOI {parent_doi}'
+
+        if not (orphans := errors.keys() & accepted.keys()):
+            break
+        for i in orphans:
+            del accepted[i]
+
+    results = []
+    changes = []
+    for i, record_in in enumerate(records_in):
+        if i in errors:
+            results += [RecordBatchResult(id=str(record_in.id) if record_in.id else None, status='failed', error=errors[i])]
+            continue
+
+        record = accepted[i]
+        create = record.id not in existing_records
+        parent = parents[i]
+        if (
+            create or
+            record.doi != record_in.doi or
+            record.sid != record_in.sid or
+            record.collection_id != record_in.collection_id or
+            record.schema_id != record_in.schema_id or
+            record.metadata_ != record_in.metadata or
+            record.parent_id != (parent.id if parent else None)
+        ):
+            changes += [(create, record, record_in, parent)]
+            results += [RecordBatchResult(id=record.id, status='created' if create else 'updated')]
+        else:
+            results += [RecordBatchResult(id=record.id, status='unchanged')]
+
+    # evaluations share the request's session, for keyword lookups, so they
+    # must run one at a time; large documents are still evaluated off the loop
+    validities = [
+        await get_metadata_validity(
+            record_in.metadata,
+            schema_catalog.get_schema(URI(schema_uris[record_in.schema_id])),
+        )
+        for _, _, record_in, _ in changes
+    ]
+
+    timestamp = datetime.now(timezone.utc)
+    touch_ids = set()
+    for (create, record, record_in, parent), validity in zip(changes, validities):
+        if record.parent_id:
+            touch_ids |= {record.parent_id}  # timestamp old parent for child removal
+        record.doi = record_in.doi
+        record.sid = record_in.sid
+        record.collection_id = record_in.collection_id
+        record.schema_id = record_in.schema_id
+        record.schema_type = SchemaType.metadata
+        record.metadata_ = record_in.metadata
+        record.validity = validity
+        record.timestamp = timestamp
+        record.parent = parent
+        if create:
+            Session.add(record)
+
+    Session.flush()
+
+    if changes:
+        Session.execute(insert(RecordAudit), [
+            dict(
+                client_id=auth.client_id,
+                user_id=auth.user_id,
+                command=AuditCommand.insert if create else AuditCommand.update,
+                timestamp=timestamp,
+                _id=record.id,
+                _doi=record.doi,
+                _sid=record.sid,
+                _metadata=record.metadata_,
+                _collection_id=record.collection_id,
+                _schema_id=record.schema_id,
+                _parent_id=record.parent_id,
+            ) for create, record, _, _ in changes
+        ])
+
+        touch_ids |= {record.parent_id for _, record, _, _ in changes if record.parent_id}
+        touch_records(touch_ids, timestamp)
+
+    return results
+
+
 @router.delete(
     '/{record_id}',
 )
@@ -604,6 +866,88 @@ async def _untag_record(
     touch_parent(record, datetime.now(timezone.utc))
 
 
+@router.post(
+    '/tag/batch',
+)
+async def tag_record_batch(
+        tag_instance_in: TagInstanceModelIn,
+        record_ids: list[str] = Body(min_items=1, max_items=RECORD_BATCH_LIMIT),
+        auth: Authorized = Depends(TagAuthorize()),
+) -> list[TagInstanceModel]:
+    """Set a tag instance on each of a list of records, returning the
+    created or updated instances. Records on which no change was made
+    are omitted from the result.
+
+    Requires the scope associated with the tag.
+    """
+    records = _get_record_batch(record_ids, auth)
+
+    record_tags = await Tagger(TagType.record).set_tag_instances(tag_instance_in, records, auth)
+    if record_tags:
+        touch_records({record.parent_id for record in records if record.parent_id}, record_tags[0].timestamp)
+
+    return [output_tag_instance_model(record_tag) for record_tag in record_tags]
+
+
+@router.post(
+    '/untag/batch',
+)
+async def untag_record_batch(
+        tag_id: str = Body(),
+        record_ids: list[str] = Body(min_items=1, max_items=RECORD_BATCH_LIMIT),
+        auth: Authorized = Depends(TagIdAuthorize()),
+) -> None:
+    """Remove instances of a tag set by the calling user from each
+    of a list of records.
+
+    Requires the scope associated with the tag.
+    """
+    await _untag_record_batch(tag_id, record_ids, auth)
+
+
+@router.post(
+    '/admin/untag/batch',
+)
+async def admin_untag_record_batch(
+        tag_id: str = Body(),
+        record_ids: list[str] = Body(min_items=1, max_items=RECORD_BATCH_LIMIT),
+        auth: Authorized = Depends(Authorize(ODPScope.RECORD_ADMIN)),
+) -> None:
+    """Remove all instances of a tag from each of a list of records.
+
+    Requires scope `odp.record:admin`.
+    """
+    await _untag_record_batch(tag_id, record_ids, auth)
+
+
+async def _untag_record_batch(
+        tag_id: str,
+        record_ids: list[str],
+        auth: Authorized,
+) -> None:
+    records = _get_record_batch(record_ids, auth)
+
+    if record_tags := await Tagger(TagType.record).delete_tag_instances(tag_id, records, auth):
+        untagged_ids = {record_tag.record_id for record_tag in record_tags}
+        touch_records({
+            record.parent_id for record in records
+            if record.id in untagged_ids and record.parent_id
+        }, datetime.now(timezone.utc))
+
+
+def _get_record_batch(record_ids: list[str], auth: Authorized) -> list[Record]:
+    records = Session.execute(
+        select(Record).where(Record.id.in_(record_ids))
+    ).scalars().all()
+
+    if len(records) != len(set(record_ids)):
+        raise HTTPException(HTTP_404_NOT_FOUND)
+
+    auth.enforce_constraint(list({record.collection_id for record in records}))
+
+    return records
+
+
 @router.get(
     '/{record_id}/catalog',
     response_model=Page[CatalogRecordModel],
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select
+from sqlalchemy.orm import joinedload, selectinload
 from starlette.status import HTTP_404_NOT_FOUND
 
 from odp.api.lib.auth import Authorize, Authorized
@@ -11,6 +12,12 @@ from odp.db.models import ArchiveResource, Package, Resource
 
 router = APIRouter()
 
+RESOURCE_LOAD_OPTIONS = (
+    joinedload(Resource.package),
+    selectinload(Resource.archive_resources),
+)
+"""Loader options for the relationships accessed by `output_resource_model`."""
+
 
 def output_resource_model(resource: Resource) -> ResourceModel:
     return ResourceModel(
@@ -73,7 +80,7 @@ async def _list_resources(
         archive_id: str,
         exclude_archive_id: str,
 ):
-    stmt = select(Resource)
+    stmt = select(Resource).options(*RESOURCE_LOAD_OPTIONS)
     join_package = False
 
     if auth.object_ids != '*':
@@ -118,7 +125,7 @@ async def get_resource(
         resource_id: str,
         auth: Authorized = Depends(Authorize(ODPScope.RESOURCE_READ)),
 ):
-    if not (resource := Session.get(Resource, resource_id)):
+    if not (resource := Session.get(Resource, resource_id, options=RESOURCE_LOAD_OPTIONS)):
         raise HTTPException(HTTP_404_NOT_FOUND)
 
     auth.enforce_constraint([resource.package.provider_id])
@@ -135,7 +142,7 @@ async def get_resource(
 async def get_any_resource(
         resource_id: str,
 ):
-    if not (resource := Session.get(Resource, resource_id)):
+    if not (resource := Session.get(Resource, resource_id, options=RESOURCE_LOAD_OPTIONS)):
         raise HTTPException(HTTP_404_NOT_FOUND)
 
     return output_resource_model(resource)
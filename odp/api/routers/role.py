@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
+from sqlalchemy.orm import joinedload, selectinload
 from starlette.status import HTTP_404_NOT_FOUND, HTTP_409_CONFLICT, HTTP_422_UNPROCESSABLE_ENTITY
 
 from odp.api.lib.auth import Authorize, select_scopes
@@ -8,10 +9,16 @@ from odp.api.models import Page, RoleModel, RoleModelIn
 from odp.const import ODPScope
 from odp.const.db import ScopeType
 from odp.db import Session
-from odp.db.models import Collection, Role
+from odp.db.models import Collection, Role, RoleCollection, RoleScope
 
 router = APIRouter()
 
+ROLE_LOAD_OPTIONS = (
+    selectinload(Role.role_scopes).joinedload(RoleScope.scope),
+    selectinload(Role.role_collections).joinedload(RoleCollection.collection),
+)
+"""Loader options for the relationships accessed by `output_role_model`."""
+
 
 def output_role_model(role: Role) -> RoleModel:
     return RoleModel(
@@ -32,7 +39,7 @@ async def list_roles(
         paginator: Paginator = Depends(),
 ):
     return paginator.paginate(
-        select(Role),
+        select(Role).options(*ROLE_LOAD_OPTIONS),
         lambda row: output_role_model(row.Role),
     )
 
@@ -45,7 +52,7 @@ async def list_roles(
 async def get_role(
         role_id: str,
 ):
-    if not (role := Session.get(Role, role_id)):
+    if not (role := Session.get(Role, role_id, options=ROLE_LOAD_OPTIONS)):
         raise HTTPException(HTTP_404_NOT_FOUND)
 
     return output_role_model(role)
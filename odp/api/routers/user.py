@@ -3,6 +3,7 @@ from functools import partial
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import or_, select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, selectinload
 from starlette.status import HTTP_404_NOT_FOUND, HTTP_422_UNPROCESSABLE_ENTITY
 
 from odp.api.lib.auth import Authorize, Authorized
@@ -15,6 +16,12 @@ from odp.db.models import IdentityAudit, ProviderUser, Role, User, UserRole
 
 router = APIRouter()
 
+USER_LOAD_OPTIONS = (
+    selectinload(User.user_roles).joinedload(UserRole.role),
+    selectinload(User.user_providers).joinedload(ProviderUser.provider),
+)
+"""Loader options for the relationships accessed by `output_user_model`."""
+
 
 def output_user_model(user: User) -> UserModel:
     return UserModel(
@@ -80,7 +87,7 @@ async def list_users(
         role_id: str = Query(None, title='Filter by role id'),
         text_query: str = Query(None, title='Search by email or name'),
 ):
-    stmt = select(User)
+    stmt = select(User).options(*USER_LOAD_OPTIONS)
 
     if provider_id:
         stmt = stmt.join(ProviderUser).where(ProviderUser.provider_id == provider_id)
@@ -111,7 +118,7 @@ async def list_users(
 async def get_user(
         user_id: str,
 ):
-    if not (user := Session.get(User, user_id)):
+    if not (user := Session.get(User, user_id, options=USER_LOAD_OPTIONS)):
         raise HTTPException(HTTP_404_NOT_FOUND)
 
     return output_user_model(user)
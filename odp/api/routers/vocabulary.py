@@ -22,7 +22,7 @@ def output_vocabulary_model(vocabulary: Vocabulary) -> VocabularyModel:
         schema_uri=vocabulary.schema.uri,
         schema_=schema_catalog.get_schema(URI(vocabulary.schema.uri)).value,
         static=vocabulary.static,
-        keyword_count=len(vocabulary.keywords),
+        keyword_count=vocabulary.keyword_count,
     )
 
 
@@ -1,5 +1,10 @@
+import gzip
 import logging
-from datetime import date, datetime, timezone
+import os
+import selectors
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta, timezone
+from time import monotonic, sleep
 from typing import Any, Optional, final
 
 from sqlalchemy import func, or_, select
@@ -8,11 +13,37 @@ from odp.api.lib.utils import output_published_record_model
 from odp.api.models import PublishedRecordModel, RecordModel
 from odp.api.routers.record import output_record_model
 from odp.const import ODPCatalog, ODPCollectionTag, ODPMetadataSchema, ODPRecordTag
-from odp.db import Session
-from odp.db.models import Catalog as CatalogORM, CatalogRecord, CatalogRecordFacet, Collection, Provider, PublishedRecord, Record, RecordTag
+from odp.db import Session, engine
+from odp.db.models import Catalog as CatalogORM, CatalogRecord, CatalogRecordFacet, Collection, Provider, PublishedRecord, Record
+from odp.lib import sqlstats
+from odp.lib.schema import warm_up_schemas
+from odp.svc.counter.compact import compact_counters
 
 logger = logging.getLogger(__name__)
 
+PUBLISH_CHANNEL = 'odp_publish'
+"""Postgres NOTIFY channel on which record, collection and provider
+changes are announced, with payloads of the form '<table>:<id>'."""
+
+PUBLISH_LOCK_ID = 2_118_560_002
+"""Postgres advisory lock key held for the duration of a publishing run."""
+
+PUBLISH_DEBOUNCE = float(os.getenv('ODP_PUBLISH_DEBOUNCE', 3))
+"""Seconds without further change notifications after which the
+publishing daemon publishes the records affected by pending changes."""
+
+PUBLISH_MAX_DELAY = float(os.getenv('ODP_PUBLISH_MAX_DELAY', 30))
+"""Maximum number of seconds that the publishing daemon defers a change
+while waiting for notifications to quieten down."""
+
+PUBLISH_RECONCILE_INTERVAL = float(os.getenv('ODP_PUBLISH_RECONCILE_INTERVAL', 3600))
+"""Seconds between full publishing runs by the publishing daemon, which
+catch up on any missed notifications and embargo transitions."""
+
+PUBLISH_RETRY_INTERVAL = 30
+"""Seconds to wait before the publishing daemon reconnects following
+a database connection failure."""
+
 
 class Catalog:
     indexed = False
@@ -40,27 +71,38 @@ class Catalog:
         """Mapping of record UUIDs to tuples of (record_model, timestamp)."""
 
     @final
-    def publish(self) -> None:
-        """Fully update the public state of a catalog."""
-        records = self._select_records()
-        logger.info(f'{self.catalog_id} catalog: {(total := len(records))} records selected for evaluation')
+    def publish(self, record_ids: Optional[set[str]] = None) -> None:
+        """Fully update the public state of a catalog or, if `record_ids`
+        is given, the public state of just those records."""
+        with sqlstats.collect() as stats:
+            records = self._select_records(record_ids)
+        logger.info(f'{self.catalog_id} catalog: {(total := len(records))} records selected for evaluation ({stats})')
 
         if total:
-            self._create_snapshot(records)
-            published = self._sync_catalog()
-            logger.info(f'{self.catalog_id} catalog: {published} records published; {total - published} records hidden')
+            with sqlstats.collect() as stats:
+                self._create_snapshot(records)
+            logger.info(f'{self.catalog_id} catalog: Snapshot created ({stats})')
+
+            with sqlstats.collect() as stats:
+                published = self._sync_catalog()
+            logger.info(f'{self.catalog_id} catalog: {published} records published; {total - published} records hidden ({stats})')
 
         if self.external:
-            self._sync_external()
+            with sqlstats.collect() as stats:
+                self._sync_external()
+            logger.info(f'{self.catalog_id} catalog: External sync completed ({stats})')
 
-    def _select_records(self) -> list[tuple[str, datetime]]:
+    def _select_records(self, record_ids: Optional[set[str]] = None) -> list[tuple[str, datetime]]:
         """Select records to be evaluated for publication to, or
         retraction from, a catalog.
 
+        If `record_ids` is given, selection is limited to those records.
+
         A record is selected if:
 
         * there is no corresponding catalog_record entry; or
-        * the record has any embargo tags; or
+        * catalog_record.next_reevaluation has passed, i.e. an embargo
+          on the record has started or ended since it was last evaluated; or
         * catalog_record.timestamp is less than any of:
 
           * collection.timestamp
@@ -80,14 +122,17 @@ class Catalog:
                 ).label('max_timestamp')
             ).
             join(Collection).
-            join(Provider).
-            subquery()
+            join(Provider)
         )
+        if record_ids is not None:
+            records_subq = records_subq.where(Record.id.in_(record_ids))
+        records_subq = records_subq.subquery()
 
         catalog_records_subq = (
             select(
                 CatalogRecord.record_id,
-                CatalogRecord.timestamp
+                CatalogRecord.timestamp,
+                CatalogRecord.next_reevaluation,
             ).
             where(CatalogRecord.catalog_id == self.catalog_id).
             subquery()
@@ -102,10 +147,7 @@ class Catalog:
             where(or_(
                 catalog_records_subq.c.record_id == None,
                 catalog_records_subq.c.timestamp < records_subq.c.max_timestamp,
-                catalog_records_subq.c.record_id.in_(
-                    select(RecordTag.record_id).
-                    where(RecordTag.tag_id == ODPRecordTag.EMBARGO)
-                )
+                catalog_records_subq.c.next_reevaluation <= func.now(),
             ))
         )
 
@@ -161,28 +203,32 @@ class Catalog:
 
         if not cannot_publish_reasons:
             self._save_published_record(record_model)
-            self._process_embargoes(record_model)
+            catalog_record.next_reevaluation = self._process_embargoes(record_model)
             catalog_record.published = True
             catalog_record.published_record = self.create_published_record(record_model).dict()
             catalog_record.reason = ' | '.join(can_publish_reasons)
         else:
             catalog_record.published = False
+            catalog_record.next_reevaluation = None
             catalog_record.published_record = None
             catalog_record.reason = ' | '.join(cannot_publish_reasons)
 
         catalog_record.timestamp = timestamp
-        catalog_record.save()
 
         if self.indexed:
-            self._index_catalog_record(catalog_record)
+            # search data is derived in part from the catalog record's
+            # relationships, which load only once it has been saved
             catalog_record.save()
+            self._index_catalog_record(catalog_record)
+
+        catalog_record.published_record_gzip = self._compress_catalog_record(catalog_record)
 
         if self.external:
             catalog_record.synced = False
             catalog_record.error = None
             catalog_record.error_count = 0
-            catalog_record.save()
 
+        catalog_record.save()
         Session.commit()
 
         return catalog_record.published
@@ -271,12 +317,17 @@ class Catalog:
         published_record.save()
 
     @staticmethod
-    def _process_embargoes(record_model: RecordModel) -> None:
+    def _process_embargoes(record_model: RecordModel) -> Optional[datetime]:
         """Check if a record is currently subject to an embargo and, if so, update
         the given `record_model`, stripping out download links / embedded datasets
-        from the metadata."""
+        from the metadata.
+
+        Return the time at which the next embargo on the record starts or ends,
+        or None if there is no future embargo transition.
+        """
         current_date = date.today()
         embargoed = False
+        transition_dates = []
 
         for tag in record_model.tags:
             if tag.tag_id == ODPRecordTag.EMBARGO:
@@ -284,10 +335,17 @@ class Catalog:
                 end_date = date.fromisoformat(tag.data['end'] or '3000-01-01')
                 if start_date <= current_date <= end_date:
                     embargoed = True
-                    break
+                # an embargo is in effect from its start date to its end date, inclusive
+                transition_dates += [start_date, end_date + timedelta(days=1)]
+
+        if future_dates := [d for d in transition_dates if d > current_date]:
+            # midnight local time, consistent with date.today()
+            next_reevaluation = datetime.combine(min(future_dates), time()).astimezone(timezone.utc)
+        else:
+            next_reevaluation = None
 
         if not embargoed:
-            return
+            return next_reevaluation
 
         if record_model.schema_id == ODPMetadataSchema.SAEON_DATACITE4:
             try:
@@ -309,6 +367,8 @@ class Catalog:
                 except KeyError:
                     pass
 
+        return next_reevaluation
+
     def _sync_external(self) -> None:
         """Synchronize with an external catalog."""
         unsynced_catalog_records = Session.execute(
@@ -391,6 +451,18 @@ class Catalog:
             catalog_record.temporal_end = None
             catalog_record.searchable = None
 
+    @staticmethod
+    def _compress_catalog_record(catalog_record: CatalogRecord) -> Optional[bytes]:
+        """Return a gzip-compressed copy of a catalog record's JSON, serialized
+        from the published record and index fields in hand.
+
+        The API's single-record endpoint serves exactly these bytes, either
+        as is or decompressed, so that the two encodings of a record are
+        identical, and it need not be serialized or compressed per request.
+        """
+        if catalog_record.published:
+            return gzip.compress(output_published_record_model(catalog_record).json().encode())
+
     def create_text_index_data(
             self, published_record: PublishedRecordModel
     ) -> str:
@@ -426,7 +498,9 @@ class Catalog:
         return None
 
 
-def publish_all():
+def publish_all(record_ids: Optional[set[str]] = None):
+    """Publish to all catalogs, either fully or, if `record_ids`
+    is given, just the specified records."""
     from odp.catalog.datacite import DataCiteCatalog
     from odp.catalog.mims import MIMSCatalog
     from odp.catalog.saeon import SAEONCatalog
@@ -437,13 +511,161 @@ def publish_all():
         ODPCatalog.DATACITE: DataCiteCatalog,
     }
 
-    logger.info('PUBLISHING STARTED')
+    logger.info('PUBLISHING STARTED' if record_ids is None else f'PUBLISHING STARTED for {len(record_ids)} records')
     try:
-        for catalog_id, catalog_cls in catalog_classes.items():
-            catalog_cls(catalog_id).publish()
+        with _publish_lock():
+            warm_up_schemas()
+
+            for catalog_id, catalog_cls in catalog_classes.items():
+                catalog_cls(catalog_id).publish(record_ids)
+
+        compact_counters()
 
         logger.info('PUBLISHING FINISHED')
 
     except Exception as e:
         logger.critical(f'PUBLISHING ABORTED: {str(e)}')
         raise
+
+
+@contextmanager
+def _publish_lock():
+    """Hold the publishing lock for the duration of the context, waiting
+    for any publishing run in another process (cron, scheduler or daemon)
+    to complete."""
+    with engine.connect() as lock_conn:
+        lock_conn.execute(select(func.pg_advisory_lock(PUBLISH_LOCK_ID)))
+        lock_conn.commit()
+        try:
+            yield
+        finally:
+            if not lock_conn.invalidated:
+                lock_conn.execute(select(func.pg_advisory_unlock(PUBLISH_LOCK_ID)))
+                lock_conn.commit()
+
+
+def publish_continuously():
+    """Run as a publishing daemon, publishing records shortly after
+    they (or their collections or providers) change.
+
+    Change notifications are received on `PUBLISH_CHANNEL` and accumulated
+    until none have arrived for `PUBLISH_DEBOUNCE` seconds, or until the
+    oldest has waited for `PUBLISH_MAX_DELAY` seconds; the affected records
+    are then published. A full publishing run is performed on startup, and
+    thereafter every `PUBLISH_RECONCILE_INTERVAL` seconds, to catch up on
+    notifications missed while disconnected and on embargo transitions.
+    """
+    while True:
+        try:
+            _listen()
+        except Exception as e:
+            logger.error(f'Publisher connection failed: {e!r}')
+
+        sleep(PUBLISH_RETRY_INTERVAL)
+
+
+def _listen():
+    """Listen for change notifications and publish affected records,
+    for as long as the listening connection lives."""
+    with engine.connect() as listen_conn:
+        listen_conn = listen_conn.execution_options(isolation_level='AUTOCOMMIT')
+        listen_conn.exec_driver_sql(f'listen {PUBLISH_CHANNEL}')
+        logger.info(f'Publisher listening on channel {PUBLISH_CHANNEL}')
+
+        try:
+            _wait_and_publish(listen_conn)
+        finally:
+            # don't return a listening connection to the pool
+            if not listen_conn.invalidated:
+                listen_conn.exec_driver_sql('unlisten *')
+
+
+def _wait_and_publish(listen_conn):
+    """Accumulate change notifications received on `listen_conn`, and
+    publish affected records once notifications quieten down."""
+    dbapi_conn = listen_conn.connection.dbapi_connection
+
+    # payloads of pending notifications
+    pending: set[str] = set()
+    first_pending = last_pending = 0.0
+    next_reconcile = monotonic()
+
+    with selectors.DefaultSelector() as selector:
+        selector.register(dbapi_conn, selectors.EVENT_READ)
+
+        while True:
+            now = monotonic()
+            if now >= next_reconcile:
+                # fail fast (and reconnect) if the listening connection has been lost
+                listen_conn.exec_driver_sql('select 1')
+                # notifications received to this point are covered by a full run
+                pending.clear()
+                _publish()
+                next_reconcile = monotonic() + PUBLISH_RECONCILE_INTERVAL
+
+            elif pending and (now - last_pending >= PUBLISH_DEBOUNCE or
+                              now - first_pending >= PUBLISH_MAX_DELAY):
+                changes, pending = pending, set()
+                _publish(changes)
+
+            timeout = next_reconcile
+            if pending:
+                timeout = min(timeout, last_pending + PUBLISH_DEBOUNCE, first_pending + PUBLISH_MAX_DELAY)
+
+            if selector.select(max(0.0, timeout - monotonic())):
+                dbapi_conn.poll()
+                if dbapi_conn.notifies:
+                    if not pending:
+                        first_pending = monotonic()
+                    last_pending = monotonic()
+                    pending |= {notify.payload for notify in dbapi_conn.notifies}
+                    dbapi_conn.notifies.clear()
+
+
+def _publish(changes: Optional[set[str]] = None) -> None:
+    """Publish the records affected by `changes` - notification payloads
+    of the form '<table>:<id>' - or publish fully if `changes` is None.
+
+    Failures are logged; any unpublished changes are picked up by the
+    next full publishing run.
+    """
+    try:
+        if changes is None:
+            publish_all()
+        elif record_ids := _affected_record_ids(changes):
+            publish_all(record_ids)
+        Session.commit()
+    except Exception as e:
+        Session.rollback()
+        logger.error(f'Publishing failed: {e!r}')
+    finally:
+        Session.remove()
+
+
+def _affected_record_ids(changes: set[str]) -> set[str]:
+    """Return the ids of records affected by the given record,
+    collection and provider changes.
+
+    Deletions are notified too. A deleted record's id is returned
+    as is - its catalog records are gone with it, so publishing it
+    is a no-op - while a deleted collection or provider has no
+    records left to affect. Tag changes are not notified directly,
+    but the API touches the tagged record or collection, which is.
+    """
+    ids = {'record': set(), 'collection': set(), 'provider': set()}
+    for payload in changes:
+        table, _, id_ = payload.partition(':')
+        ids[table] |= {id_}
+
+    record_ids = ids['record']
+    if ids['collection'] or ids['provider']:
+        record_ids |= set(Session.execute(
+            select(Record.id).
+            join(Collection).
+            where(or_(
+                Record.collection_id.in_(ids['collection']),
+                Collection.provider_id.in_(ids['provider']),
+            ))
+        ).scalars())
+
+    return record_ids
@@ -1,3 +1,7 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 from sqlalchemy import DDL, create_engine, event
 from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
 
@@ -10,12 +14,39 @@ engine = create_engine(
     future=True,
 )
 
+_session_scope: ContextVar[object | None] = ContextVar('session_scope', default=None)
+
+
+def _scopefunc():
+    return _session_scope.get() or threading.get_ident()
+
+
 Session = scoped_session(sessionmaker(
     bind=engine,
     autocommit=False,
     autoflush=False,
     future=True,
-))
+), scopefunc=_scopefunc)
+"""Session registry. Within a `session_scope()` - e.g. an API request - the
+session is specific to that scope, and is shared by any worker threads that
+run in a copy of its context; otherwise, the session is thread-local."""
+
+
+@contextmanager
+def session_scope():
+    """Provide a session of its own to the enclosed code, including any
+    tasks it creates, and dispose of it on exit.
+
+    Concurrent async tasks on one thread - e.g. overlapping API requests -
+    must each run in their own session scope, otherwise one may commit,
+    roll back or remove the other's session while it awaits.
+    """
+    token = _session_scope.set(object())
+    try:
+        yield
+    finally:
+        Session.remove()
+        _session_scope.reset(token)
 
 
 class _Base:
@@ -42,3 +73,62 @@ event.listen(
     'after_create',
     DDL("create collation naturalsort (provider = icu, locale = 'en@colNumeric=yes')")
 )
+
+event.listen(
+    Base.metadata,
+    'before_create',
+    DDL("create extension if not exists pg_trgm")
+)
+
+# Maintains a count of child rows in a counter column on the parent table.
+# Changes are appended to counter_delta rather than applied to the parent row,
+# which would serialize concurrent writers; see odp.svc.counter.compact.
+# Trigger arguments: parent table, counter column, foreign key column and,
+# optionally, a boolean column which must be true for the row to be counted.
+event.listen(
+    Base.metadata,
+    'before_create',
+    DDL("""
+        create or replace function maintain_count() returns trigger as $$
+        declare
+            old_key text;
+            new_key text;
+        begin
+            if tg_op in ('UPDATE', 'DELETE') and (tg_nargs < 4 or (to_jsonb(old) ->> tg_argv[3])::boolean) then
+                old_key := to_jsonb(old) ->> tg_argv[2];
+            end if;
+            if tg_op in ('INSERT', 'UPDATE') and (tg_nargs < 4 or (to_jsonb(new) ->> tg_argv[3])::boolean) then
+                new_key := to_jsonb(new) ->> tg_argv[2];
+            end if;
+            if old_key is not distinct from new_key then
+                return null;
+            end if;
+            if old_key is not null then
+                insert into counter_delta (parent_table, counter, parent_id, delta)
+                    values (tg_argv[0], tg_argv[1], old_key, -1);
+            end if;
+            if new_key is not null then
+                insert into counter_delta (parent_table, counter, parent_id, delta)
+                    values (tg_argv[0], tg_argv[1], new_key, 1);
+            end if;
+            return null;
+        end
+        $$ language plpgsql
+    """)
+)
+
+# Notifies the catalog publisher of a change to - or deletion of - a record,
+# collection or provider, with a payload of the form '<table>:<id>'.
+event.listen(
+    Base.metadata,
+    'before_create',
+    DDL("""
+        create or replace function notify_publisher() returns trigger as $$
+        begin
+            perform pg_notify('odp_publish', tg_table_name || ':' ||
+                case tg_op when 'DELETE' then old.id else new.id end);
+            return null;
+        end
+        $$ language plpgsql
+    """)
+)
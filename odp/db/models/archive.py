@@ -1,8 +1,9 @@
-from sqlalchemy import CheckConstraint, Column, Enum, ForeignKey, ForeignKeyConstraint, String, TIMESTAMP, UniqueConstraint
+from sqlalchemy import CheckConstraint, Column, DDL, Enum, ForeignKey, ForeignKeyConstraint, Integer, String, TIMESTAMP, UniqueConstraint, event
 from sqlalchemy.orm import relationship
 
 from odp.const.db import ArchiveResourceStatus, ArchiveType, ScopeType
 from odp.db import Base
+from odp.db.models.counter import counter_property
 
 
 class Archive(Base):
@@ -26,6 +27,11 @@ class Archive(Base):
     download_url = Column(String)
     upload_url = Column(String)
 
+    # number of archived resources; maintained by trigger, with pending
+    # changes compacted into _resource_count by the counter service
+    _resource_count = Column('resource_count', Integer, nullable=False, server_default='0')
+    resource_count = counter_property('archive', _resource_count, id)
+
     scope_id = Column(String, nullable=False)
     scope_type = Column(Enum(ScopeType), nullable=False)
     scope = relationship('Scope')
@@ -56,3 +62,11 @@ class ArchiveResource(Base):
     timestamp = Column(TIMESTAMP(timezone=True), nullable=False)
 
     _repr_ = 'archive_id', 'resource_id', 'path', 'status'
+
+
+event.listen(
+    ArchiveResource.__table__,
+    'after_create',
+    DDL("create trigger archive_resource_count after insert or update of archive_id or delete on archive_resource "
+        "for each row execute function maintain_count('archive', 'resource_count', 'archive_id')"),
+)
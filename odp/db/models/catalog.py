@@ -1,8 +1,9 @@
-from sqlalchemy import ARRAY, Boolean, Column, ForeignKey, ForeignKeyConstraint, Identity, Index, Integer, Numeric, String, TIMESTAMP
+from sqlalchemy import ARRAY, Boolean, Column, DDL, ForeignKey, ForeignKeyConstraint, Identity, Index, Integer, LargeBinary, Numeric, String, TIMESTAMP, event
 from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import deferred, relationship
 
 from odp.db import Base
+from odp.db.models.counter import counter_property
 
 
 class Catalog(Base):
@@ -18,6 +19,11 @@ class Catalog(Base):
     data = Column(JSONB)
     timestamp = Column(TIMESTAMP(timezone=True))
 
+    # number of published catalog records; maintained by trigger, with pending
+    # changes compacted into _record_count by the counter service
+    _record_count = Column('record_count', Integer, nullable=False, server_default='0')
+    record_count = counter_property('catalog', _record_count, id)
+
     _repr_ = 'id', 'url'
 
 
@@ -31,6 +37,7 @@ class CatalogRecord(Base):
     __table_args__ = (
         Index('ix_catalog_record_catalog_id_timestamp', 'catalog_id', 'timestamp'),
         Index('ix_catalog_record_catalog_id_published_searchable', 'catalog_id', 'published', 'searchable'),
+        Index('ix_catalog_record_catalog_id_next_reevaluation', 'catalog_id', 'next_reevaluation'),
         Index('ix_catalog_record_full_text', 'full_text', postgresql_using='gin'),
         Index('ix_catalog_record_spatial', 'spatial_north', 'spatial_east', 'spatial_south', 'spatial_west'),
     )
@@ -46,6 +53,14 @@ class CatalogRecord(Base):
     reason = Column(String)
     timestamp = Column(TIMESTAMP(timezone=True), nullable=False)
 
+    # time of the next embargo start or end affecting a published record,
+    # at which the record must be re-evaluated irrespective of timestamp
+    next_reevaluation = Column(TIMESTAMP(timezone=True))
+
+    # gzip-compressed JSON of the published record as served by the API,
+    # for passing through to clients that accept gzip encoding
+    published_record_gzip = deferred(Column(LargeBinary))
+
     # external catalog integration
     synced = Column(Boolean)
     error = Column(String)
@@ -81,3 +96,11 @@ class CatalogRecordFacet(Base):
     record_id = Column(String, nullable=False, index=True)
     facet = Column(String, nullable=False)
     value = Column(String, nullable=False)
+
+
+event.listen(
+    CatalogRecord.__table__,
+    'after_create',
+    DDL("create trigger catalog_record_count after insert or update of catalog_id, published or delete on catalog_record "
+        "for each row execute function maintain_count('catalog', 'record_count', 'catalog_id', 'published')"),
+)
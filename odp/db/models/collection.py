@@ -1,12 +1,13 @@
 import uuid
 
-from sqlalchemy import CheckConstraint, Column, Enum, ForeignKey, ForeignKeyConstraint, Identity, Integer, String, TIMESTAMP
+from sqlalchemy import CheckConstraint, Column, DDL, Enum, ForeignKey, ForeignKeyConstraint, Identity, Index, Integer, String, TIMESTAMP, event
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.orm import relationship
 
 from odp.const.db import AuditCommand, TagType
 from odp.db import Base
+from odp.db.models.counter import counter_property
 
 
 class Collection(Base):
@@ -23,6 +24,11 @@ class Collection(Base):
     provider_id = Column(String, ForeignKey('provider.id', ondelete='CASCADE'), nullable=False)
     provider = relationship('Provider')
 
+    # number of records in the collection; maintained by trigger, with pending
+    # changes compacted into _record_count by the counter service
+    _record_count = Column('record_count', Integer, nullable=False, server_default='0')
+    record_count = counter_property('collection', _record_count, id)
+
     # view of associated tags (one-to-many)
     tags = relationship('CollectionTag', viewonly=True)
 
@@ -38,11 +44,17 @@ class CollectionAudit(Base):
 
     __tablename__ = 'collection_audit'
 
+    __table_args__ = (
+        Index('ix_collection_audit_timestamp', 'timestamp', postgresql_using='brin'),
+        Index('ix_collection_audit__id', '_id'),
+        dict(postgresql_partition_by='RANGE (timestamp)'),
+    )
+
     id = Column(Integer, Identity(), primary_key=True)
     client_id = Column(String, nullable=False)
     user_id = Column(String)
     command = Column(Enum(AuditCommand), nullable=False)
-    timestamp = Column(TIMESTAMP(timezone=True), nullable=False)
+    timestamp = Column(TIMESTAMP(timezone=True), primary_key=True)
 
     _id = Column(String, nullable=False)
     _key = Column(String, nullable=False)
@@ -51,6 +63,13 @@ class CollectionAudit(Base):
     _provider_id = Column(String, nullable=False)
 
 
+event.listen(
+    CollectionAudit.__table__,
+    'after_create',
+    DDL('create table collection_audit_default partition of collection_audit default'),
+)
+
+
 class CollectionTag(Base):
     """Tag instance model, representing a tag attached to a collection."""
 
@@ -94,11 +113,17 @@ class CollectionTagAudit(Base):
 
     __tablename__ = 'collection_tag_audit'
 
+    __table_args__ = (
+        Index('ix_collection_tag_audit_timestamp', 'timestamp', postgresql_using='brin'),
+        Index('ix_collection_tag_audit__collection_id', '_collection_id'),
+        dict(postgresql_partition_by='RANGE (timestamp)'),
+    )
+
     id = Column(Integer, Identity(), primary_key=True)
     client_id = Column(String, nullable=False)
     user_id = Column(String)
     command = Column(Enum(AuditCommand), nullable=False)
-    timestamp = Column(TIMESTAMP(timezone=True), nullable=False)
+    timestamp = Column(TIMESTAMP(timezone=True), primary_key=True)
 
     _id = Column(String, nullable=False)
     _collection_id = Column(String, nullable=False)
@@ -106,3 +131,18 @@ class CollectionTagAudit(Base):
     _user_id = Column(String)
     _data = Column(JSONB, nullable=False)
     _keyword_id = Column(Integer)
+
+
+event.listen(
+    CollectionTagAudit.__table__,
+    'after_create',
+    DDL('create table collection_tag_audit_default partition of collection_tag_audit default'),
+)
+
+
+event.listen(
+    Collection.__table__,
+    'after_create',
+    DDL("create trigger collection_notify_publisher after insert or update of timestamp or delete on collection "
+        "for each row execute function notify_publisher()"),
+)
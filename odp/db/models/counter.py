@@ -0,0 +1,42 @@
+from sqlalchemy import BigInteger, Column, Identity, Index, Integer, String, func, select
+from sqlalchemy.orm import column_property
+
+from odp.db import Base
+
+
+class CounterDelta(Base):
+    """A pending change to a counter column on a parent table.
+
+    Rows are appended by the `maintain_count` trigger, so that concurrent
+    writers of child rows never contend for the parent row, and are
+    periodically folded into the counter columns by the counter service.
+    """
+
+    __tablename__ = 'counter_delta'
+
+    __table_args__ = (
+        Index('ix_counter_delta_parent', 'parent_table', 'counter', 'parent_id'),
+    )
+
+    id = Column(BigInteger, Identity(), primary_key=True)
+    parent_table = Column(String, nullable=False)
+    counter = Column(String, nullable=False)
+    parent_id = Column(String, nullable=False)
+    delta = Column(Integer, nullable=False)
+
+    _repr_ = 'parent_table', 'counter', 'parent_id', 'delta'
+
+
+def counter_property(parent_table: str, counter: Column, parent_id: Column):
+    """Return a read-only property giving the current value of a
+    trigger-maintained counter: the compacted `counter` column plus
+    any pending deltas."""
+    return column_property(
+        counter +
+        select(func.coalesce(func.sum(CounterDelta.delta), 0)).
+        where(CounterDelta.parent_table == parent_table).
+        where(CounterDelta.counter == counter.name).
+        where(CounterDelta.parent_id == parent_id).
+        correlate_except(CounterDelta).
+        scalar_subquery()
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Enum, ForeignKey, ForeignKeyConstraint, Identity, Integer, String, TIMESTAMP, UniqueConstraint
+from sqlalchemy import Column, DDL, Enum, ForeignKey, ForeignKeyConstraint, Identity, Index, Integer, String, TIMESTAMP, UniqueConstraint, event
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
@@ -30,7 +30,7 @@ class Keyword(Base):
     data = Column(JSONB, nullable=False)
     status = Column(Enum(KeywordStatus), nullable=False)
 
-    parent_id = Column(Integer)
+    parent_id = Column(Integer, index=True)
     parent = relationship('Keyword', remote_side=(vocabulary_id, id), viewonly=True)
     children = relationship('Keyword', order_by='Keyword.vocabulary_id, Keyword.key', viewonly=True)
 
@@ -42,11 +42,17 @@ class KeywordAudit(Base):
 
     __tablename__ = 'keyword_audit'
 
+    __table_args__ = (
+        Index('ix_keyword_audit_timestamp', 'timestamp', postgresql_using='brin'),
+        Index('ix_keyword_audit__vocabulary_id_id', '_vocabulary_id', '_id'),
+        dict(postgresql_partition_by='RANGE (timestamp)'),
+    )
+
     id = Column(Integer, Identity(), primary_key=True)
     client_id = Column(String, nullable=False)
     user_id = Column(String)
     command = Column(Enum(AuditCommand), nullable=False)
-    timestamp = Column(TIMESTAMP(timezone=True), nullable=False)
+    timestamp = Column(TIMESTAMP(timezone=True), primary_key=True)
 
     _vocabulary_id = Column(String, nullable=False)
     _id = Column(Integer, nullable=False)
@@ -54,3 +60,18 @@ class KeywordAudit(Base):
     _data = Column(JSONB, nullable=False)
     _status = Column(String, nullable=False)
     _parent_id = Column(Integer)
+
+
+event.listen(
+    KeywordAudit.__table__,
+    'after_create',
+    DDL('create table keyword_audit_default partition of keyword_audit default'),
+)
+
+
+event.listen(
+    Keyword.__table__,
+    'after_create',
+    DDL("create trigger keyword_count after insert or update of vocabulary_id or delete on keyword "
+        "for each row execute function maintain_count('vocabulary', 'keyword_count', 'vocabulary_id')"),
+)
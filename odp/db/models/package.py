@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import ARRAY, CheckConstraint, Column, Enum, ForeignKey, ForeignKeyConstraint, Identity, Integer, String, TIMESTAMP, UniqueConstraint
+from sqlalchemy import ARRAY, CheckConstraint, Column, DDL, Enum, ForeignKey, ForeignKeyConstraint, Identity, Index, Integer, String, TIMESTAMP, UniqueConstraint, event
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.orm import relationship
@@ -66,11 +66,17 @@ class PackageAudit(Base):
 
     __tablename__ = 'package_audit'
 
+    __table_args__ = (
+        Index('ix_package_audit_timestamp', 'timestamp', postgresql_using='brin'),
+        Index('ix_package_audit__id', '_id'),
+        dict(postgresql_partition_by='RANGE (timestamp)'),
+    )
+
     id = Column(Integer, Identity(), primary_key=True)
     client_id = Column(String, nullable=False)
     user_id = Column(String)
     command = Column(Enum(PackageCommand), nullable=False)
-    timestamp = Column(TIMESTAMP(timezone=True), nullable=False)
+    timestamp = Column(TIMESTAMP(timezone=True), primary_key=True)
 
     _id = Column(String, nullable=False)
     _key = Column(String, nullable=False)
@@ -80,6 +86,13 @@ class PackageAudit(Base):
     _resources = Column(ARRAY(String))
 
 
+event.listen(
+    PackageAudit.__table__,
+    'after_create',
+    DDL('create table package_audit_default partition of package_audit default'),
+)
+
+
 class PackageTag(Base):
     """Tag instance model, representing a tag attached to a package."""
 
@@ -125,11 +138,17 @@ class PackageTagAudit(Base):
 
     __tablename__ = 'package_tag_audit'
 
+    __table_args__ = (
+        Index('ix_package_tag_audit_timestamp', 'timestamp', postgresql_using='brin'),
+        Index('ix_package_tag_audit__package_id', '_package_id'),
+        dict(postgresql_partition_by='RANGE (timestamp)'),
+    )
+
     id = Column(Integer, Identity(), primary_key=True)
     client_id = Column(String, nullable=False)
     user_id = Column(String)
     command = Column(Enum(AuditCommand), nullable=False)
-    timestamp = Column(TIMESTAMP(timezone=True), nullable=False)
+    timestamp = Column(TIMESTAMP(timezone=True), primary_key=True)
 
     _id = Column(String, nullable=False)
     _package_id = Column(String, nullable=False)
@@ -137,3 +156,18 @@ class PackageTagAudit(Base):
     _user_id = Column(String)
     _data = Column(JSONB, nullable=False)
     _keyword_id = Column(Integer)
+
+
+event.listen(
+    PackageTagAudit.__table__,
+    'after_create',
+    DDL('create table package_tag_audit_default partition of package_tag_audit default'),
+)
+
+
+event.listen(
+    Package.__table__,
+    'after_create',
+    DDL("create trigger package_count after insert or update of provider_id or delete on package "
+        "for each row execute function maintain_count('provider', 'package_count', 'provider_id')"),
+)
@@ -1,11 +1,12 @@
 import uuid
 
-from sqlalchemy import ARRAY, Column, Enum, ForeignKey, Identity, Integer, String, TIMESTAMP
+from sqlalchemy import ARRAY, Column, DDL, Enum, ForeignKey, Identity, Index, Integer, String, TIMESTAMP, event
 from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.orm import relationship
 
 from odp.const.db import AuditCommand
 from odp.db import Base
+from odp.db.models.counter import counter_property
 
 
 class Provider(Base):
@@ -21,6 +22,11 @@ class Provider(Base):
     name = Column(String, nullable=False)
     timestamp = Column(TIMESTAMP(timezone=True), nullable=False)
 
+    # number of packages from the provider; maintained by trigger, with pending
+    # changes compacted into _package_count by the counter service
+    _package_count = Column('package_count', Integer, nullable=False, server_default='0')
+    package_count = counter_property('provider', _package_count, id)
+
     # view of associated collections (one-to-many)
     collections = relationship('Collection', viewonly=True)
 
@@ -55,13 +61,34 @@ class ProviderAudit(Base):
 
     __tablename__ = 'provider_audit'
 
+    __table_args__ = (
+        Index('ix_provider_audit_timestamp', 'timestamp', postgresql_using='brin'),
+        Index('ix_provider_audit__id', '_id'),
+        dict(postgresql_partition_by='RANGE (timestamp)'),
+    )
+
     id = Column(Integer, Identity(), primary_key=True)
     client_id = Column(String, nullable=False)
     user_id = Column(String)
     command = Column(Enum(AuditCommand), nullable=False)
-    timestamp = Column(TIMESTAMP(timezone=True), nullable=False)
+    timestamp = Column(TIMESTAMP(timezone=True), primary_key=True)
 
     _id = Column(String, nullable=False)
     _key = Column(String, nullable=False)
     _name = Column(String, nullable=False)
     _users = Column(ARRAY(String))
+
+
+event.listen(
+    ProviderAudit.__table__,
+    'after_create',
+    DDL('create table provider_audit_default partition of provider_audit default'),
+)
+
+
+event.listen(
+    Provider.__table__,
+    'after_create',
+    DDL("create trigger provider_notify_publisher after insert or update of timestamp or delete on provider "
+        "for each row execute function notify_publisher()"),
+)
@@ -1,11 +1,12 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import ARRAY, CheckConstraint, Column, Enum, ForeignKey, ForeignKeyConstraint, Identity, Index, Integer, String, TIMESTAMP, text
+from sqlalchemy import ARRAY, CheckConstraint, Column, Computed, DDL, Enum, ForeignKey, ForeignKeyConstraint, Identity, Index, Integer, String, TIMESTAMP, event, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.associationproxy import association_proxy
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 
+from odp.const import ODPMetadataSchema
 from odp.const.db import AuditCommand, SchemaType, TagType
 from odp.db import Base
 
@@ -36,6 +37,14 @@ class Record(Base):
             'doi IS NOT NULL OR sid IS NOT NULL',
             name='record_doi_sid_check',
         ),
+        Index(
+            'ix_record_identifier_text', 'identifier_text',
+            postgresql_using='gin', postgresql_ops={'identifier_text': 'gin_trgm_ops'},
+        ),
+        Index(
+            'ix_record_title_text', 'title_text',
+            postgresql_using='gin', postgresql_ops={'title_text': 'gin_trgm_ops'},
+        ),
     )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -45,15 +54,26 @@ class Record(Base):
     validity = Column(JSONB, nullable=False)
     timestamp = Column(TIMESTAMP(timezone=True), nullable=False)
 
-    collection_id = Column(String, ForeignKey('collection.id', ondelete='RESTRICT'), nullable=False)
+    collection_id = Column(String, ForeignKey('collection.id', ondelete='RESTRICT'), nullable=False, index=True)
     collection = relationship('Collection')
 
     schema_id = Column(String, nullable=False)
     schema_type = Column(Enum(SchemaType), nullable=False)
     schema = relationship('Schema')
 
+    # generated search columns, trigram-indexed for substring matching
+    identifier_text = deferred(Column(String, Computed(
+        "id || ' ' || coalesce(doi, '') || ' ' || coalesce(sid, '')"
+    )))
+    title_text = deferred(Column(String, Computed(
+        f"case schema_id "
+        f"when '{ODPMetadataSchema.SAEON_DATACITE4}' then metadata_ #>> '{{titles,0,title}}' "
+        f"when '{ODPMetadataSchema.SAEON_ISO19115}' then metadata_ ->> 'title' "
+        f"end"
+    )))
+
     # parent-child relationship for HasPart/IsPartOf related identifiers
-    parent_id = Column(String, ForeignKey('record.id', ondelete='RESTRICT'))
+    parent_id = Column(String, ForeignKey('record.id', ondelete='RESTRICT'), index=True)
     parent = relationship('Record', remote_side=id)
     children = relationship('Record', viewonly=True)
 
@@ -76,11 +96,17 @@ class RecordAudit(Base):
 
     __tablename__ = 'record_audit'
 
+    __table_args__ = (
+        Index('ix_record_audit_timestamp', 'timestamp', postgresql_using='brin'),
+        Index('ix_record_audit__id', '_id'),
+        dict(postgresql_partition_by='RANGE (timestamp)'),
+    )
+
     id = Column(Integer, Identity(), primary_key=True)
     client_id = Column(String, nullable=False)
     user_id = Column(String)
     command = Column(Enum(AuditCommand), nullable=False)
-    timestamp = Column(TIMESTAMP(timezone=True), nullable=False)
+    timestamp = Column(TIMESTAMP(timezone=True), primary_key=True)
 
     _id = Column(String, nullable=False)
     _doi = Column(String)
@@ -92,6 +118,13 @@ class RecordAudit(Base):
     _packages = Column(ARRAY(String))
 
 
+event.listen(
+    RecordAudit.__table__,
+    'after_create',
+    DDL('create table record_audit_default partition of record_audit default'),
+)
+
+
 class RecordPackage(Base):
     """One-to-many record-package association.
 
@@ -129,7 +162,7 @@ class RecordTag(Base):
     )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    record_id = Column(String, ForeignKey('record.id', ondelete='CASCADE'), nullable=False)
+    record_id = Column(String, ForeignKey('record.id', ondelete='CASCADE'), nullable=False, index=True)
     tag_id = Column(String, nullable=False)
     tag_type = Column(Enum(TagType), nullable=False)
     user_id = Column(String, ForeignKey('user.id', ondelete='RESTRICT'))
@@ -151,11 +184,17 @@ class RecordTagAudit(Base):
 
     __tablename__ = 'record_tag_audit'
 
+    __table_args__ = (
+        Index('ix_record_tag_audit_timestamp', 'timestamp', postgresql_using='brin'),
+        Index('ix_record_tag_audit__record_id', '_record_id'),
+        dict(postgresql_partition_by='RANGE (timestamp)'),
+    )
+
     id = Column(Integer, Identity(), primary_key=True)
     client_id = Column(String, nullable=False)
     user_id = Column(String)
     command = Column(Enum(AuditCommand), nullable=False)
-    timestamp = Column(TIMESTAMP(timezone=True), nullable=False)
+    timestamp = Column(TIMESTAMP(timezone=True), primary_key=True)
 
     _id = Column(String, nullable=False)
     _record_id = Column(String, nullable=False)
@@ -165,6 +204,13 @@ class RecordTagAudit(Base):
     _keyword_id = Column(Integer)
 
 
+event.listen(
+    RecordTagAudit.__table__,
+    'after_create',
+    DDL('create table record_tag_audit_default partition of record_tag_audit default'),
+)
+
+
 def _doi_published_timestamp(context):
     if context.get_current_parameters()['doi'] is not None:
         return datetime.now(timezone.utc)
@@ -188,3 +234,19 @@ class PublishedRecord(Base):
     doi = Column(String, ForeignKey('record.doi', ondelete='RESTRICT', onupdate='RESTRICT'), unique=True)
     id_published = Column(TIMESTAMP(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
     doi_published = Column(TIMESTAMP(timezone=True), default=_doi_published_timestamp, onupdate=_doi_published_timestamp)
+
+
+event.listen(
+    Record.__table__,
+    'after_create',
+    DDL("create trigger record_count after insert or update of collection_id or delete on record "
+        "for each row execute function maintain_count('collection', 'record_count', 'collection_id')"),
+)
+
+
+event.listen(
+    Record.__table__,
+    'after_create',
+    DDL("create trigger record_notify_publisher after insert or update of timestamp or delete on record "
+        "for each row execute function notify_publisher()"),
+)
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import ARRAY, Boolean, Column, Enum, ForeignKey, Identity, Integer, String, TIMESTAMP
+from sqlalchemy import ARRAY, Boolean, Column, DDL, Enum, ForeignKey, Identity, Index, Integer, String, TIMESTAMP, event
 from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.orm import relationship
 
@@ -53,15 +53,28 @@ class IdentityAudit(Base):
 
     __tablename__ = 'identity_audit'
 
+    __table_args__ = (
+        Index('ix_identity_audit_timestamp', 'timestamp', postgresql_using='brin'),
+        Index('ix_identity_audit__id', '_id'),
+        dict(postgresql_partition_by='RANGE (timestamp)'),
+    )
+
     id = Column(Integer, Identity(), primary_key=True)
     client_id = Column(String, nullable=False)
     user_id = Column(String)  # admin user id, for user edit/delete
     command = Column(Enum(IdentityCommand), nullable=False)
     completed = Column(Boolean, nullable=False)
     error = Column(String)
-    timestamp = Column(TIMESTAMP(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    timestamp = Column(TIMESTAMP(timezone=True), primary_key=True, default=lambda: datetime.now(timezone.utc))
 
     _id = Column(String)
     _email = Column(String)
     _active = Column(Boolean)
     _roles = Column(ARRAY(String))
+
+
+event.listen(
+    IdentityAudit.__table__,
+    'after_create',
+    DDL('create table identity_audit_default partition of identity_audit default'),
+)
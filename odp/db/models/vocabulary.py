@@ -1,8 +1,9 @@
-from sqlalchemy import Boolean, CheckConstraint, Column, Enum, ForeignKeyConstraint, String
+from sqlalchemy import Boolean, CheckConstraint, Column, Enum, ForeignKeyConstraint, Integer, String
 from sqlalchemy.orm import relationship
 
 from odp.const.db import SchemaType
 from odp.db import Base
+from odp.db.models.counter import counter_property
 
 
 class Vocabulary(Base):
@@ -36,4 +37,9 @@ class Vocabulary(Base):
     # view of associated keywords (one-to-many)
     keywords = relationship('Keyword', viewonly=True)
 
+    # number of keywords in the vocabulary; maintained by trigger, with pending
+    # changes compacted into _keyword_count by the counter service
+    _keyword_count = Column('keyword_count', Integer, nullable=False, server_default='0')
+    keyword_count = counter_property('vocabulary', _keyword_count, id)
+
     _repr_ = 'id', 'uri', 'schema_id', 'static'
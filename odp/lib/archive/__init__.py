@@ -58,6 +58,13 @@ class ArchiveAdapter:
 
         return instance
 
+    @classmethod
+    def close_all(cls) -> None:
+        """Close and discard all cached adapter instances."""
+        while cls._instance_cache:
+            _, instance = cls._instance_cache.popitem()
+            instance.close()
+
     def __init__(
             self,
             download_url: str | None,
@@ -66,6 +73,9 @@ class ArchiveAdapter:
         self.download_url = download_url
         self.upload_url = upload_url
 
+    def close(self) -> None:
+        """Release any connections held by the adapter."""
+
     async def get(
             self,
             path: str | PathLike,
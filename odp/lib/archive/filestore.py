@@ -1,9 +1,12 @@
+import asyncio
+import queue
 from io import BytesIO
 from os import PathLike
 from typing import Any, BinaryIO
 from urllib.parse import urljoin
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from odp.config import config
 from odp.lib.archive import ArchiveAdapter, ArchiveError, ArchiveFileInfo, ArchiveFileResponse
@@ -16,9 +19,40 @@ class FilestoreArchiveAdapter(ArchiveAdapter):
     Integrates with `ODP Filing <https://github.com/SAEON/odp-filing>`_.
     """
 
+    pool_size = 20
+    """Maximum number of idle keep-alive sessions held open to the
+    file storage service."""
+
     def __init__(self, *args) -> None:
         super().__init__(*args)
         self.timeout = 3600.0 if config.ODP.ENV == 'development' else 10.0
+        # requests.Session is not documented as thread-safe, and deletes are
+        # sent from worker threads; each session is therefore used by only one
+        # thread at a time, and returned to the pool for reuse when done
+        self._sessions = queue.LifoQueue(maxsize=self.pool_size)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._sessions.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def _acquire_session(self) -> requests.Session:
+        try:
+            return self._sessions.get_nowait()
+        except queue.Empty:
+            session = requests.Session()
+            http_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+            session.mount('http://', http_adapter)
+            session.mount('https://', http_adapter)
+            return session
+
+    def _release_session(self, session: requests.Session) -> None:
+        try:
+            self._sessions.put_nowait(session)
+        except queue.Full:
+            session.close()
 
     async def get(
             self,
@@ -57,7 +91,11 @@ class FilestoreArchiveAdapter(ArchiveAdapter):
             self,
             path: str | PathLike,
     ) -> None:
-        self._send_request(
+        # only the file purge service deletes files, concurrently, from its
+        # own event loop; API requests send synchronously (get, put), so that
+        # they do not yield to other requests mid-transaction
+        await asyncio.to_thread(
+            self._send_request,
             'DELETE',
             urljoin(self.upload_url, path),
         )
@@ -73,8 +111,9 @@ class FilestoreArchiveAdapter(ArchiveAdapter):
     ) -> Any:
         """Send a request to the ODP file storage service and return
         its JSON response."""
+        session = self._acquire_session()
         try:
-            r = requests.request(
+            r = session.request(
                 method,
                 url,
                 files=files,
@@ -96,3 +135,6 @@ class FilestoreArchiveAdapter(ArchiveAdapter):
                 error_detail = str(e)
 
             raise ArchiveError(status_code, error_detail) from e
+
+        finally:
+            self._release_session(session)
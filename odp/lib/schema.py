@@ -1,5 +1,7 @@
 import hashlib
+import logging
 import re
+import time
 from datetime import datetime
 from pathlib import Path
 from urllib.parse import urlparse
@@ -13,7 +15,9 @@ from sqlalchemy import select
 import odp.schema
 import odp.vocab
 from odp.db import Session
-from odp.db.models import Keyword
+from odp.db.models import Keyword, Schema
+
+logger = logging.getLogger(__name__)
 
 
 class ODPKeywordIdKeyword(jschon_Keyword):
@@ -96,6 +100,27 @@ def schema_md5(uri: str) -> str:
     return hashlib.md5(str(schema).encode()).hexdigest()
 
 
+def warm_up_schemas() -> None:
+    """Load and compile every schema referenced in the schema table,
+    so that the first request or publishing run needing a schema does
+    not pay for file I/O, parsing and compilation.
+
+    If called before a pre-forking server forks its workers, the
+    compiled schemas are shared copy-on-write by all of the workers.
+    """
+    start = time.perf_counter()
+    uris = Session.execute(select(Schema.uri).distinct()).scalars().all()
+    loaded = 0
+    for uri in uris:
+        try:
+            schema_catalog.get_schema(URI(uri))
+            loaded += 1
+        except Exception as e:
+            logger.error(f'Failed to load schema {uri}: {e!r}')
+
+    logger.info(f'Loaded {loaded}/{len(uris)} schemas in {time.perf_counter() - start:.2f}s')
+
+
 @translation_filter('date-to-year')
 def date_to_year(date: str) -> int:
     return datetime.strptime(date, '%Y-%m-%d').year
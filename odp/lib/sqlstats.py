@@ -0,0 +1,55 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator
+
+from sqlalchemy import event
+
+from odp.db import engine
+
+
+@dataclass
+class SQLStats:
+    """Number of SQL statements executed, the time spent executing
+    them, and the number of rows they inserted, updated or deleted,
+    within a unit of work such as an API request."""
+    count: int = 0
+    time: float = 0.0
+    rows: int = 0
+
+    def __str__(self):
+        return f'{self.count} queries, {self.time * 1000:.1f}ms'
+
+
+_current_stats: ContextVar[tuple[SQLStats, ...]] = ContextVar('sqlstats', default=())
+
+
+@event.listens_for(engine, 'before_cursor_execute')
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    context.sqlstats_start = time.perf_counter()
+
+
+@event.listens_for(engine, 'after_cursor_execute')
+def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - context.sqlstats_start
+    rows = cursor.rowcount if (context.isinsert or context.isupdate or context.isdelete) and cursor.rowcount > 0 else 0
+    for stats in _current_stats.get():
+        stats.count += 1
+        stats.time += duration
+        stats.rows += rows
+
+
+@contextmanager
+def collect() -> Iterator[SQLStats]:
+    """Collect statistics for SQL statements executed within the
+    current context (including any tasks it spawns) for the duration
+    of the `with` block.
+
+    Collections may be nested; statements are counted by every
+    enclosing collection."""
+    token = _current_stats.set(_current_stats.get() + (stats := SQLStats()))
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
@@ -1,35 +1,56 @@
 import logging
+import threading
+import time
 from importlib import import_module
 from pathlib import Path
 from pkgutil import iter_modules
 from typing import final
 
-from odp.db import Session
+from sqlalchemy import func, select
+
+from odp.db import Session, engine
+from odp.lib import sqlstats
 
 logger = logging.getLogger(__name__)
 
+SCHEDULER_LOCK_ID = 2_118_560_001
+"""Postgres advisory lock key held by the active (leader) scheduler."""
+
+SCHEDULER_POLL_INTERVAL = 30
+"""Seconds between leadership checks by the scheduler."""
+
+SCHEDULER_MIN_WAIT = 1.0
+"""Minimum number of seconds that a service thread sleeps between
+checks for modules that are due to run."""
+
 
 class ServiceModule:
     """Abstract base class for a background service module."""
 
+    interval: int = 3600
+    """Number of seconds between runs, when executed by the scheduler."""
+
     @final
     def run(self):
         modname = self.__class__.__name__
+        start = time.perf_counter()
         try:
             logger.info(f'{modname} started')
-            self.exec()
-            Session.commit()
-            logger.info(f'{modname} completed')
+            with sqlstats.collect() as stats:
+                self.exec()
+                Session.commit()
+            logger.info(f'{modname} completed in {time.perf_counter() - start:.1f}s; '
+                        f'{stats.rows} rows written ({stats})')
         except Exception as e:
             Session.rollback()
-            logger.exception(f'{modname} failed: {e!r}')
+            logger.exception(f'{modname} failed after {time.perf_counter() - start:.1f}s: {e!r}')
 
     def exec(self):
         raise NotImplementedError
 
 
-def run_service(name: str):
-    """Run all service modules within `name` directory."""
+def load_service(name: str) -> list[ServiceModule]:
+    """Return instances of all service modules within `name` directory."""
     modules = []
     dir_ = str(Path(__file__).parent / name)
     for mod_info in iter_modules([dir_]):
@@ -38,5 +59,112 @@ def run_service(name: str):
             if isinstance(cls, type) and issubclass(cls, ServiceModule) and cls is not ServiceModule:
                 modules += [cls()]
 
-    for module in modules:
+    return modules
+
+
+def run_service(name: str):
+    """Run all service modules within `name` directory."""
+    for module in load_service(name):
         module.run()
+
+
+def run_scheduler(*names: str):
+    """Run the service modules within each of the `names` directories
+    repeatedly, each module at its own `interval`.
+
+    Each service runs in its own thread, so that independent services
+    proceed in parallel, while the modules of a service run sequentially
+    and never overlap with themselves.
+
+    Any number of scheduler processes may be started; a Postgres advisory
+    lock ensures that only one of them - the leader - runs services at any
+    given time. If the leader stops or loses its database connection, another
+    process takes over. Since a module run in progress cannot be interrupted
+    when leadership is lost, each module run additionally holds a module-specific
+    advisory lock, so that a new leader never runs a module that is still
+    running in the previous leader.
+    """
+    services = {name: load_service(name) for name in names}
+    shutdown = threading.Event()
+
+    while True:
+        try:
+            _lead(services, shutdown)
+        except Exception as e:
+            logger.error(f'Scheduler connection failed: {e!r}')
+
+        time.sleep(SCHEDULER_POLL_INTERVAL)
+
+
+def _lead(services: dict[str, list[ServiceModule]], shutdown: threading.Event):
+    """Acquire the scheduler lock, if available, and run services for
+    as long as it is held, or until `shutdown` is set."""
+    with engine.connect() as lock_conn:
+        acquired = lock_conn.scalar(select(func.pg_try_advisory_lock(SCHEDULER_LOCK_ID)))
+        lock_conn.commit()
+        if not acquired:
+            return
+
+        logger.info('Scheduler acquired leadership')
+        stop = threading.Event()
+        threads = [
+            threading.Thread(target=_schedule, args=(modules, stop), name=f'svc-{name}', daemon=True)
+            for name, modules in services.items()
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            while not shutdown.wait(SCHEDULER_POLL_INTERVAL):
+                # the session-level advisory lock is held for as long as the
+                # connection lives; give up leadership if the connection fails
+                lock_conn.scalar(select(1))
+                lock_conn.commit()
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+            if not lock_conn.invalidated:
+                lock_conn.scalar(select(func.pg_advisory_unlock(SCHEDULER_LOCK_ID)))
+                lock_conn.commit()
+            logger.info('Scheduler released leadership')
+
+
+def _schedule(modules: list[ServiceModule], stop: threading.Event):
+    """Run `modules` sequentially, each whenever its interval has elapsed,
+    until `stop` is set."""
+    next_run = {module: 0.0 for module in modules}
+    try:
+        while not stop.is_set():
+            for module in modules:
+                if stop.is_set():
+                    break
+                if next_run[module] <= time.monotonic():
+                    _run_exclusive(module)
+                    next_run[module] = time.monotonic() + module.interval
+
+            Session.remove()
+            stop.wait(max(SCHEDULER_MIN_WAIT, min(next_run.values(), default=SCHEDULER_POLL_INTERVAL) - time.monotonic()))
+    finally:
+        Session.remove()
+
+
+def _run_exclusive(module: ServiceModule):
+    """Run `module` while holding its advisory lock. The run is skipped
+    if the lock is held elsewhere, i.e. if the module is still running
+    under a previous leader."""
+    modname = module.__class__.__name__
+    with engine.connect() as lock_conn:
+        acquired = lock_conn.scalar(select(func.pg_try_advisory_lock(SCHEDULER_LOCK_ID, func.hashtext(modname))))
+        lock_conn.commit()
+        if not acquired:
+            logger.warning(f'{modname} skipped: already running elsewhere')
+            return
+
+        try:
+            module.run()
+        finally:
+            if not lock_conn.invalidated:
+                lock_conn.scalar(select(func.pg_advisory_unlock(SCHEDULER_LOCK_ID, func.hashtext(modname))))
+                lock_conn.commit()
@@ -2,44 +2,83 @@ import asyncio
 import logging
 
 from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 
 from odp.const.db import ResourceStatus
 from odp.db import Session
-from odp.db.models import Resource
+from odp.db.models import ArchiveResource, Resource
 from odp.lib.archive import ArchiveAdapter, ArchiveError
 from odp.svc import ServiceModule
 
 logger = logging.getLogger(__name__)
 
+ARCHIVE_CONCURRENCY = 10
+"""Maximum number of concurrent delete requests per archive."""
+
+BATCH_SIZE = 500
+"""Number of resources to purge per transaction."""
+
 
 class FilePurgeModule(ServiceModule):
 
     def exec(self):
-        resources_to_delete = Session.execute(
-            select(Resource).where(Resource.status == ResourceStatus.delete_pending)
-        ).scalars().all()
+        # cached archive adapters, and their keep-alive connections,
+        # are retained for subsequent runs by the scheduler
+        asyncio.run(self._purge())
 
-        for resource in resources_to_delete:
-            for ar in resource.archive_resources:
-                archive_adapter = ArchiveAdapter.get_instance(ar.archive)
-                try:
-                    asyncio.run(archive_adapter.delete(ar.path))
-                    logger.info(f'Deleted {ar.path} in {ar.archive_id}')
+    async def _purge(self):
+        resource_ids = Session.execute(
+            select(Resource.id).where(Resource.status == ResourceStatus.delete_pending)
+        ).scalars().all()
 
-                except ArchiveError as e:
-                    if e.status_code == 404:
-                        logger.info(f'Delete {ar.path} in {ar.archive_id}: already gone')
-                    else:
-                        logger.exception(f'{e.status_code}: {e.error_detail}')
-                        continue
+        semaphores = {}
+        for i in range(0, len(resource_ids), BATCH_SIZE):
+            batch_ids = resource_ids[i:i + BATCH_SIZE]
+            resources = Session.execute(
+                select(Resource).
+                where(Resource.id.in_(batch_ids)).
+                options(selectinload(Resource.archive_resources).joinedload(ArchiveResource.archive))
+            ).scalars().all()
 
-                except NotImplementedError:
-                    pass
+            archive_resources = [ar for resource in resources for ar in resource.archive_resources]
+            results = await asyncio.gather(*(
+                self._delete_file(ar, semaphores.setdefault(ar.archive_id, asyncio.Semaphore(ARCHIVE_CONCURRENCY)))
+                for ar in archive_resources
+            ))
 
-                ar.delete()
-                Session.commit()
+            deleted = set()
+            for ar, ok in zip(archive_resources, results):
+                if ok:
+                    Session.delete(ar)
+                    deleted.add((ar.archive_id, ar.resource_id))
 
             # Delete resource only if there are no archive_resources left.
-            if not resource.archive_resources:
-                resource.delete()
-                Session.commit()
+            for resource in resources:
+                if all((ar.archive_id, ar.resource_id) in deleted for ar in resource.archive_resources):
+                    Session.delete(resource)
+
+            Session.flush()
+            Session.commit()
+            logger.info(f'Purged {len(deleted)} files ({i + len(batch_ids)}/{len(resource_ids)} resources processed)')
+
+    @staticmethod
+    async def _delete_file(ar: ArchiveResource, semaphore: asyncio.Semaphore) -> bool:
+        """Delete an archived file, returning True if the
+        archive_resource record may be removed."""
+        archive_adapter = ArchiveAdapter.get_instance(ar.archive)
+        async with semaphore:
+            try:
+                await archive_adapter.delete(ar.path)
+                logger.info(f'Deleted {ar.path} in {ar.archive_id}')
+
+            except ArchiveError as e:
+                if e.status_code == 404:
+                    logger.info(f'Delete {ar.path} in {ar.archive_id}: already gone')
+                else:
+                    logger.exception(f'{e.status_code}: {e.error_detail}')
+                    return False
+
+            except NotImplementedError:
+                pass
+
+        return True
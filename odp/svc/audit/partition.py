@@ -0,0 +1,106 @@
+import logging
+import re
+from datetime import date
+
+from sqlalchemy import Table, text
+
+from odp.db import Base, Session
+from odp.svc import ServiceModule
+
+logger = logging.getLogger(__name__)
+
+MONTHS_AHEAD = 3
+"""Number of monthly partitions to maintain beyond the current month."""
+
+
+class AuditPartitionModule(ServiceModule):
+    interval = 86400
+
+    def exec(self):
+        """Ensure that monthly partitions exist for every audit table,
+        for the current month and the next `MONTHS_AHEAD` months."""
+        this_month = date.today().replace(day=1)
+        for table in audit_tables():
+            month = this_month
+            for _ in range(MONTHS_AHEAD + 1):
+                create_partition(table, month)
+                month = _next_month(month)
+
+
+def audit_tables() -> list[Table]:
+    """Return the time-partitioned audit tables."""
+    return [
+        table for table in Base.metadata.sorted_tables
+        if table.dialect_options['postgresql']['partition_by']
+    ]
+
+
+def create_partition(table: Table, month: date) -> None:
+    """Create the partition of `table` for `month`, if it does not
+    already exist.
+
+    Any rows for that month that have landed in the default partition
+    are moved into the new partition.
+    """
+    partition = f'{table.name}_{month:%Y_%m}'
+    if Session.execute(text('select to_regclass(:partition)'), {'partition': partition}).scalar():
+        return
+
+    bounds = f"'{month} 00:00+00'", f"'{_next_month(month)} 00:00+00'"
+    default_rows = Session.execute(text(
+        f'select count(*) from {table.name}_default '
+        f'where timestamp >= {bounds[0]} and timestamp < {bounds[1]}'
+    )).scalar()
+
+    if default_rows:
+        Session.execute(text(f'alter table {table.name} detach partition {table.name}_default'))
+
+    Session.execute(text(
+        f'create table {partition} partition of {table.name} '
+        f'for values from ({bounds[0]}) to ({bounds[1]})'
+    ))
+
+    if default_rows:
+        Session.execute(text(
+            f'insert into {partition} select * from {table.name}_default '
+            f'where timestamp >= {bounds[0]} and timestamp < {bounds[1]}'
+        ))
+        Session.execute(text(
+            f'delete from {table.name}_default '
+            f'where timestamp >= {bounds[0]} and timestamp < {bounds[1]}'
+        ))
+        Session.execute(text(f'alter table {table.name} attach partition {table.name}_default default'))
+
+    Session.commit()
+    logger.info(f'Created partition {partition} ({default_rows} rows moved from default partition)')
+
+
+def detach_partitions(before: date) -> list[str]:
+    """Detach all monthly audit table partitions for months earlier
+    than `before`, and return their names.
+
+    Detached partitions remain in the database as standalone tables,
+    to be archived (e.g. with pg_dump) and dropped.
+    """
+    detached = []
+    for table in audit_tables():
+        partitions = Session.execute(text(
+            'select c.relname from pg_inherits i '
+            'join pg_class c on c.oid = i.inhrelid '
+            'join pg_class p on p.oid = i.inhparent '
+            'where p.relname = :table'
+        ), {'table': table.name}).scalars().all()
+
+        for partition in sorted(partitions):
+            if (match := re.fullmatch(rf'{table.name}_(\d{{4}})_(\d{{2}})', partition)) and \
+                    date(int(match.group(1)), int(match.group(2)), 1) < before:
+                Session.execute(text(f'alter table {table.name} detach partition {partition}'))
+                Session.commit()
+                logger.info(f'Detached partition {partition}')
+                detached += [partition]
+
+    return detached
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
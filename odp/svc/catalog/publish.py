@@ -0,0 +1,9 @@
+from odp.catalog import publish_all
+from odp.svc import ServiceModule
+
+
+class PublishModule(ServiceModule):
+    interval = 600
+
+    def exec(self):
+        publish_all()
@@ -0,0 +1,67 @@
+import logging
+
+from sqlalchemy import func, select, text
+
+from odp.db import Session
+from odp.db.models import CounterDelta
+from odp.svc import ServiceModule
+
+logger = logging.getLogger(__name__)
+
+COUNTER_COMPACT_LOCK_ID = 2_118_560_003
+"""Postgres advisory lock key held for the duration of a compaction."""
+
+COUNTER_DELTA_WARN_ROWS = 100_000
+"""Number of pending counter deltas above which compaction logs a warning;
+every read of a counted object sums its pending deltas, so a large backlog
+means that compaction is not running often enough."""
+
+
+class CounterCompactModule(ServiceModule):
+    interval = 60
+
+    def exec(self):
+        compact_counters()
+
+
+def compact_counters() -> None:
+    """Fold pending counter deltas into their counter columns.
+
+    This runs every minute under the scheduler, and after every publishing
+    run (see `odp.catalog.publish_all`), so that deployments which run
+    services from cron also keep the delta backlog bounded. If another
+    compaction is in progress, this one is skipped.
+    """
+    if not Session.execute(select(func.pg_try_advisory_xact_lock(COUNTER_COMPACT_LOCK_ID))).scalar_one():
+        Session.rollback()
+        return
+
+    pending = Session.execute(select(func.count()).select_from(CounterDelta)).scalar_one()
+    if pending > COUNTER_DELTA_WARN_ROWS:
+        logger.warning(f'{pending} pending counter deltas; compaction is falling behind')
+
+    for parent_table, counter in Session.execute(
+            select(CounterDelta.parent_table, CounterDelta.counter).distinct()
+    ).all():
+        compact_counter(parent_table, counter)
+
+    Session.commit()
+
+
+def compact_counter(parent_table: str, counter: str) -> None:
+    """Add the pending deltas for `counter` to that column on `parent_table`,
+    and delete them.
+
+    Only deltas visible to the transaction are compacted; those of writers
+    still in progress remain pending until the next run. Deltas of deleted
+    parent rows are simply discarded.
+    """
+    Session.execute(text(
+        f'with deltas as ('
+        f'delete from counter_delta where parent_table = :parent_table and counter = :counter '
+        f'returning parent_id, delta'
+        f') '
+        f'update {parent_table} set {counter} = {counter} + d.delta '
+        f'from (select parent_id, sum(delta) as delta from deltas group by parent_id) d '
+        f'where {parent_table}.id = d.parent_id'
+    ), {'parent_table': parent_table, 'counter': counter})
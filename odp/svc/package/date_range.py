@@ -1,73 +1,124 @@
-import copy
 import logging
 from datetime import date, datetime, timezone
 
-from sqlalchemy import and_, select
+from sqlalchemy import String, and_, cast, exists, func, insert, literal, null, select, update
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import aliased
 
 from odp.const import ODPDateRangeIncType, ODPPackageTag
+from odp.const.db import AuditCommand
 from odp.db import Session
-from odp.db.models import Package, PackageTag
+from odp.db.models import Package, PackageTag, PackageTagAudit
 from odp.svc import ServiceModule
 
 logger = logging.getLogger(__name__)
 
 
 class DateRangeIncModule(ServiceModule):
+    interval = 86400
 
     def exec(self):
         """
-        Fetch and increment date of package date range tag according to it's related date range increment tag.
+        Increment the dates of package date range tags according to their related date range increment tags.
+
+        All date range tags are updated - and audited, and their packages timestamped - in a single
+        statement, which touches only those tags whose dates actually change.
         """
-        date_range_package_tag: PackageTag = aliased(PackageTag)
-        date_range_inc_package_tag: PackageTag = aliased(PackageTag)
-
-        stmt = (
-            select(Package, date_range_package_tag, date_range_inc_package_tag)
-            .join(
-                date_range_package_tag,
-                and_(
-                    Package.id == date_range_package_tag.package_id,
-                    date_range_package_tag.tag_id == ODPPackageTag.DATERANGE
-                )
-            )
-            .join(
-                date_range_inc_package_tag,
-                and_(
-                    Package.id == date_range_inc_package_tag.package_id,
-                    date_range_inc_package_tag.tag_id == ODPPackageTag.DATERANGEINC
+        timestamp = datetime.now(timezone.utc)
+        today = date.today().isoformat()
+
+        date_range_tag = aliased(PackageTag)
+        date_range_inc_tag = aliased(PackageTag)
+        increments = func.jsonb_each_text(date_range_inc_tag.data).table_valued('key', 'value')
+
+        invalid_increments = Session.execute(
+            select(date_range_inc_tag.package_id).
+            where(date_range_inc_tag.tag_id == ODPPackageTag.DATERANGEINC).
+            where(exists(
+                select(increments.c.key).
+                where(increments.c.value != ODPDateRangeIncType.CURRENT_DATE)
+            ))
+        ).scalars().all()
+        for package_id in invalid_increments:
+            logger.error(f'Date range increment failed for package {package_id}: Invalid date range increment type')
+
+        # mapping of each date type to be incremented to today's date
+        incremented_dates = (
+            select(func.coalesce(
+                func.jsonb_object_agg(increments.c.key, func.to_jsonb(cast(today, String))),
+                cast({}, JSONB),
+            )).
+            where(increments.c.value == ODPDateRangeIncType.CURRENT_DATE).
+            scalar_subquery()
+        )
+
+        incremented = (
+            select(
+                date_range_tag.id,
+                date_range_tag.data.op('||')(incremented_dates).label('data'),
+            ).
+            join(date_range_inc_tag, and_(
+                date_range_inc_tag.package_id == date_range_tag.package_id,
+                date_range_inc_tag.tag_id == ODPPackageTag.DATERANGEINC,
+            )).
+            where(date_range_tag.tag_id == ODPPackageTag.DATERANGE).
+            where(date_range_tag.package_id.not_in(invalid_increments)).
+            cte('incremented')
+        )
+
+        package_tag = PackageTag.__table__
+        updated_tags = (
+            update(package_tag).
+            where(package_tag.c.id == incremented.c.id).
+            where(package_tag.c.data != incremented.c.data).
+            values(data=incremented.c.data, timestamp=timestamp).
+            returning(
+                package_tag.c.id,
+                package_tag.c.package_id,
+                package_tag.c.tag_id,
+                package_tag.c.user_id,
+                package_tag.c.data,
+                package_tag.c.keyword_id,
+            ).
+            cte('updated_tags')
+        )
+
+        package = Package.__table__
+        updated_packages = (
+            update(package).
+            where(package.c.id.in_(select(updated_tags.c.package_id))).
+            values(timestamp=timestamp).
+            returning(package.c.id).
+            cte('updated_packages')
+        )
+
+        package_tag_audit = PackageTagAudit.__table__
+        audit_records = (
+            insert(package_tag_audit).
+            from_select(
+                ['client_id', 'user_id', 'command', 'timestamp',
+                 '_id', '_package_id', '_tag_id', '_user_id', '_data', '_keyword_id'],
+                select(
+                    literal(__name__),
+                    null(),
+                    literal(AuditCommand.update, package_tag_audit.c.command.type),
+                    literal(timestamp, package_tag_audit.c.timestamp.type),
+                    updated_tags.c.id,
+                    updated_tags.c.package_id,
+                    updated_tags.c.tag_id,
+                    updated_tags.c.user_id,
+                    updated_tags.c.data,
+                    updated_tags.c.keyword_id,
                 )
-            )
+            ).
+            returning(package_tag_audit.c.id).
+            cte('audit_records')
         )
 
-        for (package, date_range_package_tag, date_range_inc_package_tag) in Session.execute(stmt).all():
-            try:
-                date_range_data = self._get_updated_date_range_data(date_range_package_tag.data,
-                                                                    date_range_inc_package_tag)
-                self._update_date_range_package_tag(date_range_package_tag, date_range_data, package)
-            except Exception as e:
-                logger.error(f'Date range increment failed for package {package.id}: {str(e)}')
-
-    @staticmethod
-    def _get_updated_date_range_data(date_range_package_tag_data, date_range_inc_package_tag) -> dict:
-        date_range_data = copy.deepcopy(date_range_package_tag_data)
-        # Iterate through the date range increment types and update the corresponding date range dates.
-        for (date_type, increment_type) in date_range_inc_package_tag.data.items():
-
-            match increment_type:
-                case ODPDateRangeIncType.CURRENT_DATE:
-                    date_range_data[date_type] = date.today().isoformat()
-                case _:
-                    raise ValueError("Invalid date range increment type")
-
-        return date_range_data
-
-    @staticmethod
-    def _update_date_range_package_tag(date_range_package_tag, updated_data, package):
-        # Save the changes and update the timestamps.
-        date_range_package_tag.data = updated_data
-        date_range_package_tag.timestamp = (timestamp := datetime.now(timezone.utc))
-        date_range_package_tag.save()
-
-        package.timestamp = timestamp
-        package.save()
+        result = Session.execute(
+            select(updated_tags.c.package_id, updated_tags.c.data).
+            add_cte(updated_packages, audit_records)
+        ).all()
+
+        for package_id, data in result:
+            logger.info(f'Date range incremented for package {package_id}: {data}')
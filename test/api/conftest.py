@@ -1,3 +1,4 @@
+import re
 from collections import namedtuple
 
 import pytest
@@ -5,6 +6,7 @@ from starlette.testclient import TestClient
 
 import migrate.systemdata
 import odp.api.main
+from odp.api.routers.client import invalidate_hydra_client_cache
 from odp.config import config
 from odp.const import ODPScope
 from odp.const.db import TagCardinality
@@ -113,15 +115,36 @@ def hydra_admin_api():
     Hydra test server.
 
     A dummy Hydra client is created to correspond with the ODP test client,
-    and all Hydra clients are deleted following the test.
+    and all Hydra clients are deleted following the test. The API's Hydra
+    client cache is invalidated on either side of the test.
     """
     try:
         hapi = HydraAdminAPI(config.HYDRA.ADMIN.URL)
         hapi.create_or_update_client('odp.test.client', name='foo', secret=None, scope_ids=['bar'], grant_types=[])
+        invalidate_hydra_client_cache()
         yield hapi
     finally:
         for hydra_client in hapi.list_clients():
             hapi.delete_client(hydra_client.id)
+        invalidate_hydra_client_cache()
+
+
+@pytest.fixture
+def query_count():
+    """Fixture returning a function that makes a GET request using an API
+    test client, and returns the response together with the number of SQL
+    statements executed in handling the request, as collected by
+    `odp.lib.sqlstats` and reported in the Server-Timing header.
+    Example usage::
+
+        r, count = query_count(api(scopes), '/collection/', size=0)
+    """
+
+    def get(client: TestClient, url: str, **params):
+        r = client.get(url, params=params)
+        return r, int(re.search(r'desc="(\d+) queries"', r.headers['Server-Timing']).group(1))
+
+    return get
 
 
 @pytest.fixture(params=[
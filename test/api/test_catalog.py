@@ -1,16 +1,22 @@
+import gzip
+import json
 import os
 from copy import copy, deepcopy
-from datetime import datetime
+from datetime import date, datetime, time, timedelta, timezone
 from random import randint
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import select, update
 
 import migrate.systemdata
+from odp.api.lib.resolver import _load as load_landing_pages, clear_resolver_cache
+from odp.api.lib.utils import output_published_record_model, published_record_json
+from odp.api.routers.catalog import RecordLookupResult
+from odp.catalog import _affected_record_ids
 from odp.catalog.mims import MIMSCatalog
 from odp.catalog.saeon import SAEONCatalog
 from odp.const import ODPScope
-from odp.db.models import Catalog, Tag
+from odp.db.models import Catalog, CatalogRecord, Tag
 from test import TestSession, datacite4_example, isequal, iso19115_example, ris_example
 from test.api.assertions import assert_forbidden, assert_new_timestamp, assert_not_found, assert_redirect
 from test.factories import CatalogFactory, CollectionTagFactory, FactorySession, RecordFactory, RecordTagFactory
@@ -70,6 +76,7 @@ def create_example_record(
         tag_record_qc,
         tag_record_retracted,
         schema_id=None,
+        identifiers=None,
 ):
     """Create and return a single record instance,
     with valid (example) metadata, optionally with collection and/or
@@ -77,6 +84,8 @@ def create_example_record(
     kwargs = dict(use_example_metadata=True)
     if schema_id:
         kwargs |= dict(schema_id=schema_id)
+    if identifiers:
+        kwargs |= dict(identifiers=identifiers)
 
     record = RecordFactory(**kwargs)
 
@@ -179,6 +188,7 @@ def test_redirect_to(
         static_publishing_data, catalog_id,
         tag_collection_published,
 ):
+    clear_resolver_cache()
     catalog = FactorySession.get(Catalog, catalog_id)
     example_record = create_example_record(
         tag_collection_published,
@@ -204,6 +214,52 @@ def test_redirect_to(
         assert_not_found(r)
 
 
+def test_resolver_update(static_publishing_data, catalog_id):
+    retracted, renamed = [create_example_record(True, 'MIMS', True, None, identifiers='both') for _ in range(2)]
+    landing_pages = load_landing_pages(catalog_id, None)
+    for record in retracted, renamed:
+        assert landing_pages.paths[record.id] == landing_pages.paths[record.doi.lower()] == record.doi
+
+    RecordTagFactory.create(
+        tag=FactorySession.get(Tag, ('Record.Retracted', 'record')),
+        record=retracted,
+    )
+    retracted.timestamp = datetime.now(timezone.utc)
+    old_doi, renamed.doi = renamed.doi, f'{renamed.doi}.v2'
+    renamed.metadata_ = renamed.metadata_ | {'doi': renamed.doi}
+    renamed.timestamp = datetime.now(timezone.utc)
+    FactorySession.commit()
+    {'SAEON': SAEONCatalog, 'MIMS': MIMSCatalog}[catalog_id](catalog_id).publish()
+
+    # the map is updated in place, rather than rebuilt
+    assert load_landing_pages(catalog_id, landing_pages) is landing_pages
+    assert retracted.id not in landing_pages.paths
+    assert retracted.doi.lower() not in landing_pages.paths
+    assert landing_pages.paths[renamed.id] == landing_pages.paths[renamed.doi.lower()] == renamed.doi
+    assert old_doi.lower() not in landing_pages.paths
+
+
+
+def test_resolver_update_late_record(static_publishing_data, catalog_id):
+    """A record whose change was stamped during one publishing run, before the
+    catalog timestamp set at the end of that run, but which was published only
+    by the next run, is picked up by an incremental update."""
+    create_example_record(True, 'MIMS', True, None, identifiers='both')
+    landing_pages = load_landing_pages(catalog_id, None)
+    catalog_timestamp = TestSession.get(Catalog, catalog_id).timestamp
+    assert landing_pages.record_timestamp < catalog_timestamp
+
+    late = create_example_record(True, 'MIMS', True, None, identifiers='both')
+    TestSession.execute(
+        update(CatalogRecord).
+        where(CatalogRecord.record_id == late.id).
+        values(timestamp=landing_pages.record_timestamp + (catalog_timestamp - landing_pages.record_timestamp) / 2)
+    )
+    TestSession.commit()
+
+    assert load_landing_pages(catalog_id, landing_pages) is landing_pages
+    assert landing_pages.paths[late.id] == landing_pages.paths[late.doi.lower()] == late.doi
+
 schema_uris = {
     'SAEON.DataCite4': 'https://odp.saeon.ac.za/schema/metadata/saeon/datacite4',
     'SAEON.ISO19115': 'https://odp.saeon.ac.za/schema/metadata/saeon/iso19115',
@@ -387,6 +443,8 @@ def test_get_published_record(
     ('SAEON.ISO19115', '/extent/geographicElements/0/boundingPolygon/0/polygon/2', {
         "longitude": 18.24, "latitude": -34.18
     }),
+    ('SAEON.DataCite4', '/titles/9/title', None),
+    ('SAEON.ISO19115', '/title/nonexistent', None),
 ])
 @pytest.mark.require_scope(ODPScope.CATALOG_READ)
 def test_get_published_metadata_value(
@@ -455,3 +513,152 @@ def test_get_published_metadata_document(
 
     assert r.status_code == 200
     assert r.json() == expected_document
+
+
+@pytest.mark.require_scope(ODPScope.CATALOG_READ)
+def test_lookup_published_records(
+        api, scopes,
+        static_publishing_data, catalog_id,
+):
+    authorized = ODPScope.CATALOG_READ in scopes
+    published_records = [create_example_record(True, 'MIMS', True, None) for _ in range(3)]
+    retracted_record = create_example_record(True, 'MIMS', True, True)
+
+    identifiers = [
+        record.doi.swapcase() if record.doi else record.id
+        for record in published_records + [retracted_record]
+    ]
+    identifiers += [unknown_doi := '10.12345/unknown']
+
+    r = api(scopes).post(f'/catalog/{catalog_id}/records/lookup', json=identifiers)
+
+    if not authorized:
+        assert_forbidden(r)
+        return
+
+    assert r.status_code == 200
+    result = r.json()
+    assert [item['id'] for item in result['items']] == [record.id for record in published_records]
+    assert result['not_found'] == identifiers[-2:]
+    assert result['not_found'][-1] == unknown_doi
+
+
+def test_lookup_published_records_result(
+        api,
+        static_publishing_data, catalog_id,
+):
+    records = [create_example_record(True, 'MIMS', True, None, identifiers='both') for _ in range(2)]
+    client = api([ODPScope.CATALOG_READ])
+
+    # the second record is requested by both DOI and UUID
+    r = client.post(f'/catalog/{catalog_id}/records/lookup', json=[
+        records[1].doi, records[0].id, records[1].id, records[0].doi.upper(),
+    ])
+
+    assert r.status_code == 200
+    result = r.json()
+    assert result.keys() == RecordLookupResult.__fields__.keys()
+    RecordLookupResult.parse_obj(result)
+    assert result['items'] == [
+        client.get(f'/catalog/{catalog_id}/records/{record.id}').json()
+        for record in (records[1], records[0])
+    ]
+    assert result['not_found'] == []
+
+
+@pytest.mark.parametrize('accept_encoding', ['gzip', 'identity'])
+def test_get_published_record_encoding(
+        api,
+        static_publishing_data, catalog_id,
+        accept_encoding,
+):
+    example_record = create_example_record(True, 'MIMS', True, None)
+    route = f'/catalog/{catalog_id}/records/{example_record.id}'
+    client = api([ODPScope.CATALOG_READ])
+
+    r = client.get(route, headers={'Accept-Encoding': accept_encoding})
+    assert r.status_code == 200
+    assert r.headers.get('Content-Encoding') == (accept_encoding if accept_encoding == 'gzip' else None)
+
+    # both encodings must serve exactly the stored, compressed bytes
+    published_record_gzip = TestSession.execute(
+        select(CatalogRecord.published_record_gzip).
+        where(CatalogRecord.catalog_id == catalog_id).
+        where(CatalogRecord.record_id == example_record.id)
+    ).scalar_one()
+    assert r.content == gzip.decompress(published_record_gzip)
+    assert r.json()['id'] == example_record.id
+
+
+@pytest.mark.parametrize('temporal_start', [
+    None,
+    datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+    datetime(2020, 1, 2, 3, 4, 5, 120000, tzinfo=timezone(timedelta(hours=-3, minutes=-30))),
+])
+def test_published_record_json(static_publishing_data, catalog_id, temporal_start):
+    """Published record JSON serialized by the database must match the
+    response model serialization that it stands in for."""
+    example_record = create_example_record(True, 'MIMS', True, None)
+    FactorySession.execute(
+        update(CatalogRecord).
+        where(CatalogRecord.catalog_id == catalog_id).
+        where(CatalogRecord.record_id == example_record.id).
+        values(temporal_start=temporal_start)
+    )
+    FactorySession.commit()
+
+    catalog_record, record_json = TestSession.execute(
+        select(CatalogRecord, published_record_json()).
+        where(CatalogRecord.catalog_id == catalog_id).
+        where(CatalogRecord.record_id == example_record.id)
+    ).one()
+
+    assert catalog_record.published
+    assert json.loads(record_json) == json.loads(output_published_record_model(catalog_record).json())
+
+
+def test_embargo_reevaluation(static_publishing_data):
+    today = date.today()
+    record = create_example_record(True, None, True, None)
+    RecordTagFactory.create(
+        tag=FactorySession.get(Tag, ('Record.Embargo', 'record')),
+        record=record,
+        data={'start': (today + timedelta(days=10)).isoformat(), 'end': (today + timedelta(days=20)).isoformat()},
+    )
+    record.timestamp = datetime.now(timezone.utc)
+    FactorySession.commit()
+
+    catalog = SAEONCatalog('SAEON')
+    assert record.id in (record_id for record_id, _ in catalog._select_records())
+    catalog.publish()
+
+    catalog_record = TestSession.get(CatalogRecord, ('SAEON', record.id))
+    assert catalog_record.published
+    assert catalog_record.next_reevaluation == datetime.combine(today + timedelta(days=10), time()).astimezone(timezone.utc)
+
+    # not re-selected until the embargo starts
+    assert record.id not in (record_id for record_id, _ in catalog._select_records())
+
+    catalog_record.next_reevaluation = datetime.now(timezone.utc)
+    TestSession.commit()
+    assert record.id in (record_id for record_id, _ in catalog._select_records())
+
+
+def test_select_records_by_id(static_publishing_data):
+    records = [create_example_record(True, None, True, None) for _ in range(2)]
+    for record in records:
+        record.timestamp = datetime.now(timezone.utc)
+    FactorySession.commit()
+
+    catalog = SAEONCatalog('SAEON')
+    assert [record_id for record_id, _ in catalog._select_records({records[0].id})] == [records[0].id]
+    assert {record_id for record_id, _ in catalog._select_records()} >= {record.id for record in records}
+
+
+def test_affected_record_ids():
+    records = RecordFactory.create_batch(3)
+    assert _affected_record_ids({
+        f'record:{records[0].id}',
+        f'collection:{records[1].collection_id}',
+        f'provider:{records[2].collection.provider_id}',
+    }) == {record.id for record in records}
@@ -1,10 +1,13 @@
 from enum import Enum
+from types import SimpleNamespace
 from random import choice, randint, sample
 from urllib.parse import urljoin
 
 import pytest
 from sqlalchemy import select
 
+import odp.api.routers.client as client_router
+from odp.api.routers.client import HYDRA_CLIENT_CACHE_TTL, get_hydra_clients, invalidate_hydra_client_cache
 from odp.const import ODPScope
 from odp.const.hydra import GrantType, ResponseType, TokenEndpointAuthMethod
 from odp.db.models import Client
@@ -272,3 +275,88 @@ def test_delete_client_not_found(api, client_batch):
     r = api(scopes).delete('/client/foo')
     assert_not_found(r)
     assert_db_state(client_batch)
+
+
+@pytest.fixture
+def hydra_client_fetches(monkeypatch):
+    """Record the ids of clients fetched individually from Hydra by the API."""
+    fetches = []
+    get_client = client_router.hydra_admin_api.get_client
+
+    def recording_get_client(client_id):
+        fetches.append(client_id)
+        return get_client(client_id)
+
+    monkeypatch.setattr(client_router.hydra_admin_api, 'get_client', recording_get_client)
+    return fetches
+
+
+def test_hydra_client_cache(client_batch, hydra_client_fetches, monkeypatch):
+    client_ids = [client.id for client in client_batch]
+
+    # cache miss: uncached clients are fetched
+    hydra_clients = get_hydra_clients(client_ids)
+    assert sorted(hydra_client_fetches) == sorted(client_ids)
+    for client in client_batch:
+        assert hydra_clients[client.id].name == client.hydra_config['name']
+
+    # cache hit: nothing is fetched
+    hydra_client_fetches.clear()
+    assert get_hydra_clients(client_ids[:2]).keys() == set(client_ids[:2])
+    assert hydra_client_fetches == []
+
+    # TTL expiry: all clients are re-fetched
+    now = client_router.time.monotonic()
+    monkeypatch.setattr(client_router, 'time', SimpleNamespace(monotonic=lambda: now + HYDRA_CLIENT_CACHE_TTL + 1))
+    get_hydra_clients(client_ids)
+    assert sorted(hydra_client_fetches) == sorted(client_ids)
+
+    # invalidation: all clients are re-fetched
+    hydra_client_fetches.clear()
+    invalidate_hydra_client_cache()
+    get_hydra_clients(client_ids)
+    assert sorted(hydra_client_fetches) == sorted(client_ids)
+
+
+def test_hydra_client_cache_invalidated_on_update(api, client_batch):
+    client = client_batch[0]
+    r = api([ODPScope.CLIENT_READ]).get(f'/client/{client.id}')
+    assert r.json()['name'] == client.hydra_config['name']
+
+    r = api([ODPScope.CLIENT_ADMIN]).put('/client/', json=(client_in := dict(
+        id=client.id,
+        scope_ids=scope_ids(client),
+        provider_specific=client.provider_specific,
+        provider_id=client.provider_id,
+        **fake_hydra_client_config(),
+    )))
+    assert_ok_null(r)
+
+    r = api([ODPScope.CLIENT_READ]).get(f'/client/{client.id}')
+    assert r.json()['name'] == client_in['name']
+
+
+@pytest.mark.parametrize('change', ['create', 'update', 'delete'])
+def test_hydra_client_cache_invalidated_on_change(api, client_batch, change):
+    client_ids = [client.id for client in client_batch]
+    get_hydra_clients(client_ids)
+    assert set(client_ids) <= client_router._hydra_clients.keys()
+
+    client = client_build() if change == 'create' else client_batch[0]
+    client_in = dict(
+        id=client.id,
+        scope_ids=scope_ids(client),
+        provider_specific=client.provider_specific,
+        provider_id=client.provider_id,
+        **fake_hydra_client_config(),
+    )
+    if change == 'create':
+        r = api([ODPScope.CLIENT_ADMIN]).post('/client/', json=client_in)
+    elif change == 'update':
+        r = api([ODPScope.CLIENT_ADMIN]).put('/client/', json=client_in)
+    else:
+        r = api([ODPScope.CLIENT_ADMIN]).delete(f'/client/{client.id}')
+    assert_ok_null(r)
+
+    # all cached clients are discarded
+    assert client_router._hydra_clients == {}
@@ -7,7 +7,7 @@ import pytest
 from sqlalchemy import select
 
 from odp.const import DOI_REGEX, ODPScope
-from odp.db.models import Collection, CollectionAudit, User
+from odp.db.models import Collection, CollectionAudit, CollectionTag, CollectionTagAudit, User
 from test import TestSession
 from test.api import all_scopes, all_scopes_excluding
 from test.api.assertions import assert_conflict, assert_forbidden, assert_new_timestamp, assert_not_found, assert_ok_null, assert_unprocessable
@@ -639,3 +639,57 @@ def test_untag_collection(api, collection_batch, admin_route, scopes, collection
 
     assert_db_state(collection_batch)
     assert_no_audit_log()
+
+
+@pytest.mark.require_scope(ODPScope.COLLECTION_FREEZE)  # scope associated with the generic tag
+@pytest.mark.parametrize('tag_cardinality', ['one', 'user', 'multi'])
+def test_tag_collection_batch(api, collection_batch, scopes, tag_cardinality):
+    authorized = ODPScope.COLLECTION_FREEZE in scopes
+    client = api(scopes)
+    tag = new_generic_tag('collection', tag_cardinality)
+    collection_ids = [collection.id for collection in collection_batch]
+    tag_instance_in = dict(
+        tag_id=tag.id,
+        data={'comment': 'test'},
+        cardinality=tag_cardinality,
+        public=tag.public,
+    ) | keyword_tag_args(tag.vocabulary, 0)
+
+    r = client.post('/collection/tag/batch', json=dict(tag_instance_in=tag_instance_in, collection_ids=collection_ids))
+
+    if authorized:
+        assert r.status_code == 200
+        assert sorted(ti['id'] for ti in r.json()) == sorted(TestSession.execute(select(CollectionTag.id)).scalars())
+        assert sorted(TestSession.execute(select(CollectionTag.collection_id)).scalars()) == sorted(collection_ids)
+        assert sorted(TestSession.execute(select(CollectionTagAudit._collection_id)).scalars()) == sorted(collection_ids)
+        for collection in TestSession.execute(select(Collection)).scalars():
+            assert_new_timestamp(collection.timestamp)
+
+        # re-applying the same tag changes nothing unless multiple instances are allowed
+        r = client.post('/collection/tag/batch', json=dict(tag_instance_in=tag_instance_in, collection_ids=collection_ids))
+        assert r.status_code == 200
+        assert len(r.json()) == (len(collection_ids) if tag_cardinality == 'multi' else 0)
+
+        r = client.post('/collection/untag/batch', json=dict(tag_id=tag.id, collection_ids=collection_ids))
+        assert_ok_null(r)
+        assert TestSession.execute(select(CollectionTag)).first() is None
+        deleted = TestSession.execute(
+            select(CollectionTagAudit).where(CollectionTagAudit.command == 'delete')
+        ).scalars().all()
+        assert len(deleted) == len(collection_ids) * (2 if tag_cardinality == 'multi' else 1)
+    else:
+        assert_forbidden(r)
+        assert TestSession.execute(select(CollectionTag)).first() is None
+        assert_tag_instance_audit_log_empty('collection')
+
+
+def test_tag_collection_batch_not_found(api, collection_batch):
+    scopes = [ODPScope.COLLECTION_FREEZE]
+    tag = new_generic_tag('collection', 'multi')
+    r = api(scopes).post('/collection/tag/batch', json=dict(
+        tag_instance_in=dict(tag_id=tag.id, data={}) | keyword_tag_args(tag.vocabulary, 0),
+        collection_ids=[collection_batch[0].id, 'foo'],
+    ))
+    assert_not_found(r)
+    assert TestSession.execute(select(CollectionTag)).first() is None
+    assert_tag_instance_audit_log_empty('collection')
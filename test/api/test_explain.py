@@ -0,0 +1,135 @@
+import pytest
+from sqlalchemy import event, select
+
+import odp.db
+from odp.const import ODPScope
+from odp.db.models import CatalogRecordFacet, Vocabulary
+from test import TestSession
+from test.api.test_catalog import create_example_record, static_publishing_data
+from test.factories import ArchiveFactory, ArchiveResourceFactory, RecordFactory, ResourceFactory
+
+LARGE_TABLES = {
+    'catalog_record',
+    'catalog_record_facet',
+    'counter_delta',
+    'keyword',
+    'package',
+    'published_record',
+    'record',
+    'record_tag',
+    'resource',
+}
+"""Tables that grow with the volume of data, and must never be
+sequentially scanned by API read queries."""
+
+MAX_PLAN_COST = 10_000
+"""Upper bound on the estimated total cost of any statement's plan
+against the seeded test data; a guard against pathological plans
+(cartesian products, repeated subplans, etc.)."""
+
+EXPLAIN_ROUTES = [
+    '/archive/',
+    '/catalog/',
+    '/catalog/SAEON/records',
+    '/catalog/SAEON/records/{record_id}',
+    '/catalog/SAEON/search?text_query=ocean',
+    '/catalog/SAEON/search?text_query=ocean&sort=rank%20desc',
+    '/catalog/SAEON/search?facet_query={facet_query}',
+    '/catalog/SAEON/search?north_bound=-20&south_bound=-35&east_bound=35&west_bound=15',
+    '/catalog/SAEON/search?start_date=2000-01-01&end_date=2020-12-31',
+    '/collection/',
+    '/provider/',
+    '/record/?collection_id={collection_id}',
+    '/record/?parent_id={record_id}',
+    '/record/?identifier_q=test',
+    '/record/?title_q=ocean',
+    '/keyword/{vocabulary_id}/',
+    '/resource/?provider_id={provider_id}',
+    '/vocabulary/',
+]
+
+
+@pytest.fixture
+def seeded_data(static_publishing_data):
+    """Create published catalog records, unpublished records and resources,
+    and return values for substitution into `EXPLAIN_ROUTES`."""
+    records = [create_example_record(True, None, True, None) for _ in range(3)]
+    RecordFactory.create_batch(5)
+    resources = ResourceFactory.create_batch(5)
+    # leave counter deltas pending, so that list routes of counted objects
+    # (archives, catalogs, collections, providers, vocabularies) sum them
+    ArchiveResourceFactory.create_batch(5, archive=ArchiveFactory())
+
+    facet = TestSession.execute(select(CatalogRecordFacet)).scalars().first()
+    return dict(
+        record_id=records[0].id,
+        collection_id=records[0].collection_id,
+        facet_query=f'{{"{facet.facet}": "{facet.value}"}}' if facet else '{}',
+        vocabulary_id=TestSession.execute(select(Vocabulary.id)).scalars().first(),
+        provider_id=resources[0].package.provider_id,
+    )
+
+
+@pytest.fixture
+def captured_statements():
+    """Capture SELECT statements, with their parameters, as
+    executed by the ODP engine."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().lower().startswith(('select', 'with')):
+            statements.append((statement, parameters))
+
+    event.listen(odp.db.engine, 'before_cursor_execute', capture)
+    try:
+        yield statements
+    finally:
+        event.remove(odp.db.engine, 'before_cursor_execute', capture)
+
+
+def explain(statement, parameters, **settings):
+    """Return the EXPLAIN (FORMAT JSON) plan for a statement,
+    with the given planner settings applied."""
+    with odp.db.engine.connect() as conn:
+        for name, value in settings.items():
+            conn.exec_driver_sql(f'set local {name} = {value}')
+        plan = conn.exec_driver_sql(f'explain (format json) {statement}', parameters).scalar_one()
+        conn.rollback()
+
+    return plan[0]['Plan']
+
+
+def plan_nodes(node):
+    yield node
+    for child in node.get('Plans', ()):
+        yield from plan_nodes(child)
+
+
+@pytest.mark.parametrize('route', EXPLAIN_ROUTES)
+def test_explain(api, seeded_data, captured_statements, route):
+    client = api([
+        ODPScope.ARCHIVE_READ,
+        ODPScope.CATALOG_READ,
+        ODPScope.CATALOG_SEARCH,
+        ODPScope.COLLECTION_READ,
+        ODPScope.KEYWORD_READ,
+        ODPScope.PROVIDER_READ,
+        ODPScope.RECORD_READ,
+        ODPScope.RESOURCE_READ,
+        ODPScope.VOCABULARY_READ,
+    ])
+    captured_statements.clear()
+
+    r = client.get(route.format(**seeded_data))
+    assert r.status_code == 200
+    assert captured_statements
+
+    for statement, parameters in captured_statements:
+        # seeded tables are tiny, so the planner would rightly prefer sequential
+        # scans; disabling them reveals whether a usable index exists at all
+        for node in plan_nodes(explain(statement, parameters, enable_seqscan='off')):
+            assert not (node['Node Type'] == 'Seq Scan' and node['Relation Name'] in LARGE_TABLES), \
+                f'Seq Scan on {node["Relation Name"]}:\n{statement}'
+
+        cost = explain(statement, parameters)['Total Cost']
+        assert cost <= MAX_PLAN_COST, f'Plan cost {cost} exceeds {MAX_PLAN_COST}:\n{statement}'
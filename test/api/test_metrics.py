@@ -0,0 +1,20 @@
+import pytest
+
+from odp.const import ODPScope
+from test.api.assertions import assert_forbidden
+
+
+@pytest.mark.require_scope(ODPScope.CLIENT_READ)
+def test_get_metrics(api, scopes):
+    authorized = ODPScope.CLIENT_READ in scopes
+    client = api(scopes)
+    assert client.get('/status/').status_code == 200
+
+    r = client.get('/metrics')
+
+    if authorized:
+        assert r.status_code == 200
+        assert r.headers['Content-Type'].startswith('text/plain')
+        assert 'odp_api_requests_total{method="GET",route="/status/",status="200"}' in r.text
+    else:
+        assert_forbidden(r)
@@ -0,0 +1,121 @@
+import pytest
+
+from odp.const import ODPScope
+from test.factories import (
+    ArchiveResourceFactory,
+    CollectionFactory,
+    CollectionTagFactory,
+    PackageFactory,
+    PackageTagFactory,
+    ProviderFactory,
+    RecordFactory,
+    RecordTagFactory,
+    RoleFactory,
+    ScopeFactory,
+    UserFactory,
+)
+
+ROW_COUNTS = 1, 10, 100
+"""Numbers of rows for which each list endpoint is exercised."""
+
+QUERY_BUDGETS = {
+    '/archive/': 10,
+    '/collection/': 15,
+    '/package/': 15,
+    '/package/all/': 15,
+    '/provider/': 10,
+    '/provider/all/': 10,
+    '/record/': 20,
+    '/resource/': 10,
+    '/resource/all/': 10,
+    '/role/': 10,
+    '/scope/': 10,
+    '/user/': 10,
+}
+"""Maximum number of SQL statements per request, including those executed
+for authorization, for each list endpoint. The number of statements must
+furthermore not vary with the number of rows returned."""
+
+
+def create_archives(n):
+    ArchiveResourceFactory.create_batch(n)
+
+
+def create_collections(n):
+    for collection in CollectionFactory.create_batch(n):
+        CollectionTagFactory(collection=collection)
+        RoleFactory(collection_specific=True, collections=[collection])
+
+
+def create_packages(n):
+    for package in PackageFactory.create_batch(n):
+        PackageTagFactory(package=package)
+        ArchiveResourceFactory.create_batch(2, resource__package=package)
+
+
+def create_providers(n):
+    CollectionFactory.create_batch(n)
+
+
+def create_records(n):
+    for record in RecordFactory.create_batch(n):
+        RecordTagFactory(record=record)
+        CollectionTagFactory(collection=record.collection)
+
+
+def create_resources(n):
+    ArchiveResourceFactory.create_batch(n)
+
+
+def create_roles(n):
+    RoleFactory.create_batch(
+        n,
+        scopes=ScopeFactory.create_batch(2),
+        collection_specific=True,
+        collections=CollectionFactory.create_batch(2),
+    )
+
+
+def create_scopes(n):
+    ScopeFactory.create_batch(n)
+
+
+def create_users(n):
+    users = UserFactory.create_batch(n, roles=RoleFactory.create_batch(2))
+    ProviderFactory(users=users)
+
+
+LIST_ENDPOINTS = [
+    ('/archive/', ODPScope.ARCHIVE_READ, create_archives),
+    ('/collection/', ODPScope.COLLECTION_READ, create_collections),
+    ('/package/', ODPScope.PACKAGE_READ, create_packages),
+    ('/package/all/', ODPScope.PACKAGE_READ_ALL, create_packages),
+    ('/provider/', ODPScope.PROVIDER_READ, create_providers),
+    ('/provider/all/', ODPScope.PROVIDER_READ_ALL, create_providers),
+    ('/record/', ODPScope.RECORD_READ, create_records),
+    ('/resource/', ODPScope.RESOURCE_READ, create_resources),
+    ('/resource/all/', ODPScope.RESOURCE_READ_ALL, create_resources),
+    ('/role/', ODPScope.ROLE_READ, create_roles),
+    ('/scope/', ODPScope.SCOPE_READ, create_scopes),
+    ('/user/', ODPScope.USER_READ, create_users),
+]
+
+
+@pytest.mark.parametrize('url, scope, create_data', LIST_ENDPOINTS)
+def test_list_query_budget(api, query_count, url, scope, create_data):
+    client = api([scope])
+    client.get(url)  # warm up any per-process caches
+
+    rows = 0
+    counts = {}
+    for row_count in ROW_COUNTS:
+        create_data(row_count - rows)
+        rows = row_count
+
+        r, counts[row_count] = query_count(client, url, size=0)
+        assert r.status_code == 200
+        assert r.json()['total'] >= row_count
+        assert counts[row_count] <= QUERY_BUDGETS[url], \
+            f'{url}: {counts[row_count]} queries for {row_count} rows exceeds budget of {QUERY_BUDGETS[url]}'
+
+    assert len(set(counts.values())) == 1, f'{url}: query count varies with number of rows: {counts}'
@@ -1,12 +1,20 @@
+import asyncio
+import threading
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from random import randint
 
+import httpx
 import pytest
 from sqlalchemy import select
 
+import odp.api.lib.schema
+import odp.api.main
+from odp.api.lib.schema import SCHEMA_EVALUATION_INLINE_NODES
+from odp.api.routers.record import touch_records
 from odp.const import ODPCollectionTag, ODPScope
-from odp.db.models import CollectionTag, PublishedRecord, Record, RecordAudit, RecordTag, User
+from odp.db import Session
+from odp.db.models import CollectionTag, PublishedRecord, Record, RecordAudit, RecordTag, RecordTagAudit, User
 from test import TestSession
 from test.api import all_scopes, all_scopes_excluding
 from test.api.assertions import assert_conflict, assert_forbidden, assert_new_timestamp, assert_not_found, assert_ok_null, assert_unprocessable
@@ -124,7 +132,7 @@ def record_ident(request):
     return request.param
 
 
-@pytest.fixture(params=[None, 'parent_id'])  # todo: this can be expanded
+@pytest.fixture(params=[None, 'parent_id', 'identifier_q'])  # todo: this can be expanded
 def record_list_filter(request):
     return request.param
 
@@ -237,6 +245,14 @@ def test_list_records(api, record_batch, scopes, collection_constraint, record_l
             lambda rec: rec.parent_id == parent_id,
             expected_result_batch
         ))
+    elif record_list_filter == 'identifier_q':
+        params |= dict(
+            identifier_q=(id_term := (record_batch[2].doi or record_batch[2].sid).upper())
+        )
+        expected_result_batch = list(filter(
+            lambda rec: any(id_term.lower() in (ident or '').lower() for ident in (rec.id, rec.doi, rec.sid)),
+            expected_result_batch
+        ))
 
     r = api(scopes, user_collections=authorized_collections).get('/record/', params=params)
 
@@ -249,6 +265,23 @@ def test_list_records(api, record_batch, scopes, collection_constraint, record_l
     assert_no_audit_log()
 
 
+@pytest.mark.parametrize('title_q, expected', [
+    ('ocean', {0, 1}),
+    ('OCEAN temperature', {0}),
+    ('rain', {2}),
+    ('title', set()),
+])
+def test_list_records_title_q(api, title_q, expected):
+    records = [
+        RecordFactory(schema_id='SAEON.DataCite4', metadata_={'titles': [{'title': 'Ocean Temperature Records'}]}),
+        RecordFactory(schema_id='SAEON.ISO19115', metadata_={'title': 'Ocean salinity survey'}),
+        RecordFactory(schema_id='SAEON.DataCite4', metadata_={'titles': [{'title': 'Rainfall'}]}),
+    ]
+    r = api([ODPScope.RECORD_READ]).get('/record/', params=dict(title_q=title_q))
+    assert r.status_code == 200
+    assert {item['id'] for item in r.json()['items']} == {records[n].id for n in expected}
+
+
 @pytest.mark.require_scope(ODPScope.RECORD_READ)
 def test_get_record(api, record_batch, scopes, collection_constraint, record_ident):
     authorized = ODPScope.RECORD_READ in scopes and collection_constraint in ('collection_any', 'collection_match')
@@ -1050,3 +1083,247 @@ def test_untag_record(api, record_batch_no_tags, admin_route, scopes, collection
 
     assert_db_state(record_batch_no_tags)
     assert_no_audit_log()
+
+
+@pytest.mark.require_scope(ODPScope.RECORD_QC)
+@pytest.mark.parametrize('tag_cardinality', ['one', 'user', 'multi'])
+def test_tag_record_batch(api, record_batch_no_tags, scopes, tag_cardinality):
+    authorized = ODPScope.RECORD_QC in scopes
+    client = api(scopes)
+    tag = new_generic_tag('record', tag_cardinality)
+    record_ids = [record.id for record in record_batch_no_tags]
+    tag_instance_in = dict(
+        tag_id=tag.id,
+        data={'comment': 'test'},
+        cardinality=tag_cardinality,
+        public=tag.public,
+    ) | keyword_tag_args(tag.vocabulary, 0)
+
+    r = client.post('/record/tag/batch', json=dict(tag_instance_in=tag_instance_in, record_ids=record_ids))
+
+    if authorized:
+        assert r.status_code == 200
+        assert sorted(ti['id'] for ti in r.json()) == sorted(TestSession.execute(select(RecordTag.id)).scalars())
+        assert sorted(TestSession.execute(select(RecordTag.record_id)).scalars()) == sorted(record_ids)
+        assert sorted(TestSession.execute(select(RecordTagAudit._record_id)).scalars()) == sorted(record_ids)
+        for record in TestSession.execute(select(Record)).scalars():
+            assert_new_timestamp(record.timestamp)
+
+        # re-applying the same tag changes nothing unless multiple instances are allowed
+        r = client.post('/record/tag/batch', json=dict(tag_instance_in=tag_instance_in, record_ids=record_ids))
+        assert r.status_code == 200
+        assert len(r.json()) == (len(record_ids) if tag_cardinality == 'multi' else 0)
+
+        r = client.post('/record/untag/batch', json=dict(tag_id=tag.id, record_ids=record_ids))
+        assert_ok_null(r)
+        assert TestSession.execute(select(RecordTag)).first() is None
+        deleted = TestSession.execute(
+            select(RecordTagAudit).where(RecordTagAudit.command == 'delete')
+        ).scalars().all()
+        assert len(deleted) == len(record_ids) * (2 if tag_cardinality == 'multi' else 1)
+    else:
+        assert_forbidden(r)
+        assert TestSession.execute(select(RecordTag)).first() is None
+        assert_tag_instance_audit_log_empty('record')
+
+
+def test_tag_record_batch_not_found(api, record_batch_no_tags):
+    scopes = [ODPScope.RECORD_QC]
+    tag = new_generic_tag('record', 'multi')
+    r = api(scopes).post('/record/tag/batch', json=dict(
+        tag_instance_in=dict(tag_id=tag.id, data={}) | keyword_tag_args(tag.vocabulary, 0),
+        record_ids=[record_batch_no_tags[0].id, 'foo'],
+    ))
+    assert_not_found(r)
+    assert TestSession.execute(select(RecordTag)).first() is None
+    assert_tag_instance_audit_log_empty('record')
+
+
+def test_untag_record_batch_touches_untagged_parents(api):
+    tag = new_generic_tag('record', 'multi')
+    tagged, untagged = RecordFactory(parent=RecordFactory()), RecordFactory(parent=RecordFactory())
+    RecordTagFactory(record=tagged, tag=tag)
+    parent_timestamps = {
+        record.parent_id: TestSession.get(Record, record.parent_id).timestamp
+        for record in (tagged, untagged)
+    }
+
+    r = api([ODPScope.RECORD_ADMIN]).post('/record/admin/untag/batch', json=dict(
+        tag_id=tag.id,
+        record_ids=[tagged.id, untagged.id],
+    ))
+    assert_ok_null(r)
+
+    # only the parent of a record that actually lost a tag instance is touched
+    TestSession.expire_all()
+    assert TestSession.get(Record, tagged.parent_id).timestamp > parent_timestamps[tagged.parent_id]
+    assert TestSession.get(Record, untagged.parent_id).timestamp == parent_timestamps[untagged.parent_id]
+
+
+@pytest.mark.require_scope(ODPScope.RECORD_ADMIN)
+def test_admin_set_record_batch(api, record_batch_with_ids, scopes):
+    authorized = ODPScope.RECORD_ADMIN in scopes
+
+    updated, unchanged, conflicting = record_batch_with_ids[:3]
+    new_record = record_build(identifiers='sid')
+    records_in = [
+        dict(id=updated.id, doi=updated.doi, sid=updated.sid, collection_id=updated.collection_id,
+             schema_id=updated.schema_id, metadata=updated.metadata_ | {'foo': 'bar'}),
+        dict(id=unchanged.id, doi=unchanged.doi, sid=unchanged.sid, collection_id=unchanged.collection_id,
+             schema_id=unchanged.schema_id, metadata=unchanged.metadata_),
+        dict(sid=new_record.sid, collection_id=new_record.collection_id,
+             schema_id=new_record.schema_id, metadata=new_record.metadata_),
+        dict(sid=conflicting.sid, collection_id=new_record.collection_id,
+             schema_id=new_record.schema_id, metadata=new_record.metadata_),
+    ]
+
+    r = api(scopes).post('/record/admin/batch', json=records_in)
+
+    if authorized:
+        assert r.status_code == 200
+        results = r.json()
+        assert [result['status'] for result in results] == ['updated', 'unchanged', 'created', 'failed']
+        assert results[0]['id'] == updated.id
+        assert results[1]['id'] == unchanged.id
+        assert results[3]['error'] == 'SID is already in use'
+
+        updated.metadata_ = records_in[0]['metadata']
+        new_record.id = results[2]['id']
+        assert_db_state(record_batch_with_ids + [new_record])
+
+        audit_log = TestSession.execute(select(RecordAudit).order_by(RecordAudit._id)).scalars().all()
+        assert sorted((row._id, row.command) for row in audit_log) == \
+               sorted([(updated.id, 'update'), (new_record.id, 'insert')])
+    else:
+        assert_forbidden(r)
+        assert_db_state(record_batch_with_ids)
+        assert_no_audit_log()
+
+
+def test_admin_set_record_batch_duplicate_id(api, record_batch_with_ids):
+    record = record_batch_with_ids[0]
+    records_in = [
+        dict(id=record.id, doi=record.doi, sid=record.sid, collection_id=record.collection_id,
+             schema_id=record.schema_id, metadata=record.metadata_ | {'foo': n})
+        for n in ('bar', 'baz')
+    ]
+
+    r = api([ODPScope.RECORD_ADMIN]).post('/record/admin/batch', json=records_in)
+
+    assert r.status_code == 200
+    results = r.json()
+    assert [result['status'] for result in results] == ['updated', 'failed']
+    assert results[1] == dict(id=record.id, status='failed', error='Duplicate record id in batch')
+
+    record.metadata_ = records_in[0]['metadata']
+    assert_db_state(record_batch_with_ids)
+
+    audit_log = TestSession.execute(select(RecordAudit)).scalars().all()
+    assert [(row._id, row.command) for row in audit_log] == [(record.id, 'update')]
+
+
+def test_admin_set_record_batch_parent_doi_change(api, record_batch_with_ids):
+    parent = record_batch_with_ids[0]
+    old_doi, new_doi = parent.doi, f'{parent.doi}.v2'
+    orphan = record_build(identifiers='doi', parent_doi=old_doi)
+    child = record_build(identifiers='doi', parent_doi=new_doi)
+
+    # children precede the parent's DOI change in the batch
+    records_in = [
+        dict(doi=orphan.doi, collection_id=orphan.collection_id,
+             schema_id=orphan.schema_id, metadata=orphan.metadata_),
+        dict(doi=child.doi, collection_id=child.collection_id,
+             schema_id=child.schema_id, metadata=child.metadata_),
+        dict(id=parent.id, doi=new_doi, sid=parent.sid, collection_id=parent.collection_id,
+             schema_id=parent.schema_id, metadata=parent.metadata_ | {'doi': new_doi}),
+    ]
+
+    r = api([ODPScope.RECORD_ADMIN]).post('/record/admin/batch', json=records_in)
+
+    assert r.status_code == 200
+    results = r.json()
+    assert [result['status'] for result in results] == ['failed', 'created', 'updated']
+    assert results[0]['error'] == f'Record not found for parent DOI {old_doi}'
+
+    result = TestSession.execute(select(Record.doi, Record.parent_id).where(Record.id == results[1]['id'])).one()
+    assert result.doi == child.doi
+    assert result.parent_id == parent.id
+    assert TestSession.execute(select(Record.doi).where(Record.id == parent.id)).scalar_one() == new_doi
+    assert TestSession.execute(select(Record).where(Record.doi == orphan.doi)).first() is None
+
+
+def test_overlapping_requests(api, record_batch_with_ids, monkeypatch):
+    """A request that awaits the evaluation of a large document keeps its own
+    session, while an overlapping request runs and disposes of its session."""
+    record = record_batch_with_ids[0]
+    client = api([ODPScope.RECORD_ADMIN, ODPScope.RECORD_READ])
+    route = f'/record/admin/{record.id}'
+    record_in = dict(doi=record.doi, sid=record.sid, collection_id=record.collection_id,
+                     schema_id=record.schema_id, metadata=record.metadata_)
+
+    # a schema is evaluated inline the first time
+    assert client.put(route, json=record_in).status_code == 200
+
+    evaluation_started = threading.Event()
+    other_request_done = threading.Event()
+    evaluate_schema = odp.api.lib.schema._evaluate_schema
+
+    def wait_then_evaluate(*args):
+        evaluation_started.set()
+        assert other_request_done.wait(10)
+        # the record loaded by this request remains in its session
+        assert any(isinstance(obj, Record) and obj.id == record.id for obj in Session().identity_map.values())
+        return evaluate_schema(*args)
+
+    monkeypatch.setattr(odp.api.lib.schema, '_evaluate_schema', wait_then_evaluate)
+
+    async def overlap():
+        async with httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=odp.api.main.app),
+                base_url=str(client.base_url),
+                headers=client.headers,
+        ) as async_client:
+            async def other_request():
+                assert await asyncio.to_thread(evaluation_started.wait, 10)
+                r = await async_client.get('/record/foo')
+                other_request_done.set()
+                return r
+
+            return await asyncio.gather(
+                async_client.put(route, json=record_in | dict(metadata=record.metadata_ | {
+                    'foo': list(range(SCHEMA_EVALUATION_INLINE_NODES)),
+                })),
+                other_request(),
+            )
+
+    r, r_other = asyncio.run(overlap())
+
+    assert_not_found(r_other)
+    assert r.status_code == 200
+    assert len(r.json()['metadata']['foo']) == SCHEMA_EVALUATION_INLINE_NODES
+    assert len(TestSession.get(Record, record.id).metadata_['foo']) == SCHEMA_EVALUATION_INLINE_NODES
+
+
+@pytest.mark.parametrize('is_cyclic', [False, True])
+def test_touch_records(is_cyclic):
+    grandparent = RecordFactory()
+    parent = RecordFactory(parent=grandparent)
+    child = RecordFactory(parent=parent)
+    unrelated = RecordFactory()
+    if is_cyclic:
+        grandparent.parent_id = child.id
+        FactorySession.commit()
+
+    touched = touch_records([parent.id], timestamp := datetime.now(timezone.utc))
+    Session.commit()
+
+    expected_ids = {parent.id, grandparent.id} | ({child.id} if is_cyclic else set())
+    assert set(touched) == expected_ids
+
+    result = TestSession.execute(select(Record.id, Record.timestamp)).all()
+    for row in result:
+        if row.id in expected_ids:
+            assert row.timestamp == timestamp
+        else:
+            assert row.timestamp < timestamp
+    assert unrelated.id in {row.id for row in result}
@@ -0,0 +1,326 @@
+"""Synthetic-data benchmarks for publishing, catalog search, paging and record writes.
+
+The benchmarks generate a production-like data set using the test factories -
+records with example DataCite / ISO19115 metadata (varied per record), parent/child
+hierarchies, collection and record tags, and the resulting catalog records and
+facets - and time the operations that dominate ODP server load. Results are
+emitted as JSON, for comparison across upgrades.
+
+Run with `bin/benchmark`, against a database initialized with `bin/migrate`.
+"""
+import asyncio
+import statistics
+import time
+from copy import deepcopy
+from datetime import date, datetime, timedelta, timezone
+from random import randint, random, sample, uniform
+from typing import Any, Callable
+from uuid import uuid4
+
+from jschon import URI
+from sqlalchemy import func, select, text, update
+
+from odp.api.lib.auth import Authorized
+from odp.api.lib.paging import Paginator
+from odp.api.models import RecordModelIn
+from odp.api.routers.catalog import SearchResultSort, list_records, search_records
+from odp.api.routers.record import RecordBatchItemIn, _create_record, admin_set_record_batch
+from odp.catalog.mims import MIMSCatalog
+from odp.catalog.saeon import SAEONCatalog
+from odp.const import ODPCatalog, ODPCollectionTag, ODPRecordTag, ODPScope
+from odp.db import Session
+from odp.db.models import CatalogRecord, CatalogRecordFacet, Collection, Record, Schema, Tag
+from odp.lib.schema import schema_catalog
+from odp.version import VERSION
+from test.factories import CollectionFactory, CollectionTagFactory, FactorySession, RecordFactory, RecordTagFactory, fake
+
+SUBJECTS = [
+    'ocean', 'temperature', 'salinity', 'biodiversity', 'rainfall', 'vegetation',
+    'estuary', 'fisheries', 'climate', 'soil', 'hydrology', 'atmosphere',
+    'sediment', 'plankton', 'wetland', 'grassland', 'fynbos', 'savanna',
+    'groundwater', 'chlorophyll', 'wind', 'carbon', 'nutrients', 'coastline',
+]
+"""Keyword pool, giving search terms and facet values a realistic distribution."""
+
+RECORDS_PER_COLLECTION = 50
+
+CATALOGS = {
+    ODPCatalog.SAEON: SAEONCatalog,
+    ODPCatalog.MIMS: MIMSCatalog,
+}
+"""Catalogs to publish. The DataCite catalog is excluded, since it
+synchronizes with an external service."""
+
+SEARCH_MIXES = {
+    'text': dict(text_query='ocean temperature'),
+    'text_rank': dict(text_query='climate', sort=SearchResultSort.RANK_DESC),
+    'spatial': dict(north_bound=-22.0, south_bound=-35.0, east_bound=33.0, west_bound=16.0),
+    'temporal': dict(start_date=date(2000, 1, 1), end_date=date(2010, 12, 31)),
+    'combined': dict(text_query='estuary', north_bound=-22.0, south_bound=-35.0, east_bound=33.0, west_bound=16.0,
+                     start_date=date(2000, 1, 1), end_date=date(2020, 12, 31)),
+}
+
+_search_defaults = dict(
+    text_query=None,
+    facet_query=None,
+    north_bound=None,
+    south_bound=None,
+    east_bound=None,
+    west_bound=None,
+    start_date=None,
+    end_date=None,
+    exclusive_region=False,
+    exclusive_interval=False,
+    page=1,
+    size=50,
+    sort=SearchResultSort.TIMESTAMP_DESC,
+)
+
+_auth = Authorized(
+    client_id='odp.benchmark',
+    user_id=None,
+    scope=ODPScope.RECORD_ADMIN,
+    object_ids='*',
+)
+
+_loop = asyncio.new_event_loop()
+
+
+def generate_data(n_records: int) -> None:
+    """Create `n_records` records, in collections of RECORDS_PER_COLLECTION,
+    with tags that make most (but not all) of them publishable."""
+    collections = []
+    for _ in range(max(1, n_records // RECORDS_PER_COLLECTION)):
+        collection = CollectionFactory()
+        if random() < 0.9:
+            CollectionTagFactory(
+                tag=FactorySession.get(Tag, (ODPCollectionTag.PUBLISHED, 'collection')),
+                collection=collection,
+            )
+        if random() < 0.3:
+            CollectionTagFactory(
+                tag=FactorySession.get(Tag, (ODPCollectionTag.INFRASTRUCTURE, 'collection')),
+                collection=collection,
+                data={'infrastructure': 'MIMS'},
+            )
+        collections += [collection]
+
+    parents = []
+    for n in range(n_records):
+        kwargs = dict(collection=collections[n % len(collections)], use_example_metadata=True)
+        if parents and random() < 0.2:
+            parent = sample(parents, 1)[0]
+            kwargs |= dict(identifiers='doi', parent=parent, parent_doi=parent.doi)
+        elif random() < 0.1:
+            kwargs |= dict(identifiers='doi')
+
+        record = RecordFactory(**kwargs)
+        record.metadata_ = _vary_metadata(deepcopy(record.metadata_))
+        if record.doi and not record.parent_id:
+            parents += [record]
+
+        if random() < 0.95:
+            RecordTagFactory(
+                tag=FactorySession.get(Tag, (ODPRecordTag.QC, 'record')),
+                record=record,
+                data={'pass_': random() < 0.95},
+            )
+        if random() < 0.02:
+            RecordTagFactory(
+                tag=FactorySession.get(Tag, (ODPRecordTag.RETRACTED, 'record')),
+                record=record,
+            )
+
+    FactorySession.commit()
+
+
+def _vary_metadata(metadata: dict[str, Any]) -> dict[str, Any]:
+    """Vary the searchable and indexed parts of example metadata, so that
+    full text, facet, spatial and temporal indexes have realistic selectivity."""
+    if titles := metadata.get('titles'):
+        titles[0]['title'] = fake.sentence(nb_words=8)
+    elif 'title' in metadata:
+        metadata['title'] = fake.sentence(nb_words=8)
+
+    if descriptions := metadata.get('descriptions'):
+        descriptions[0]['description'] = f'{fake.paragraph(nb_sentences=5)} {" ".join(sample(SUBJECTS, 3))}.'
+
+    if 'subjects' in metadata:
+        metadata['subjects'] = [{'subject': subject} for subject in sample(SUBJECTS, randint(1, 5))]
+
+    for geo_location in metadata.get('geoLocations', []):
+        if box := geo_location.get('geoLocationBox'):
+            west, south = round(uniform(10.0, 38.0), 4), round(uniform(-40.0, -18.0), 4)
+            box |= dict(
+                westBoundLongitude=west,
+                eastBoundLongitude=round(west + uniform(0.0, 5.0), 4),
+                southBoundLatitude=south,
+                northBoundLatitude=round(south + uniform(0.0, 5.0), 4),
+            )
+
+    for date_ in metadata.get('dates', []):
+        if date_.get('dateType') == 'Valid':
+            start = fake.date_between('-30y', '-1y')
+            date_['date'] = f'{start}/{start + timedelta(days=randint(1, 3650))}'
+
+    return metadata
+
+
+def timed(name: str, func_: Callable[[], Any], repeat: int) -> dict[str, Any]:
+    """Run `func_` `repeat` times, discarding any session state between
+    runs, and return timing statistics in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func_()
+        times += [time.perf_counter() - start]
+        Session.remove()
+
+    return dict(
+        name=name,
+        repeat=repeat,
+        min=min(times),
+        median=statistics.median(times),
+        mean=statistics.fmean(times),
+        max=max(times),
+    )
+
+
+def bench_publish(repeat: int) -> list[dict[str, Any]]:
+    """Time a full (initial) publish, a publish with 1% of records changed,
+    and a publish with nothing to do, for each catalog."""
+    def publish(catalog_id):
+        CATALOGS[catalog_id](catalog_id).publish()
+        Session.commit()
+
+    def publish_all():
+        for catalog_id in CATALOGS:
+            publish(catalog_id)
+
+    def publish_changed():
+        Session.execute(
+            update(Record).
+            where(func.random() < 0.01).
+            values(timestamp=datetime.now(timezone.utc))
+        )
+        Session.commit()
+        publish_all()
+
+    results = []
+    for catalog_id in CATALOGS:
+        results += [timed(f'publish.full.{catalog_id}', lambda: publish(catalog_id), 1)]
+
+    results += [timed('publish.changed_1pc', publish_changed, repeat)]
+    results += [timed('publish.unchanged', publish_all, repeat)]
+
+    return results
+
+
+def bench_search(repeat: int) -> list[dict[str, Any]]:
+    facet = Session.execute(
+        select(CatalogRecordFacet.facet, CatalogRecordFacet.value).
+        where(CatalogRecordFacet.catalog_id == ODPCatalog.SAEON).
+        group_by(CatalogRecordFacet.facet, CatalogRecordFacet.value).
+        order_by(func.count().desc()).
+        limit(1)
+    ).first()
+    Session.remove()
+
+    mixes = SEARCH_MIXES
+    if facet:
+        mixes = mixes | dict(facet=dict(facet_query={facet.facet: facet.value}))
+
+    results = []
+    for mix, kwargs in mixes.items():
+        results += [timed(f'search.{mix}', lambda: _loop.run_until_complete(
+            search_records(ODPCatalog.SAEON, **(_search_defaults | kwargs))
+        ), repeat)]
+
+    return results
+
+
+def bench_paging(repeat: int) -> list[dict[str, Any]]:
+    total = Session.execute(
+        select(func.count()).
+        where(CatalogRecord.catalog_id == ODPCatalog.SAEON).
+        where(CatalogRecord.published)
+    ).scalar_one()
+    Session.remove()
+
+    size = 50
+    last_page = max(1, -(-total // size))
+    pages = sorted({1, min(10, last_page), min(100, last_page), last_page})
+
+    return [
+        timed(f'paging.page_{page}', lambda: _loop.run_until_complete(list_records(
+            ODPCatalog.SAEON,
+            include_nonsearchable=False,
+            include_retracted=False,
+            updated_since=None,
+            paginator=Paginator(page=page, size=size, sort='timestamp'),
+        )), repeat)
+        for page in pages
+    ]
+
+
+def bench_record_writes(repeat: int, batch_size: int = 100) -> list[dict[str, Any]]:
+    """Time single record creates and batch record creates,
+    each committed."""
+    collection_id = Session.execute(select(Collection.id).limit(1)).scalar_one()
+    schema_id = 'SAEON.DataCite4'
+    schema_uri = Session.get(Schema, (schema_id, 'metadata')).uri
+    metadata = Session.execute(
+        select(Record.metadata_).where(Record.schema_id == schema_id).limit(1)
+    ).scalar_one()
+    metadata.pop('doi', None)
+    metadata.pop('relatedIdentifiers', None)
+    Session.remove()
+
+    def create_record():
+        _loop.run_until_complete(_create_record(
+            RecordModelIn(sid=f'benchmark-{uuid4()}', collection_id=collection_id,
+                          schema_id=schema_id, metadata=metadata),
+            schema_catalog.get_schema(URI(schema_uri)),
+            _auth,
+            True,
+        ))
+        Session.commit()
+
+    def create_record_batch():
+        _loop.run_until_complete(admin_set_record_batch([
+            RecordBatchItemIn(sid=f'benchmark-{uuid4()}', collection_id=collection_id,
+                              schema_id=schema_id, metadata=metadata)
+            for _ in range(batch_size)
+        ], _auth))
+        Session.commit()
+
+    return [
+        timed('record.create', create_record, repeat),
+        timed(f'record.create_batch_{batch_size}', create_record_batch, repeat),
+    ]
+
+
+def run_benchmarks(n_records: int, repeat: int, generate: bool = True) -> dict[str, Any]:
+    """Optionally generate data, then run all benchmarks, returning
+    the results together with details of the environment."""
+    if generate:
+        start = time.perf_counter()
+        generate_data(n_records)
+        generate_time = time.perf_counter() - start
+    else:
+        generate_time = None
+
+    results = []
+    results += bench_publish(repeat)
+    results += bench_search(repeat)
+    results += bench_paging(repeat)
+    results += bench_record_writes(repeat)
+
+    return dict(
+        timestamp=datetime.now(timezone.utc).isoformat(),
+        version=VERSION,
+        postgres=Session.execute(text('show server_version')).scalar_one(),
+        records=Session.execute(select(func.count()).select_from(Record)).scalar_one(),
+        generate_time=generate_time,
+        results=results,
+    )
@@ -0,0 +1,99 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import insert, text
+
+from odp.db.models import RecordAudit
+from odp.svc.audit.partition import create_partition, detach_partitions
+from test import TestSession
+
+table = RecordAudit.__table__
+
+
+def insert_audit_rows(*timestamps):
+    TestSession.execute(insert(RecordAudit), [
+        dict(
+            client_id='test',
+            command='insert',
+            timestamp=timestamp,
+            _id=f'record-{n}',
+            _metadata={},
+            _collection_id='collection',
+            _schema_id='schema',
+        ) for n, timestamp in enumerate(timestamps)
+    ])
+    TestSession.commit()
+
+
+def count_rows(relation):
+    return TestSession.execute(text(f'select count(*) from {relation}')).scalar()
+
+
+def partitions():
+    return set(TestSession.execute(text(
+        'select c.relname from pg_inherits i '
+        'join pg_class c on c.oid = i.inhrelid '
+        'join pg_class p on p.oid = i.inhparent '
+        "where p.relname = 'record_audit'"
+    )).scalars())
+
+
+@pytest.fixture
+def drop_tables():
+    """Drop the named tables after the test."""
+    names = []
+    yield names
+    for name in names:
+        TestSession.execute(text(f'drop table if exists {name}'))
+    TestSession.commit()
+
+
+def test_create_partition(drop_tables):
+    drop_tables += ['record_audit_2091_05']
+    insert_audit_rows(
+        datetime(2091, 5, 1, tzinfo=timezone.utc),
+        datetime(2091, 5, 31, 23, 59, tzinfo=timezone.utc),
+        datetime(2091, 6, 1, tzinfo=timezone.utc),
+    )
+    assert count_rows('record_audit_default') == 3
+
+    create_partition(table, date(2091, 5, 1))
+
+    # rows for the month are moved out of the default partition,
+    # which is re-attached
+    assert {'record_audit_2091_05', 'record_audit_default'} <= partitions()
+    assert count_rows('record_audit_2091_05') == 2
+    assert count_rows('record_audit_default') == 1
+    assert count_rows('record_audit') == 3
+
+    # new rows are routed to the new partition
+    insert_audit_rows(datetime(2091, 5, 15, tzinfo=timezone.utc))
+    assert count_rows('record_audit_2091_05') == 3
+
+    # no-op if the partition exists
+    create_partition(table, date(2091, 5, 1))
+    assert count_rows('record_audit_2091_05') == 3
+
+
+def test_create_partition_without_default_rows(drop_tables):
+    drop_tables += ['record_audit_2092_01']
+    create_partition(table, date(2092, 1, 1))
+    assert {'record_audit_2092_01', 'record_audit_default'} <= partitions()
+    assert count_rows('record_audit_2092_01') == 0
+
+
+def test_detach_partitions(drop_tables):
+    drop_tables += ['record_audit_2001_01', 'record_audit_2001_02', 'record_audit_2001_03']
+    for month in 1, 2, 3:
+        create_partition(table, date(2001, month, 1))
+    insert_audit_rows(datetime(2001, 1, 15, tzinfo=timezone.utc))
+
+    assert detach_partitions(date(2001, 3, 1)) == ['record_audit_2001_01', 'record_audit_2001_02']
+
+    assert 'record_audit_2001_01' not in partitions()
+    assert 'record_audit_2001_02' not in partitions()
+    assert 'record_audit_2001_03' in partitions()
+
+    # detached partitions remain as standalone tables
+    assert count_rows('record_audit_2001_01') == 1
+    assert count_rows('record_audit') == 0
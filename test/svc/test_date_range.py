@@ -0,0 +1,97 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from odp.const import ODPDateRangeIncType, ODPPackageTag, ODPTagSchema
+from odp.db.models import Package, PackageTag, PackageTagAudit
+from odp.svc.package.date_range import DateRangeIncModule
+from test import TestSession
+from test.factories import PackageFactory, PackageTagFactory, SchemaFactory, TagFactory
+
+yesterday = datetime.now(timezone.utc) - timedelta(days=1)
+
+
+@pytest.fixture
+def date_range_tags():
+    """Create and return the date range and date range increment tags."""
+    return tuple(
+        TagFactory(
+            id=tag_id,
+            type='package',
+            cardinality='one',
+            is_keyword_tag=False,
+            schema=SchemaFactory(id=schema_id, uri=f'https://odp.saeon.ac.za/schema/tag/{uri_name}', type='tag'),
+        )
+        for tag_id, schema_id, uri_name in (
+            (ODPPackageTag.DATERANGE, ODPTagSchema.DATERANGE, 'daterange'),
+            (ODPPackageTag.DATERANGEINC, ODPTagSchema.DATERANGEINC, 'daterangeinc'),
+        )
+    )
+
+
+def create_package(date_range_tags, date_range, date_range_inc):
+    """Create a package, timestamped yesterday, with date range and date
+    range increment tags, and return it with its date range tag."""
+    date_range_tag, date_range_inc_tag = date_range_tags
+    package = PackageFactory(timestamp=yesterday)
+    package_tag = PackageTagFactory(package=package, tag=date_range_tag, data=date_range, timestamp=yesterday)
+    PackageTagFactory(package=package, tag=date_range_inc_tag, data=date_range_inc, timestamp=yesterday)
+    return package, package_tag
+
+
+def assert_date_range(package, package_tag, date_range, changed):
+    result = TestSession.execute(
+        select(Package.timestamp, PackageTag.data, PackageTag.timestamp.label('tag_timestamp')).
+        join(PackageTag).
+        where(PackageTag.id == package_tag.id)
+    ).one()
+    assert result.data == date_range
+    if changed:
+        assert result.timestamp > yesterday
+        assert result.tag_timestamp == result.timestamp
+    else:
+        assert result.timestamp == yesterday
+        assert result.tag_timestamp == yesterday
+
+
+def test_date_range_inc(date_range_tags, caplog):
+    today = date.today().isoformat()
+    incremented = create_package(
+        date_range_tags,
+        {'start': '1990-01-01', 'end': '2000-01-01'},
+        {'end': ODPDateRangeIncType.CURRENT_DATE},
+    )
+    current = create_package(
+        date_range_tags,
+        {'start': '1990-01-01', 'end': today},
+        {'end': ODPDateRangeIncType.CURRENT_DATE},
+    )
+    invalid = create_package(
+        date_range_tags,
+        {'start': '1990-01-01', 'end': '2000-01-01'},
+        {'start': ODPDateRangeIncType.CURRENT_DATE, 'end': 'foo'},
+    )
+
+    DateRangeIncModule().run()
+
+    # increments are applied
+    assert_date_range(*incremented, {'start': '1990-01-01', 'end': today}, True)
+
+    # tags whose dates don't change are not rewritten
+    assert_date_range(*current, {'start': '1990-01-01', 'end': today}, False)
+
+    # invalid increment types are skipped and logged
+    assert_date_range(*invalid, {'start': '1990-01-01', 'end': '2000-01-01'}, False)
+    assert f'Date range increment failed for package {invalid[0].id}: Invalid date range increment type' in caplog.messages
+
+    # one audit row is written per changed tag
+    audit_log = TestSession.execute(select(PackageTagAudit)).scalars().all()
+    assert len(audit_log) == 1
+    assert audit_log[0].command == 'update'
+    assert audit_log[0].client_id == 'odp.svc.package.date_range'
+    assert audit_log[0].user_id is None
+    assert audit_log[0]._id == incremented[1].id
+    assert audit_log[0]._package_id == incremented[0].id
+    assert audit_log[0]._tag_id == ODPPackageTag.DATERANGE
+    assert audit_log[0]._data == {'start': '1990-01-01', 'end': today}
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from odp.db.models import ArchiveResource, Resource
+from odp.lib.archive import ArchiveAdapter
+from odp.svc.archive import file_purge
+from odp.svc.archive.file_purge import FilePurgeModule
+from test import TestSession
+from test.factories import ArchiveFactory, ArchiveResourceFactory, ResourceFactory
+
+
+class FakeArchiveAdapter(ArchiveAdapter):
+    """Archive adapter that records deletes and their concurrency."""
+
+    def __init__(self):
+        super().__init__(None, None)
+        self.deleted = []
+        self.active = 0
+        self.max_active = 0
+
+    async def delete(self, path):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.deleted += [path]
+        self.active -= 1
+
+
+@pytest.fixture
+def archive_adapters(monkeypatch):
+    """Replace archive adapters with fakes, returning a dict of
+    fake adapters keyed by archive id."""
+    adapters = {}
+    monkeypatch.setattr(ArchiveAdapter, 'get_instance', classmethod(
+        lambda cls, archive: adapters.setdefault(archive.id, FakeArchiveAdapter())
+    ))
+    return adapters
+
+
+@pytest.fixture
+def commit_count(monkeypatch):
+    """Count commits of the ODP session."""
+    commits = []
+    commit = file_purge.Session.commit
+    monkeypatch.setattr(file_purge.Session, 'commit', lambda: commits.append(1) or commit())
+    return commits
+
+
+def create_archived_resources(archives, n, status):
+    resources = ResourceFactory.create_batch(n, status=status)
+    for resource in resources:
+        for archive in archives:
+            ArchiveResourceFactory(archive=archive, resource=resource)
+    return resources
+
+
+def test_purge_batches(monkeypatch, archive_adapters, commit_count):
+    monkeypatch.setattr(file_purge, 'BATCH_SIZE', 3)
+    archives = ArchiveFactory.create_batch(2)
+    purged = create_archived_resources(archives, 7, 'delete_pending')
+    kept = create_archived_resources(archives, 2, 'active')
+
+    FilePurgeModule().exec()
+
+    assert len(commit_count) == 3
+    assert set(TestSession.execute(select(Resource.id)).scalars()) == {r.id for r in kept}
+    assert set(TestSession.execute(select(ArchiveResource.resource_id)).scalars()) == {r.id for r in kept}
+    for archive in archives:
+        assert len(archive_adapters[archive.id].deleted) == len(purged)
+
+
+def test_purge_archive_concurrency(monkeypatch, archive_adapters):
+    monkeypatch.setattr(file_purge, 'ARCHIVE_CONCURRENCY', 2)
+    archives = ArchiveFactory.create_batch(2)
+    create_archived_resources(archives, 6, 'delete_pending')
+
+    FilePurgeModule().exec()
+
+    for archive in archives:
+        assert len(archive_adapters[archive.id].deleted) == 6
+        assert archive_adapters[archive.id].max_active == 2
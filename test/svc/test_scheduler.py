@@ -0,0 +1,155 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy import func, select
+
+import odp.svc
+from odp.db import engine
+from odp.svc import SCHEDULER_LOCK_ID, ServiceModule, _lead, _run_exclusive, _schedule
+
+
+class CountingModule(ServiceModule):
+    def __init__(self, interval):
+        self.interval = interval
+        self.runs = 0
+
+    def exec(self):
+        self.runs += 1
+
+
+class FastModule(CountingModule):
+    pass
+
+
+class BlockingModule(CountingModule):
+    def __init__(self, interval):
+        super().__init__(interval)
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def exec(self):
+        super().exec()
+        self.started.set()
+        self.release.wait(5)
+
+
+class SlowModule(CountingModule):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def fast_polling(monkeypatch):
+    monkeypatch.setattr(odp.svc, 'SCHEDULER_POLL_INTERVAL', 0.1)
+    monkeypatch.setattr(odp.svc, 'SCHEDULER_MIN_WAIT', 0.05)
+
+
+def try_lock(conn, *key):
+    acquired = conn.scalar(select(func.pg_try_advisory_lock(*key)))
+    conn.commit()
+    return acquired
+
+
+def unlock(conn, *key):
+    conn.scalar(select(func.pg_advisory_unlock(*key)))
+    conn.commit()
+
+
+def run_in_thread(target, *args):
+    thread = threading.Thread(target=target, args=args, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_lead_acquire_release():
+    module = FastModule(3600)
+    shutdown = threading.Event()
+    leader = run_in_thread(_lead, {'test': [module]}, shutdown)
+    time.sleep(0.5)
+
+    with engine.connect() as conn:
+        # another process cannot acquire leadership while the leader is active
+        assert not try_lock(conn, SCHEDULER_LOCK_ID)
+        assert module.runs == 1
+
+        shutdown.set()
+        leader.join(5)
+        assert not leader.is_alive()
+
+        # leadership is released on shutdown
+        assert try_lock(conn, SCHEDULER_LOCK_ID)
+        unlock(conn, SCHEDULER_LOCK_ID)
+
+
+def test_lead_not_acquired():
+    module = FastModule(3600)
+    with engine.connect() as conn:
+        assert try_lock(conn, SCHEDULER_LOCK_ID)
+        try:
+            # returns immediately, without running services, if another process is the leader
+            _lead({'test': [module]}, threading.Event())
+            assert module.runs == 0
+        finally:
+            unlock(conn, SCHEDULER_LOCK_ID)
+
+
+def test_lead_concurrent():
+    modules = [FastModule(3600), FastModule(3600)]
+    shutdown = threading.Event()
+    leaders = [run_in_thread(_lead, {'test': [module]}, shutdown) for module in modules]
+    time.sleep(0.5)
+    shutdown.set()
+    for leader in leaders:
+        leader.join(5)
+        assert not leader.is_alive()
+
+    # only one of two competing schedulers leads, and runs services
+    assert sorted(module.runs for module in modules) == [0, 1]
+
+
+def test_schedule_intervals():
+    fast_module = FastModule(0.2)
+    slow_module = SlowModule(3600)
+    stop = threading.Event()
+    thread = run_in_thread(_schedule, [fast_module, slow_module], stop)
+    time.sleep(1.1)
+    stop.set()
+    thread.join(5)
+
+    assert 4 <= fast_module.runs <= 6
+    assert slow_module.runs == 1
+
+
+def test_schedule_skips_module_running_elsewhere():
+    module = FastModule(0.1)
+    with engine.connect() as conn:
+        assert try_lock(conn, SCHEDULER_LOCK_ID, func.hashtext('FastModule'))
+        try:
+            stop = threading.Event()
+            thread = run_in_thread(_schedule, [module], stop)
+            time.sleep(0.5)
+            stop.set()
+            thread.join(5)
+            assert module.runs == 0
+        finally:
+            unlock(conn, SCHEDULER_LOCK_ID, func.hashtext('FastModule'))
+
+
+def test_run_exclusive_concurrent():
+    running_module = BlockingModule(3600)
+    thread = run_in_thread(_run_exclusive, running_module)
+    assert running_module.started.wait(5)
+
+    # a run of the same module, e.g. under a new leader, is skipped while the first is in progress
+    other_module = BlockingModule(3600)
+    other_module.release.set()
+    _run_exclusive(other_module)
+    assert other_module.runs == 0
+
+    running_module.release.set()
+    thread.join(5)
+    assert running_module.runs == 1
+
+    # the module lock is released once the run completes
+    _run_exclusive(other_module)
+    assert other_module.runs == 1
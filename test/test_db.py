@@ -1,8 +1,12 @@
+from datetime import datetime, timezone
 from random import randint
 
-from sqlalchemy import select
+from sqlalchemy import delete, func, insert, select, text, update
+from sqlalchemy.orm import Session
 
 import migrate.systemdata
+import odp.db
+from odp.catalog import PUBLISH_CHANNEL
 from odp.const import ODPScope, ODPSystemRole
 from odp.const.db import ScopeType
 from odp.db.models import (
@@ -12,6 +16,7 @@ from odp.db.models import (
     ClientScope,
     Collection,
     CollectionTag,
+    CounterDelta,
     Keyword,
     Package,
     PackageTag,
@@ -30,6 +35,7 @@ from odp.db.models import (
     UserRole,
     Vocabulary,
 )
+from odp.svc.counter.compact import CounterCompactModule
 from test import TestSession
 from test.factories import (
     ArchiveFactory,
@@ -417,3 +423,82 @@ def test_create_vocabulary():
                vocabulary.schema_type,
                vocabulary.static,
            )
+
+
+def test_maintain_counts():
+    def record_counts():
+        return dict(TestSession.execute(select(Collection.id, Collection.record_count)).all())
+
+    collection_1, collection_2 = CollectionFactory.create_batch(2)
+    records = RecordFactory.create_batch(3, collection=collection_1)
+    package = PackageFactory(provider=collection_1.provider)
+    assert record_counts() == {collection_1.id: 3, collection_2.id: 0}
+    assert TestSession.get(Provider, collection_1.provider_id).package_count == 1
+
+    TestSession.execute(update(Record).where(Record.id == records[0].id).values(collection_id=collection_2.id))
+    TestSession.commit()
+    assert record_counts() == {collection_1.id: 2, collection_2.id: 1}
+
+    TestSession.execute(delete(Record).where(Record.id == records[1].id))
+    TestSession.execute(delete(Package).where(Package.id == package.id))
+    TestSession.commit()
+    assert record_counts() == {collection_1.id: 1, collection_2.id: 1}
+    assert TestSession.get(Provider, collection_1.provider_id).package_count == 0
+    TestSession.rollback()
+
+    CounterCompactModule().exec()
+    assert TestSession.execute(select(func.count()).select_from(CounterDelta)).scalar() == 0
+    assert record_counts() == {collection_1.id: 1, collection_2.id: 1}
+    assert TestSession.get(Collection, collection_1.id)._record_count == 1
+    assert TestSession.get(Provider, collection_1.provider_id).package_count == 0
+
+
+def test_maintain_counts_concurrently():
+    """Concurrent writers of child rows do not contend for the parent row."""
+    collection = CollectionFactory()
+    schema = SchemaFactory(type='metadata')
+    sessions = [Session(odp.db.engine, future=True) for _ in range(2)]
+    try:
+        for n, session in enumerate(sessions):
+            session.connection(execution_options=dict(isolation_level='REPEATABLE READ'))
+            session.execute(text("set local lock_timeout = '1s'"))
+            session.execute(insert(Record).values(
+                sid=f'concurrent-{n}',
+                metadata_={},
+                validity={},
+                timestamp=datetime.now(timezone.utc),
+                collection_id=collection.id,
+                schema_id=schema.id,
+                schema_type=schema.type,
+            ))
+        for session in sessions:
+            session.commit()
+    finally:
+        for session in sessions:
+            session.close()
+
+    assert TestSession.get(Collection, collection.id).record_count == 2
+
+
+def test_notify_publisher():
+    with odp.db.engine.connect() as conn:
+        conn = conn.execution_options(isolation_level='AUTOCOMMIT')
+        conn.exec_driver_sql(f'listen {PUBLISH_CHANNEL}')
+        record = RecordFactory()
+        expected_payloads = {
+            f'record:{record.id}',
+            f'collection:{record.collection_id}',
+            f'provider:{record.collection.provider_id}',
+        }
+        conn.exec_driver_sql('select 1')  # collect notifications
+        payloads = {notify.payload for notify in conn.connection.dbapi_connection.notifies}
+        conn.connection.dbapi_connection.notifies.clear()
+
+        TestSession.execute(delete(Record).where(Record.id == (record_id := record.id)))
+        TestSession.commit()
+        conn.exec_driver_sql('select 1')
+        delete_payloads = {notify.payload for notify in conn.connection.dbapi_connection.notifies}
+        conn.exec_driver_sql('unlisten *')
+
+    assert expected_payloads <= payloads
+    assert delete_payloads == {f'record:{record_id}'}